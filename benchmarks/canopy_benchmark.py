@@ -0,0 +1,117 @@
+import os
+import sys
+import time
+import random
+sys.path.insert(
+	0,
+	os.path.join(
+		os.path.dirname(
+			os.path.abspath(
+				__file__)),
+		"..",
+		"src"))
+from tree_configuration import ModuleTreeConfiguration
+
+
+number_files_per_run = (
+	100,
+	200,
+	400,
+	800,
+	1600,
+	3200)
+number_custom_imports_per_file = 8
+number_other_imports_per_file = 4
+## the nested loops are O(custom modules x files x imports); skip them past this size
+maximum_number_files_at_legacy = 1600
+
+
+def get_synthetic_tree(number_files, seed=0):
+	random_state = random.Random(
+		seed)
+	tree = ModuleTreeConfiguration()
+	tree.pre_initialize(
+		path_to_directory=None)
+	other_names = list(tree.pre_selected_import_names["common"]) + list(tree.pre_selected_import_names["uncommon"])
+	for index_at_file in range(number_files):
+		module_names = [
+			"module_{}".format(
+				random_state.randrange(
+					number_files))
+				for _ in range(number_custom_imports_per_file)]
+		module_names.extend(
+			random_state.sample(
+				other_names,
+				number_other_imports_per_file))
+		tree.grow_branch_from_module_names(
+			file_name="module_{}.py".format(
+				index_at_file),
+			module_names=sorted(set(module_names)))
+	tree.trim_branches()
+	return tree
+
+
+def initialize_legacy_canopy(tree):
+	## the original nested-loop implementation, kept for comparison
+	module_names = tuple(
+		list(
+			tree.import_names["custom"]))
+	canopy = dict()
+	for module_name in module_names:
+		for file_name_with_extension, imported_module_names in tree.branches.items():
+			file_name = file_name_with_extension.replace(
+				".py",
+				"")
+			if file_name not in canopy.keys():
+				canopy[file_name] = set()
+			common_names = imported_module_names["common"]
+			uncommon_names = imported_module_names["uncommon"]
+			custom_names = imported_module_names["custom"]
+			if custom_names is not None:
+				for custom_name in custom_names:
+					if module_name == custom_name:
+						canopy[file_name].add(
+							custom_name)
+			if common_names is not None:
+				canopy[file_name].update(
+					common_names)
+			if uncommon_names is not None:
+				canopy[file_name].update(
+					uncommon_names)
+	for file_name, leaves in canopy.items():
+		if len(leaves) == 0:
+			canopy[file_name] = None
+		else:
+			canopy[file_name] = list(
+				leaves)
+	return canopy
+
+
+def get_normalized_canopy(canopy):
+	normalized_canopy = {
+		file_name : (None if leaves is None else sorted(leaves))
+			for file_name, leaves in canopy.items()}
+	return normalized_canopy
+
+
+if __name__ == "__main__":
+
+	print("{:>8} {:>12} {:>12} {:>10}".format("files", "legacy [s]", "indexed [s]", "speed-up"))
+	for number_files in number_files_per_run:
+		tree = get_synthetic_tree(
+			number_files=number_files)
+		start_time = time.perf_counter()
+		tree.initialize_canopy()
+		indexed_time = time.perf_counter() - start_time
+		if number_files <= maximum_number_files_at_legacy:
+			start_time = time.perf_counter()
+			legacy_canopy = initialize_legacy_canopy(
+				tree=tree)
+			legacy_time = time.perf_counter() - start_time
+			if get_normalized_canopy(legacy_canopy) != get_normalized_canopy(tree.canopy):
+				raise ValueError("canopy mismatch at number_files={}".format(number_files))
+			print("{:>8} {:>12.4f} {:>12.4f} {:>9.0f}x".format(number_files, legacy_time, indexed_time, legacy_time / indexed_time))
+		else:
+			print("{:>8} {:>12} {:>12.4f} {:>10}".format(number_files, "-", indexed_time, "-"))
+
+##
\ No newline at end of file
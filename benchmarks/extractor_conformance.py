@@ -0,0 +1,65 @@
+import os
+import sys
+import time
+import sysconfig
+sys.path.insert(
+	0,
+	os.path.join(
+		os.path.dirname(
+			os.path.abspath(
+				__file__)),
+		"..",
+		"src"))
+from node_visitor_configuration import NodeVisitorConfiguration
+from tree_configuration import ModuleTreeConfiguration
+
+
+## the standard library is a large, varied corpus that is always available
+path_to_corpus = sysconfig.get_paths()["stdlib"]
+
+
+def get_module_names_per_file(paths_to_files, extractor, is_prefilter):
+	node_visitor = NodeVisitorConfiguration(
+		extractor=extractor,
+		is_prefilter=is_prefilter)
+	start_time = time.perf_counter()
+	module_names_per_file = [
+		node_visitor.get_imported_module_names(
+			path_to_file=path_to_file)
+				for path_to_file in paths_to_files]
+	elapsed_time = time.perf_counter() - start_time
+	return module_names_per_file, node_visitor, elapsed_time
+
+
+if __name__ == "__main__":
+
+	paths_to_files = [
+		path_to_file
+			for path_to_file, file_name in ModuleTreeConfiguration.get_paths_to_files(
+				path_to_directory=path_to_corpus)]
+	## reference ==> the original visitor without the byte-level prefilter
+	reference_module_names, reference_visitor, reference_time = get_module_names_per_file(
+		paths_to_files=paths_to_files,
+		extractor="ast",
+		is_prefilter=False)
+	print("corpus: {} ({} files)".format(path_to_corpus, len(paths_to_files)))
+	print("ast: {:.2f} s, {} skipped".format(reference_time, len(reference_visitor.skipped_files)))
+	mismatches = list()
+	for extractor in ("tokenize", "mmap"):
+		candidate_module_names, candidate_visitor, candidate_time = get_module_names_per_file(
+			paths_to_files=paths_to_files,
+			extractor=extractor,
+			is_prefilter=True)
+		for path_to_file, reference, candidate in zip(paths_to_files, reference_module_names, candidate_module_names):
+			## the scanners do not validate statements other than imports
+			if (reference is not None) and (reference != candidate):
+				mismatches.append(
+					(extractor, path_to_file, reference, candidate))
+		print("{}: {:.2f} s, {} skipped, {} ast fallbacks, speed-up: {:.1f}x".format(extractor, candidate_time, len(candidate_visitor.skipped_files), candidate_visitor.number_fallbacks, reference_time / candidate_time))
+	for extractor, path_to_file, reference, candidate in mismatches:
+		print("mismatch: {}\n .. ast: {}\n .. {}: {}".format(path_to_file, reference, extractor, candidate))
+	if len(mismatches) > 0:
+		sys.exit(1)
+	print("conformance: OK")
+
+##
\ No newline at end of file
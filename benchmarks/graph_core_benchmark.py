@@ -0,0 +1,111 @@
+import os
+import sys
+import time
+import random
+import tracemalloc
+import networkx as nx
+sys.path.insert(
+	0,
+	os.path.join(
+		os.path.dirname(
+			os.path.abspath(
+				__file__)),
+		"..",
+		"src"))
+from graph_core_configuration import CompactGraphConfiguration
+
+
+number_nodes_per_run = (
+	1000,
+	10000,
+	25000)
+number_edges_per_node = 4
+
+
+def get_synthetic_edges(number_nodes, seed=0):
+	## edges only point "forward" ==> acyclic, like an import graph without cycles
+	random_state = random.Random(
+		seed)
+	names = [
+		"package_{}.module_{}".format(index // 50, index)
+			for index in range(number_nodes)]
+	edges = list()
+	for index in range(number_nodes - 1):
+		for _ in range(number_edges_per_node):
+			edges.append(
+				(names[index], names[random_state.randrange(index + 1, number_nodes)]))
+	return names, edges
+
+
+def build_networkx(names, edges):
+	graph = nx.DiGraph()
+	graph.add_nodes_from(
+		names)
+	graph.add_edges_from(
+		edges)
+	return graph
+
+
+def query_networkx(graph):
+	top_level_nodes = [
+		node
+			for node in graph.nodes()
+				if not graph.in_degree(node)]
+	generations = list(
+		nx.topological_generations(
+			graph))
+	return top_level_nodes, generations
+
+
+def build_compact(names, edges):
+	core = CompactGraphConfiguration(
+		names=names,
+		edges=edges)
+	return core
+
+
+def query_compact(core):
+	top_level_nodes = core.get_top_level_names()
+	generations = core.get_topological_generations()
+	return top_level_nodes, generations
+
+
+def get_measurement(function, *args):
+	tracemalloc.start()
+	start_time = time.perf_counter()
+	result = function(
+		*args)
+	elapsed_time = time.perf_counter() - start_time
+	current_size, peak_size = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	return result, elapsed_time, current_size, peak_size
+
+
+if __name__ == "__main__":
+
+	print("{:>8} {:>8} {:>10} {:>12} {:>12} {:>12} {:>12}".format("nodes", "edges", "backend", "build [s]", "query [s]", "kept [MB]", "peak [MB]"))
+	for number_nodes in number_nodes_per_run:
+		names, edges = get_synthetic_edges(
+			number_nodes=number_nodes)
+		graph, networkx_build_time, networkx_size, networkx_peak = get_measurement(
+			build_networkx,
+			names,
+			edges)
+		networkx_result, networkx_query_time, _, _ = get_measurement(
+			query_networkx,
+			graph)
+		core, compact_build_time, compact_size, compact_peak = get_measurement(
+			build_compact,
+			names,
+			edges)
+		compact_result, compact_query_time, _, _ = get_measurement(
+			query_compact,
+			core)
+		if networkx_result[0] != compact_result[0]:
+			raise ValueError("top-level mismatch at number_nodes={}".format(number_nodes))
+		if [sorted(generation) for generation in networkx_result[1]] != [sorted(core.names[index] for index in generation) for generation in compact_result[1]]:
+			raise ValueError("generation mismatch at number_nodes={}".format(number_nodes))
+		for backend, build_time, query_time, size, peak in (("networkx", networkx_build_time, networkx_query_time, networkx_size, networkx_peak), ("compact", compact_build_time, compact_query_time, compact_size, compact_peak)):
+			print("{:>8} {:>8} {:>10} {:>12.4f} {:>12.4f} {:>12.2f} {:>12.2f}".format(number_nodes, core.number_edges, backend, build_time, query_time, size / 1e6, peak / 1e6))
+
+##
\ No newline at end of file
@@ -0,0 +1,81 @@
+import os
+import sys
+import tempfile
+sys.path.insert(
+	0,
+	os.path.join(
+		os.path.dirname(
+			os.path.abspath(
+				__file__)),
+		"..",
+		"src"))
+from tree_configuration import ModuleTreeConfiguration
+from impact_configuration import ImpactConfiguration
+
+
+## two test files share a name, one test depends on the changed module only through a relative import
+sources_at_paths = {
+	os.path.join("package_name", "__init__.py") : "",
+	os.path.join("package_name", "models.py") : "import json\n",
+	os.path.join("package_name", "views.py") : "from . import models\n",
+	os.path.join("package_name", "unrelated.py") : "import os\n",
+	os.path.join("tests", "a", "test_models.py") : "import package_name.models\n",
+	os.path.join("tests", "b", "test_models.py") : "from package_name import models\n",
+	os.path.join("tests", "test_views.py") : "from package_name.views import render\n",
+	os.path.join("tests", "test_unrelated.py") : "import package_name.unrelated\n"}
+changed_path = os.path.join("package_name", "models.py")
+expected_test_paths = [
+	os.path.join("tests", "a", "test_models.py"),
+	os.path.join("tests", "b", "test_models.py"),
+	os.path.join("tests", "test_views.py")]
+
+
+def get_test_paths(path_to_directory):
+	tree = ModuleTreeConfiguration()
+	tree.initialize(
+		path_to_directory=path_to_directory,
+		is_qualified=True)
+	impact = ImpactConfiguration(
+		tree=tree).get_impact(
+			paths_to_changed_files=[os.path.join(path_to_directory, changed_path)])
+	test_paths = [
+		os.path.relpath(path_to_file, path_to_directory)
+			for path_to_file in impact["test_paths"]]
+	return test_paths
+
+
+if __name__ == "__main__":
+
+	with tempfile.TemporaryDirectory() as path_to_directory:
+		path_to_directory = os.path.join(
+			path_to_directory,
+			"")
+		for path_to_file, source in sources_at_paths.items():
+			path_to_file = os.path.join(
+				path_to_directory,
+				path_to_file)
+			os.makedirs(
+				os.path.dirname(
+					path_to_file),
+				exist_ok=True)
+			with open(path_to_file, "w") as data_file:
+				data_file.write(
+					source)
+		test_paths = get_test_paths(
+			path_to_directory=path_to_directory)
+		if test_paths != expected_test_paths:
+			print("FAIL: changed file: {}".format(test_paths))
+			sys.exit(1)
+		## a module deleted in the diff still selects the tests that imported it
+		os.remove(
+			os.path.join(
+				path_to_directory,
+				changed_path))
+		test_paths = get_test_paths(
+			path_to_directory=path_to_directory)
+		if test_paths != expected_test_paths:
+			print("FAIL: deleted file: {}".format(test_paths))
+			sys.exit(1)
+	print("impact check: OK")
+
+##
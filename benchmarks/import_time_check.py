@@ -0,0 +1,77 @@
+import os
+import sys
+import json
+import tempfile
+import subprocess
+
+
+path_to_source_directory = os.path.join(
+	os.path.dirname(
+		os.path.abspath(
+			__file__)),
+	"..",
+	"src")
+## modules that the scan -> graph -> report path must never import
+forbidden_module_names = (
+	"matplotlib",
+	"numpy")
+maximum_wall_time = 2.0
+
+
+## runs in a fresh interpreter so that nothing imported by this script leaks into the measurement
+text_path_script = """
+import sys
+import json
+import time
+start_time = time.perf_counter()
+sys.path.insert(0, {path_to_source_directory!r})
+from tree_configuration import ModuleTreeConfiguration
+from network_configuration import NetworkConfiguration
+module_tree = ModuleTreeConfiguration()
+module_tree.initialize(
+	path_to_directory={path_to_source_directory!r})
+network = NetworkConfiguration(
+	tree=module_tree,
+	is_include_common=True,
+	is_include_uncommon=True,
+	is_include_custom=True)
+network.update_save_directory(
+	path_to_save_directory={path_to_save_directory!r})
+network.write_module_hierarchy_to_file()
+elapsed_time = time.perf_counter() - start_time
+print(json.dumps({{
+	"elapsed_time" : elapsed_time,
+	"module_names" : sorted(sys.modules.keys())}}))
+"""
+
+
+if __name__ == "__main__":
+
+	with tempfile.TemporaryDirectory() as path_to_save_directory:
+		script = text_path_script.format(
+			path_to_source_directory=path_to_source_directory,
+			path_to_save_directory=os.path.join(path_to_save_directory, ""))
+		completed_process = subprocess.run(
+			[sys.executable, "-c", script],
+			capture_output=True,
+			text=True,
+			check=True)
+	result = json.loads(
+		completed_process.stdout)
+	imported_module_names = {
+		module_name.split(".")[0]
+			for module_name in result["module_names"]}
+	violations = [
+		module_name
+			for module_name in forbidden_module_names
+				if module_name in imported_module_names]
+	print("text path: {:.3f} s, {} modules imported".format(result["elapsed_time"], len(result["module_names"])))
+	if len(violations) > 0:
+		print("FAIL: text path imported {}".format(", ".join(violations)))
+		sys.exit(1)
+	if result["elapsed_time"] > maximum_wall_time:
+		print("FAIL: text path took longer than {:.1f} s".format(maximum_wall_time))
+		sys.exit(1)
+	print("import-time check: OK")
+
+##
\ No newline at end of file
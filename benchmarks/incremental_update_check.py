@@ -0,0 +1,180 @@
+import os
+import sys
+import random
+import tempfile
+sys.path.insert(
+	0,
+	os.path.join(
+		os.path.dirname(
+			os.path.abspath(
+				__file__)),
+		"..",
+		"src"))
+from tree_configuration import ModuleTreeConfiguration
+from network_configuration import NetworkConfiguration
+from synthetic_repository import get_pre_selected_module_names, get_path_to_package, get_source, write_synthetic_repository
+
+
+number_files = 300
+number_rounds = 10
+number_edits_per_round = 5
+package_depth = 1
+graph_backends = (
+	"networkx",
+	"compact")
+
+
+def get_network(path_to_directory, graph_backend):
+	tree = ModuleTreeConfiguration()
+	tree.initialize(
+		path_to_directory=path_to_directory)
+	network = NetworkConfiguration(
+		tree=tree,
+		is_include_common=True,
+		is_include_uncommon=True,
+		is_include_custom=True,
+		graph_backend=graph_backend)
+	return network
+
+
+def get_state(network):
+	## what a reader of module_hierarchy.txt sees, independent of insertion order
+	hierarchy = {
+		module_name : sorted(successors)
+			for module_name, successors in network.hierarchy.items()}
+	state = (
+		hierarchy,
+		network.get_string(
+			is_sorted=True))
+	return state
+
+
+def write_module(random_state, path_to_file, module_names):
+	with open(path_to_file, "w") as data_file:
+		data_file.write(
+			get_source(
+				random_state=random_state,
+				module_names=module_names,
+				number_lines=20))
+
+
+def apply_unimported_edit(random_state, path_to_directory):
+	## module_0 is imported by nothing ==> it is no node, and a name that only it imports turns
+	## custom (or stops being custom) without any edge changing, which a pure edge delta misses
+	path_to_file = os.path.join(
+		get_path_to_package(
+			path_to_directory=path_to_directory,
+			index_at_file=0,
+			package_depth=package_depth),
+		"module_0.py")
+	write_module(
+		random_state=random_state,
+		path_to_file=path_to_file,
+		module_names=[
+			"unseen_{}".format(
+				random_state.randrange(10 ** 6))])
+	paths_to_changed_files = [
+		(path_to_file, "module_0.py")]
+	return paths_to_changed_files, list()
+
+
+def apply_edits(random_state, path_to_directory, common_names, pending_module_names):
+	## rewrites, removes and adds files; forward imports only ==> the graph stays acyclic
+	paths_to_changed_files = list()
+	paths_to_removed_files = list()
+	for module_name in pending_module_names:
+		path_to_file = os.path.join(
+			path_to_directory,
+			"{}.py".format(
+				module_name))
+		write_module(
+			random_state=random_state,
+			path_to_file=path_to_file,
+			module_names=list())
+		paths_to_changed_files.append(
+			(path_to_file, os.path.basename(path_to_file)))
+	pending_module_names.clear()
+	paths_to_files = [
+		os.path.join(path_to_root, file_name)
+			for path_to_root, _, file_names in os.walk(path_to_directory)
+				for file_name in file_names
+					if file_name.startswith("module_") and file_name.endswith(".py") and (file_name != "module_0.py")]
+	for path_to_file in random_state.sample(sorted(paths_to_files), number_edits_per_round):
+		file_name = os.path.basename(
+			path_to_file)
+		value = random_state.random()
+		if value < 0.2:
+			os.remove(
+				path_to_file)
+			paths_to_removed_files.append(
+				(path_to_file, file_name))
+			continue
+		index_at_file = int(
+			file_name[len("module_"):-len(".py")])
+		module_names = [
+			"module_{}".format(
+				random_state.randrange(index_at_file + 1, number_files + 1))
+				for _ in range(3)]
+		module_names.extend(
+			random_state.sample(
+				common_names,
+				2))
+		if value < 0.5:
+			module_name = "added_{}".format(
+				random_state.randrange(10 ** 6))
+			module_names.append(
+				module_name)
+			pending_module_names.append(
+				module_name)
+		write_module(
+			random_state=random_state,
+			path_to_file=path_to_file,
+			module_names=module_names)
+		paths_to_changed_files.append(
+			(path_to_file, file_name))
+	return paths_to_changed_files, paths_to_removed_files
+
+
+if __name__ == "__main__":
+
+	common_names, _ = get_pre_selected_module_names()
+	for graph_backend in graph_backends:
+		random_state = random.Random(
+			0)
+		with tempfile.TemporaryDirectory() as path_to_directory:
+			path_to_directory = os.path.join(
+				path_to_directory,
+				"")
+			write_synthetic_repository(
+				path_to_directory=path_to_directory,
+				number_files=number_files,
+				number_imports_per_file=6,
+				package_depth=package_depth,
+				cycle_density=0.0)
+			network = get_network(
+				path_to_directory=path_to_directory,
+				graph_backend=graph_backend)
+			pending_module_names = list()
+			for index_at_round in range(number_rounds):
+				## one batch at a time ==> the unimported edit is not hidden by edge deltas of the others
+				for get_edits in (lambda : apply_edits(random_state=random_state, path_to_directory=path_to_directory, common_names=common_names, pending_module_names=pending_module_names), lambda : apply_unimported_edit(random_state=random_state, path_to_directory=path_to_directory)):
+					paths_to_changed_files, paths_to_removed_files = get_edits()
+					canopy_keys, changed_import_names = network.tree.update_branches(
+						paths_to_changed_files=paths_to_changed_files,
+						paths_to_removed_files=paths_to_removed_files)
+					is_changed = network.update_graph(
+						canopy_keys=canopy_keys,
+						changed_import_names=changed_import_names)
+					if (len(changed_import_names) > 0) and (not is_changed):
+						print("FAIL: {} round {}: import names changed but update_graph returned False".format(graph_backend, index_at_round))
+						sys.exit(1)
+					rebuilt_network = get_network(
+						path_to_directory=path_to_directory,
+						graph_backend=graph_backend)
+					if get_state(network) != get_state(rebuilt_network):
+						print("FAIL: {} round {}: incremental update differs from a full rebuild".format(graph_backend, index_at_round))
+						sys.exit(1)
+		print("{}: {} rounds match a full rebuild".format(graph_backend, number_rounds))
+	print("incremental update check: OK")
+
+##
@@ -0,0 +1,155 @@
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+
+
+path_to_source_directory = os.path.join(
+	os.path.dirname(
+		os.path.abspath(
+			__file__)),
+	"..",
+	"src")
+path_to_benchmark_directory = os.path.dirname(
+	os.path.abspath(
+		__file__))
+number_files_per_run = (
+	100,
+	300,
+	1000,
+	3000)
+## nx.draw at dpi=800 takes minutes past this size
+maximum_number_files_at_default = 300
+render_settings = (
+	("default", ".png", False),
+	("fast", ".png", False),
+	("fast", ".svg", True),
+	("fast", ".pdf", True))
+
+
+## every render runs in a fresh interpreter ==> peak RSS covers the Agg buffers that tracemalloc cannot see
+render_script = """
+import sys
+import json
+import time
+import resource
+import matplotlib
+matplotlib.use("Agg")
+sys.path.insert(0, {path_to_source_directory!r})
+sys.path.insert(0, {path_to_benchmark_directory!r})
+from tree_configuration import ModuleTreeConfiguration
+from network_configuration import NetworkConfiguration
+from synthetic_repository import write_synthetic_repository
+write_synthetic_repository(
+	path_to_directory={path_to_repository!r},
+	number_files={number_files},
+	number_imports_per_file=6,
+	number_lines_per_file=10)
+module_tree = ModuleTreeConfiguration()
+module_tree.initialize(
+	path_to_directory={path_to_repository!r})
+network = NetworkConfiguration(
+	tree=module_tree,
+	is_include_common=True,
+	is_include_uncommon=True,
+	is_include_custom=True,
+	cycle_mode="condense")
+network.update_save_directory(
+	path_to_save_directory={path_to_save_directory!r})
+start_time = time.perf_counter()
+network.view_graph(
+	layout="circular",
+	render_mode={render_mode!r},
+	extension={extension!r},
+	is_rasterize_edges={is_rasterize_edges!r},
+	is_save=True)
+elapsed_time = time.perf_counter() - start_time
+## ru_maxrss is in kilobytes on Linux and in bytes on macOS
+peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+print(json.dumps({{
+	"number_nodes" : network.graph.number_of_nodes(),
+	"number_edges" : network.graph.number_of_edges(),
+	"elapsed_time" : elapsed_time,
+	"peak_memory" : peak_memory}}))
+"""
+
+
+def get_measurement(number_files, render_mode, extension, is_rasterize_edges):
+	with tempfile.TemporaryDirectory() as path_to_directory:
+		path_to_repository = os.path.join(
+			path_to_directory,
+			"repository",
+			"")
+		path_to_save_directory = os.path.join(
+			path_to_directory,
+			"output",
+			"")
+		os.makedirs(
+			path_to_save_directory)
+		script = render_script.format(
+			path_to_source_directory=path_to_source_directory,
+			path_to_benchmark_directory=path_to_benchmark_directory,
+			path_to_repository=path_to_repository,
+			path_to_save_directory=path_to_save_directory,
+			number_files=number_files,
+			render_mode=render_mode,
+			extension=extension,
+			is_rasterize_edges=is_rasterize_edges)
+		completed_process = subprocess.run(
+			[sys.executable, "-c", script],
+			capture_output=True,
+			text=True,
+			check=True)
+		measurement = json.loads(
+			completed_process.stdout.strip().splitlines()[-1])
+		measurement["file_size"] = os.path.getsize(
+			os.path.join(
+				path_to_save_directory,
+				"module_network_graph{}".format(
+					extension)))
+	measurement["number_files"] = number_files
+	measurement["render_mode"] = render_mode
+	measurement["extension"] = extension
+	measurement["is_rasterize_edges"] = is_rasterize_edges
+	return measurement
+
+
+if __name__ == "__main__":
+
+	parser = argparse.ArgumentParser(
+		description="render time and peak memory of the default and fast rendering paths")
+	parser.add_argument("--sizes", type=int, nargs="+", default=number_files_per_run)
+	parser.add_argument("--json", default=None)
+	arguments = parser.parse_args()
+	measurements = list()
+	print("{:>8} {:>8} {:>8} {:>6} {:>10} {:>10} {:>12} {:>10}".format("nodes", "edges", "mode", "format", "raster", "time [s]", "peak [MB]", "size [MB]"))
+	for number_files in arguments.sizes:
+		for render_mode, extension, is_rasterize_edges in render_settings:
+			if (render_mode == "default") and (number_files > maximum_number_files_at_default):
+				continue
+			measurement = get_measurement(
+				number_files=number_files,
+				render_mode=render_mode,
+				extension=extension,
+				is_rasterize_edges=is_rasterize_edges)
+			measurements.append(
+				measurement)
+			print("{:>8} {:>8} {:>8} {:>6} {:>10} {:>10.2f} {:>12.1f} {:>10.2f}".format(
+				measurement["number_nodes"],
+				measurement["number_edges"],
+				render_mode,
+				extension,
+				str(is_rasterize_edges),
+				measurement["elapsed_time"],
+				measurement["peak_memory"] / 1e6,
+				measurement["file_size"] / 1e6))
+	if arguments.json is not None:
+		with open(arguments.json, "w") as data_file:
+			json.dump(
+				measurements,
+				data_file,
+				indent=1)
+
+##
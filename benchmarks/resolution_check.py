@@ -0,0 +1,88 @@
+import os
+import sys
+import tempfile
+sys.path.insert(
+	0,
+	os.path.join(
+		os.path.dirname(
+			os.path.abspath(
+				__file__)),
+		"..",
+		"src"))
+from tree_configuration import ModuleTreeConfiguration
+from resolution_configuration import ResolutionConfiguration
+
+
+path_to_repository = os.path.join(
+	os.path.dirname(
+		os.path.abspath(
+			__file__)),
+	"..")
+## a src layout: the package lives below src/, the tests import it by its package name
+sources_at_paths = {
+	os.path.join("src", "package_name", "__init__.py") : "from .core import run\n",
+	os.path.join("src", "package_name", "core.py") : "import os\nfrom . import utilities\nfrom package_name.sub import helper\n",
+	os.path.join("src", "package_name", "utilities.py") : "import json\n",
+	os.path.join("src", "package_name", "sub", "__init__.py") : "",
+	os.path.join("src", "package_name", "sub", "helper.py") : "from ..utilities import dump\n",
+	os.path.join("tests", "test_core.py") : "import package_name.core\nfrom conftest import fixture\n",
+	os.path.join("tests", "conftest.py") : "import package_name\n",
+	"setup.py" : "import setuptools\n"}
+expected_edges = {
+	"package_name" : ["package_name.core"],
+	"package_name.core" : ["package_name.sub.helper", "package_name.utilities"],
+	"package_name.utilities" : [],
+	"package_name.sub" : [],
+	"package_name.sub.helper" : ["package_name.utilities"],
+	"test_core" : ["conftest", "package_name.core"],
+	"conftest" : ["package_name"],
+	"setup" : []}
+
+
+def get_resolution(path_to_directory, source_roots=None):
+	tree = ModuleTreeConfiguration()
+	tree.initialize(
+		path_to_directory=path_to_directory,
+		is_qualified=True)
+	resolution = ResolutionConfiguration(
+		tree=tree,
+		source_roots=source_roots)
+	return resolution
+
+
+if __name__ == "__main__":
+
+	with tempfile.TemporaryDirectory() as path_to_directory:
+		for path_to_file, source in sources_at_paths.items():
+			path_to_file = os.path.join(
+				path_to_directory,
+				path_to_file)
+			os.makedirs(
+				os.path.dirname(
+					path_to_file),
+				exist_ok=True)
+			with open(path_to_file, "w") as data_file:
+				data_file.write(
+					source)
+		## inferred roots, then the same roots given explicitly
+		for source_roots in (None, ["src", "tests", "."]):
+			resolution = get_resolution(
+				path_to_directory=os.path.join(path_to_directory, ""),
+				source_roots=source_roots)
+			if resolution.edges != expected_edges:
+				print("FAIL: src layout (source_roots={}): {}".format(source_roots, resolution.edges))
+				sys.exit(1)
+			print("src layout (source_roots={}): {}".format(source_roots, resolution))
+	## this repository has flat imports inside src/ and benchmarks/
+	resolution = get_resolution(
+		path_to_directory=os.path.join(path_to_repository, ""))
+	number_edges = sum(
+		len(successors)
+			for successors in resolution.edges.values())
+	if number_edges == 0:
+		print("FAIL: no module edges in this repository")
+		sys.exit(1)
+	print("this repository: {}".format(resolution))
+	print("resolution check: OK")
+
+##
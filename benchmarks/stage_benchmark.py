@@ -0,0 +1,280 @@
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+import tracemalloc
+sys.path.insert(
+	0,
+	os.path.join(
+		os.path.dirname(
+			os.path.abspath(
+				__file__)),
+		"..",
+		"src"))
+from tree_configuration import ModuleTreeConfiguration
+from network_configuration import NetworkConfiguration
+from instrumentation_configuration import InstrumentationConfiguration
+from synthetic_repository import write_synthetic_repository
+
+
+## 100 -> 100k files; pass --sizes to run a subset
+number_files_per_run = (
+	100,
+	1000,
+	10000,
+	100000)
+## drawing every node is the slowest stage by far; skip it past this size
+maximum_number_files_at_view = 1000
+csv_field_names = (
+	"revision",
+	"number_files",
+	"stage",
+	"wall_time",
+	"cpu_time",
+	"peak_memory",
+	"number_nodes",
+	"number_edges")
+
+
+def get_revision():
+	## results are labelled with the commit they were measured at, so that versions can be compared
+	try:
+		completed_process = subprocess.run(
+			["git", "rev-parse", "--short", "HEAD"],
+			cwd=os.path.dirname(
+				os.path.abspath(
+					__file__)),
+			capture_output=True,
+			text=True,
+			check=True)
+	except (OSError, subprocess.CalledProcessError):
+		return None
+	revision = completed_process.stdout.strip()
+	return revision
+
+
+def get_measurement(stage, function, is_trace_memory):
+	if is_trace_memory:
+		tracemalloc.start()
+	start_wall_time = time.perf_counter()
+	start_cpu_time = time.process_time()
+	result = function()
+	wall_time = time.perf_counter() - start_wall_time
+	cpu_time = time.process_time() - start_cpu_time
+	if is_trace_memory:
+		_, peak_memory = tracemalloc.get_traced_memory()
+		tracemalloc.stop()
+	else:
+		peak_memory = None
+	measurement = {
+		"stage" : stage,
+		"wall_time" : wall_time,
+		"cpu_time" : cpu_time,
+		"peak_memory" : peak_memory}
+	return result, measurement
+
+
+def get_measurements(path_to_directory, path_to_save_directory, number_files, is_trace_memory, is_view):
+	## the stages of ModuleTreeConfiguration.initialize and NetworkConfiguration.__init__, timed one by one
+	measurements = list()
+	tree = ModuleTreeConfiguration()
+	tree.pre_initialize(
+		path_to_directory=path_to_directory)
+	tree.initialize_parse_cache()
+	paths_to_files, measurement = get_measurement(
+		stage="walk",
+		function=lambda : tree.get_paths_to_files(
+			path_to_directory=path_to_directory),
+		is_trace_memory=is_trace_memory)
+	measurements.append(
+		measurement)
+	_, measurement = get_measurement(
+		stage="parse",
+		function=lambda : (
+			tree.grow_branches_from_paths(
+				paths_to_files=paths_to_files,
+				scan_mode="serial",
+				number_workers=None,
+				chunk_size=None),
+			tree.trim_branches()),
+		is_trace_memory=is_trace_memory)
+	measurements.append(
+		measurement)
+	_, measurement = get_measurement(
+		stage="canopy",
+		function=tree.initialize_canopy,
+		is_trace_memory=is_trace_memory)
+	measurements.append(
+		measurement)
+	## the constructor runs the graph and hierarchy stages back to back ==> their times come from
+	## the instrumentation; tracemalloc only sees the constructor, so both share its peak memory
+	instrumentation = InstrumentationConfiguration(
+		number_slowest_files=0)
+	network, network_measurement = get_measurement(
+		stage="network",
+		function=lambda : NetworkConfiguration(
+			tree=tree,
+			is_include_common=True,
+			is_include_uncommon=True,
+			is_include_custom=True,
+			cycle_mode="condense",
+			maximum_number_cycles=0,
+			graph_backend="networkx",
+			instrumentation=instrumentation),
+		is_trace_memory=is_trace_memory)
+	network.update_save_directory(
+		path_to_save_directory=path_to_save_directory)
+	for stage in ("graph", "hierarchy"):
+		measurements.append({
+			"stage" : stage,
+			"wall_time" : instrumentation.stages[stage]["wall_time"],
+			"cpu_time" : instrumentation.stages[stage]["cpu_time"],
+			"peak_memory" : network_measurement["peak_memory"]})
+	_, measurement = get_measurement(
+		stage="report",
+		function=network.get_string,
+		is_trace_memory=is_trace_memory)
+	measurements.append(
+		measurement)
+	if is_view and (number_files <= maximum_number_files_at_view):
+		_, measurement = get_measurement(
+			stage="view",
+			function=lambda : network.view_graph(
+				layout="shell",
+				is_save=True),
+			is_trace_memory=is_trace_memory)
+		measurements.append(
+			measurement)
+	for measurement in measurements:
+		measurement["number_nodes"] = network.graph.number_of_nodes()
+		measurement["number_edges"] = network.graph.number_of_edges()
+	return measurements
+
+
+def get_results(number_files_per_run, repository_kwargs, is_trace_memory, is_view):
+	results = {
+		"revision" : get_revision(),
+		"python" : platform.python_version(),
+		"platform" : platform.platform(),
+		"is_trace_memory" : is_trace_memory,
+		"runs" : list()}
+	for number_files in number_files_per_run:
+		with tempfile.TemporaryDirectory() as path_to_directory:
+			path_to_repository = os.path.join(
+				path_to_directory,
+				"repository",
+				"")
+			path_to_save_directory = os.path.join(
+				path_to_directory,
+				"output",
+				"")
+			os.makedirs(
+				path_to_save_directory)
+			summary = write_synthetic_repository(
+				path_to_directory=path_to_repository,
+				number_files=number_files,
+				**repository_kwargs)
+			measurements = get_measurements(
+				path_to_directory=path_to_repository,
+				path_to_save_directory=path_to_save_directory,
+				number_files=number_files,
+				is_trace_memory=is_trace_memory,
+				is_view=is_view)
+		results["runs"].append({
+			"repository" : summary,
+			"measurements" : measurements})
+		for measurement in measurements:
+			print("{:>8} {:>10} {:>10.4f} {:>10.4f} {:>10}".format(
+				number_files,
+				measurement["stage"],
+				measurement["wall_time"],
+				measurement["cpu_time"],
+				"-" if measurement["peak_memory"] is None else "{:.2f}".format(measurement["peak_memory"] / 1e6)))
+	return results
+
+
+def write_results(results, path_to_json=None, path_to_csv=None):
+	if path_to_json is not None:
+		with open(path_to_json, "w") as data_file:
+			json.dump(
+				results,
+				data_file,
+				indent=1)
+	if path_to_csv is not None:
+		with open(path_to_csv, "w", newline="") as data_file:
+			writer = csv.DictWriter(
+				data_file,
+				fieldnames=csv_field_names)
+			writer.writeheader()
+			for run in results["runs"]:
+				for measurement in run["measurements"]:
+					writer.writerow({
+						"revision" : results["revision"],
+						"number_files" : run["repository"]["number_files"],
+						**measurement})
+
+
+def compare_results(results, path_to_baseline):
+	## ratio > 1 ==> slower than the baseline
+	with open(path_to_baseline, "r") as data_file:
+		baseline = json.load(
+			data_file)
+	wall_times = {
+		(run["repository"]["number_files"], measurement["stage"]) : measurement["wall_time"]
+			for run in baseline["runs"]
+				for measurement in run["measurements"]}
+	print("\ncompared to {} ({}):".format(path_to_baseline, baseline["revision"]))
+	for run in results["runs"]:
+		for measurement in run["measurements"]:
+			key = (run["repository"]["number_files"], measurement["stage"])
+			if key in wall_times:
+				print("{:>8} {:>10} {:>9.2f}x".format(key[0], key[1], measurement["wall_time"] / wall_times[key]))
+
+
+if __name__ == "__main__":
+
+	parser = argparse.ArgumentParser(
+		description="time and memory-profile each stage on synthetic code-bases")
+	parser.add_argument("--sizes", type=int, nargs="+", default=number_files_per_run)
+	parser.add_argument("--imports-per-file", type=int, default=10)
+	parser.add_argument("--package-depth", type=int, default=2)
+	parser.add_argument("--common-fraction", type=float, default=0.4)
+	parser.add_argument("--uncommon-fraction", type=float, default=0.2)
+	parser.add_argument("--cycle-density", type=float, default=0.0)
+	parser.add_argument("--lines-per-file", type=int, default=60)
+	parser.add_argument("--seed", type=int, default=0)
+	parser.add_argument("--memory", action="store_true", help="trace peak memory per stage (slows every stage down)")
+	parser.add_argument("--view", action="store_true", help="include NetworkViewer.view_graph for small runs")
+	parser.add_argument("--json", default=None)
+	parser.add_argument("--csv", default=None)
+	parser.add_argument("--baseline", default=None, help="json results of an earlier run to compare against")
+	arguments = parser.parse_args()
+	repository_kwargs = {
+		"number_imports_per_file" : arguments.imports_per_file,
+		"package_depth" : arguments.package_depth,
+		"common_fraction" : arguments.common_fraction,
+		"uncommon_fraction" : arguments.uncommon_fraction,
+		"cycle_density" : arguments.cycle_density,
+		"number_lines_per_file" : arguments.lines_per_file,
+		"seed" : arguments.seed}
+	print("{:>8} {:>10} {:>10} {:>10} {:>10}".format("files", "stage", "wall [s]", "cpu [s]", "peak [MB]"))
+	results = get_results(
+		number_files_per_run=arguments.sizes,
+		repository_kwargs=repository_kwargs,
+		is_trace_memory=arguments.memory,
+		is_view=arguments.view)
+	write_results(
+		results=results,
+		path_to_json=arguments.json,
+		path_to_csv=arguments.csv)
+	if arguments.baseline is not None:
+		compare_results(
+			results=results,
+			path_to_baseline=arguments.baseline)
+
+##
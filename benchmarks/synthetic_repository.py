@@ -0,0 +1,171 @@
+import os
+import sys
+import random
+sys.path.insert(
+	0,
+	os.path.join(
+		os.path.dirname(
+			os.path.abspath(
+				__file__)),
+		"..",
+		"src"))
+from tree_configuration import ModuleTreeConfiguration
+
+
+## the tree keys files by name ==> custom modules are imported by file name, whatever their package
+number_files_per_package = 50
+filler_template = '''
+
+def function_{index}(value):
+	"""synthetic filler"""
+	total = 0
+	for index_at_value in range(value):
+		total += index_at_value * {index}
+	return total
+'''
+
+
+def get_pre_selected_module_names():
+	tree = ModuleTreeConfiguration()
+	tree.pre_initialize(
+		path_to_directory=None)
+	common_names = sorted(
+		tree.pre_selected_import_names["common"])
+	uncommon_names = sorted(
+		tree.pre_selected_import_names["uncommon"])
+	return common_names, uncommon_names
+
+
+def get_path_to_package(path_to_directory, index_at_file, package_depth):
+	## package_0/level_1/level_2/... ==> package_depth directories between the root and each file
+	if package_depth == 0:
+		return path_to_directory
+	index_at_package = index_at_file // number_files_per_package
+	parts = ["package_{}".format(index_at_package)]
+	parts.extend(
+		"level_{}".format(level)
+			for level in range(1, package_depth))
+	path_to_package = os.path.join(
+		path_to_directory,
+		*parts)
+	return path_to_package
+
+
+def get_custom_module_index(random_state, index_at_file, number_files, cycle_density):
+	## forward imports only ==> acyclic; a backward import closes a cycle with some probability
+	if (index_at_file > 0) and (random_state.random() < cycle_density):
+		return random_state.randrange(index_at_file)
+	if index_at_file == number_files - 1:
+		return None
+	return random_state.randrange(index_at_file + 1, number_files)
+
+
+def get_import_statement(random_state, module_name):
+	## a mix of the statement shapes seen in real code
+	form = random_state.randrange(4)
+	if form == 0:
+		statement = "import {}".format(module_name)
+	elif form == 1:
+		statement = "import {} as alias_{}".format(module_name, random_state.randrange(1000))
+	elif form == 2:
+		statement = "from {} import name_{}".format(module_name, random_state.randrange(1000))
+	else:
+		statement = "from {}.submodule import (\n\tname_a,\n\tname_b)".format(module_name)
+	return statement
+
+
+def get_source(random_state, module_names, number_lines):
+	labels = [
+		'"""synthetic module"""\n']
+	for module_name in module_names:
+		labels.append(
+			get_import_statement(
+				random_state=random_state,
+				module_name=module_name))
+	source = "\n".join(
+		labels)
+	number_filler_lines = filler_template.count("\n")
+	number_missing_lines = number_lines - source.count("\n")
+	filler_labels = [
+		filler_template.format(
+			index=index)
+			for index in range(max(0, -(-number_missing_lines // number_filler_lines)))]
+	source += "".join(filler_labels) + "\n"
+	return source
+
+
+def write_synthetic_repository(path_to_directory, number_files=1000, number_imports_per_file=10, package_depth=2, common_fraction=0.4, uncommon_fraction=0.2, cycle_density=0.0, number_lines_per_file=60, seed=0):
+	"""
+	Writes number_files modules below path_to_directory and returns a summary of what was written.
+
+	Each import is stdlib (common_fraction), third-party (uncommon_fraction) or another
+	synthetic module (the rest); cycle_density is the probability that a custom import
+	points back to an earlier module, which is what closes import cycles.
+	"""
+	if number_files < 1:
+		raise ValueError("invalid number_files: {}".format(number_files))
+	if (common_fraction < 0) or (uncommon_fraction < 0) or (common_fraction + uncommon_fraction > 1):
+		raise ValueError("invalid fractions: common_fraction={}, uncommon_fraction={}".format(common_fraction, uncommon_fraction))
+	if not (0 <= cycle_density <= 1):
+		raise ValueError("invalid cycle_density: {}".format(cycle_density))
+	random_state = random.Random(
+		seed)
+	common_names, uncommon_names = get_pre_selected_module_names()
+	number_bytes = 0
+	number_imports = 0
+	for index_at_file in range(number_files):
+		module_names = list()
+		for _ in range(number_imports_per_file):
+			value = random_state.random()
+			if value < common_fraction:
+				module_names.append(
+					random_state.choice(
+						common_names))
+			elif value < common_fraction + uncommon_fraction:
+				module_names.append(
+					random_state.choice(
+						uncommon_names))
+			else:
+				index_at_module = get_custom_module_index(
+					random_state=random_state,
+					index_at_file=index_at_file,
+					number_files=number_files,
+					cycle_density=cycle_density)
+				if index_at_module is not None:
+					module_names.append(
+						"module_{}".format(
+							index_at_module))
+		source = get_source(
+			random_state=random_state,
+			module_names=module_names,
+			number_lines=number_lines_per_file)
+		path_to_package = get_path_to_package(
+			path_to_directory=path_to_directory,
+			index_at_file=index_at_file,
+			package_depth=package_depth)
+		os.makedirs(
+			path_to_package,
+			exist_ok=True)
+		path_to_file = os.path.join(
+			path_to_package,
+			"module_{}.py".format(
+				index_at_file))
+		with open(path_to_file, "w") as data_file:
+			data_file.write(
+				source)
+		number_bytes += len(source)
+		number_imports += len(module_names)
+	summary = {
+		"number_files" : number_files,
+		"number_imports_per_file" : number_imports_per_file,
+		"package_depth" : package_depth,
+		"common_fraction" : common_fraction,
+		"uncommon_fraction" : uncommon_fraction,
+		"cycle_density" : cycle_density,
+		"number_lines_per_file" : number_lines_per_file,
+		"seed" : seed,
+		"number_bytes" : number_bytes,
+		"number_imports" : number_imports}
+	return summary
+
+##
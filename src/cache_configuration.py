@@ -0,0 +1,453 @@
+import os
+import json
+import random
+import hashlib
+
+
+class BaseParseCacheConfiguration():
+
+	def __init__(self):
+		super().__init__()
+		self._path_to_cache = None
+		self._signature = None
+		self._is_hash_content = None
+		self._maximum_number_entries = None
+		self._entries = None
+		self._run_index = None
+		self._number_hits = None
+		self._number_misses = None
+		self._number_evictions = None
+
+	@property
+	def path_to_cache(self):
+		return self._path_to_cache
+
+	@property
+	def signature(self):
+		return self._signature
+
+	@property
+	def is_hash_content(self):
+		return self._is_hash_content
+
+	@property
+	def maximum_number_entries(self):
+		return self._maximum_number_entries
+
+	@property
+	def entries(self):
+		return self._entries
+
+	@property
+	def run_index(self):
+		return self._run_index
+
+	@property
+	def number_hits(self):
+		return self._number_hits
+
+	@property
+	def number_misses(self):
+		return self._number_misses
+
+	@property
+	def number_evictions(self):
+		return self._number_evictions
+
+	@staticmethod
+	def get_cache_version():
+		## bump whenever the layout of an entry changes
+		cache_version = 1
+		return cache_version
+
+	@staticmethod
+	def get_content_hash(path_to_file):
+		with open(path_to_file, "rb") as f:
+			content_hash = hashlib.blake2b(
+				f.read(),
+				digest_size=16).hexdigest()
+		return content_hash
+
+	def get_signature_of_rules(self, parser_signature, pre_selected_import_names):
+		## any change to the parser or to the classification rules invalidates every entry
+		rules = {
+			"cache_version" : self.get_cache_version(),
+			"parser" : parser_signature,
+			"classification" : {
+				key : sorted(value)
+					for key, value in pre_selected_import_names.items()}}
+		signature = hashlib.blake2b(
+			json.dumps(
+				rules,
+				sort_keys=True).encode("utf-8"),
+			digest_size=16).hexdigest()
+		return signature
+
+	def initialize_settings(self, path_to_cache, is_hash_content, maximum_number_entries):
+		if not isinstance(path_to_cache, str):
+			raise ValueError("invalid type(path_to_cache): {}".format(type(path_to_cache)))
+		if not isinstance(is_hash_content, bool):
+			raise ValueError("invalid type(is_hash_content): {}".format(type(is_hash_content)))
+		if maximum_number_entries is not None:
+			if not isinstance(maximum_number_entries, int):
+				raise ValueError("invalid type(maximum_number_entries): {}".format(type(maximum_number_entries)))
+			if maximum_number_entries <= 0:
+				raise ValueError("invalid maximum_number_entries: {}".format(maximum_number_entries))
+		self._path_to_cache = path_to_cache
+		self._is_hash_content = is_hash_content
+		self._maximum_number_entries = maximum_number_entries
+		self._number_hits = 0
+		self._number_misses = 0
+		self._number_evictions = 0
+
+	def initialize_entries(self, signature):
+		entries = dict()
+		run_index = 0
+		if os.path.isfile(self.path_to_cache):
+			try:
+				with open(self.path_to_cache, "r") as data_file:
+					data = json.load(
+						data_file)
+			except (OSError, ValueError):
+				## unreadable or truncated cache ==> start over
+				data = None
+			if isinstance(data, dict):
+				is_compatible = (
+					(data.get("version") == self.get_cache_version()) and (data.get("signature") == signature))
+				if is_compatible:
+					entries = data["entries"]
+					run_index = data["run_index"] + 1
+		self._signature = signature
+		self._entries = entries
+		self._run_index = run_index
+
+	@staticmethod
+	def get_identity(path_to_file):
+		## taken before the file is read ==> a file edited during the scan is stored with its old
+		## identity, which no longer matches on the next run; raises OSError like os.stat
+		status = os.stat(
+			path_to_file)
+		identity = {
+			"mtime_ns" : status.st_mtime_ns,
+			"size" : status.st_size,
+			"content_hash" : None}
+		return identity
+
+	def update_content_hash(self, path_to_file, identity):
+		## also before the file is read; None ==> unreadable, the entry then never matches by content
+		if self.is_hash_content and (identity["content_hash"] is None):
+			try:
+				identity["content_hash"] = self.get_content_hash(
+					path_to_file)
+			except OSError:
+				identity["content_hash"] = None
+
+	def get_module_names(self, path_to_file, identity=None):
+		## identity: see get_identity; taken here if not given; a file that vanished since the walk is a miss
+		entry = self.entries.get(
+			path_to_file)
+		if (entry is not None) and (identity is None):
+			try:
+				identity = self.get_identity(
+					path_to_file)
+			except OSError:
+				identity = None
+		if (entry is None) or (identity is None):
+			self._number_misses += 1
+			return None
+		is_same_identity = (
+			(entry["mtime_ns"] == identity["mtime_ns"]) and (entry["size"] == identity["size"]))
+		if not is_same_identity:
+			## touched or re-checked-out files keep their entry when the content is unchanged
+			if self.is_hash_content and (entry["content_hash"] is not None) and (entry["size"] == identity["size"]):
+				self.update_content_hash(
+					path_to_file=path_to_file,
+					identity=identity)
+				if entry["content_hash"] == identity["content_hash"]:
+					entry["mtime_ns"] = identity["mtime_ns"]
+					is_same_identity = True
+		if not is_same_identity:
+			self._number_misses += 1
+			return None
+		entry["run_index"] = self.run_index
+		self._number_hits += 1
+		module_names = list(
+			entry["module_names"])
+		return module_names
+
+	def update_module_names(self, path_to_file, module_names, identity):
+		## identity: taken before the file was read (get_identity, then update_content_hash)
+		self._entries[path_to_file] = {
+			"mtime_ns" : identity["mtime_ns"],
+			"size" : identity["size"],
+			"content_hash" : identity["content_hash"],
+			"module_names" : list(module_names),
+			"run_index" : self.run_index}
+
+	def evict_entries(self):
+		if self.maximum_number_entries is not None:
+			number_excess_entries = len(self.entries) - self.maximum_number_entries
+			if number_excess_entries > 0:
+				## least-recently-used entries go first
+				paths_to_files = sorted(
+					self.entries.keys(),
+					key=lambda path_to_file : self.entries[path_to_file]["run_index"])
+				for path_to_file in paths_to_files[:number_excess_entries]:
+					del self._entries[path_to_file]
+				self._number_evictions += number_excess_entries
+
+	def save(self):
+		self.evict_entries()
+		data = {
+			"version" : self.get_cache_version(),
+			"signature" : self.signature,
+			"run_index" : self.run_index,
+			"entries" : self.entries}
+		path_to_temporary_file = "{}.tmp".format(
+			self.path_to_cache)
+		with open(path_to_temporary_file, "w") as data_file:
+			json.dump(
+				data,
+				data_file)
+		## atomic replace ==> a crashed run never leaves a half-written cache behind
+		os.replace(
+			path_to_temporary_file,
+			self.path_to_cache)
+
+class ParseCacheConfiguration(BaseParseCacheConfiguration):
+
+	def __init__(self, path_to_cache, parser_signature, pre_selected_import_names, is_hash_content=False, maximum_number_entries=None):
+		super().__init__()
+		self.initialize_settings(
+			path_to_cache=path_to_cache,
+			is_hash_content=is_hash_content,
+			maximum_number_entries=maximum_number_entries)
+		signature = self.get_signature_of_rules(
+			parser_signature=parser_signature,
+			pre_selected_import_names=pre_selected_import_names)
+		self.initialize_entries(
+			signature=signature)
+
+	def __repr__(self):
+		parse_cache = f"ParseCacheConfiguration({self.path_to_cache!r})"
+		return parse_cache
+
+	def __str__(self):
+		number_lookups = self.number_hits + self.number_misses
+		if number_lookups == 0:
+			hit_rate = 0
+		else:
+			hit_rate = 100 * self.number_hits / number_lookups
+		s = "parse cache: {} hits, {} misses ({:.1f}% hit rate), {} evictions, {} entries".format(
+			self.number_hits,
+			self.number_misses,
+			hit_rate,
+			self.number_evictions,
+			len(self.entries))
+		return s
+
+class BaseLayoutCacheConfiguration():
+
+	def __init__(self):
+		super().__init__()
+		self._path_to_cache = None
+		self._entries = None
+		self._number_hits = None
+		self._number_warm_starts = None
+		self._number_misses = None
+
+	@property
+	def path_to_cache(self):
+		return self._path_to_cache
+
+	@property
+	def entries(self):
+		return self._entries
+
+	@property
+	def number_hits(self):
+		return self._number_hits
+
+	@property
+	def number_warm_starts(self):
+		return self._number_warm_starts
+
+	@property
+	def number_misses(self):
+		return self._number_misses
+
+	@staticmethod
+	def get_cache_version():
+		## bump whenever the layout of an entry changes
+		cache_version = 1
+		return cache_version
+
+	@staticmethod
+	def get_warm_start_layouts():
+		## iterative layouts accept initial positions; the others are deterministic and cheap to recompute
+		warm_start_layouts = (
+			"spring",
+			"arf")
+		return warm_start_layouts
+
+	@staticmethod
+	def get_structural_hash(graph):
+		structure = {
+			"nodes" : sorted(
+				graph.nodes()),
+			"edges" : sorted(
+				graph.edges())}
+		structural_hash = hashlib.blake2b(
+			json.dumps(
+				structure).encode("utf-8"),
+			digest_size=16).hexdigest()
+		return structural_hash
+
+	@staticmethod
+	def get_layout_key(layout, layout_kwargs=None):
+		## one entry per layout and parameter set; the structure is compared inside the entry
+		if layout_kwargs is None:
+			layout_kwargs = dict()
+		layout_key = json.dumps(
+			{"layout" : layout, **layout_kwargs},
+			sort_keys=True)
+		return layout_key
+
+	@staticmethod
+	def get_neighbors(nodes, edges):
+		neighbors = {
+			node : set()
+				for node in nodes}
+		for source, target in edges:
+			neighbors[source].add(
+				target)
+			neighbors[target].add(
+				source)
+		return neighbors
+
+	def initialize_entries(self, path_to_cache):
+		if not isinstance(path_to_cache, str):
+			raise ValueError("invalid type(path_to_cache): {}".format(type(path_to_cache)))
+		entries = dict()
+		if os.path.isfile(path_to_cache):
+			try:
+				with open(path_to_cache, "r") as data_file:
+					data = json.load(
+						data_file)
+			except (OSError, ValueError):
+				## unreadable or truncated cache ==> start over
+				data = None
+			if isinstance(data, dict) and (data.get("version") == self.get_cache_version()):
+				entries = data["entries"]
+		self._path_to_cache = path_to_cache
+		self._entries = entries
+		self._number_hits = 0
+		self._number_warm_starts = 0
+		self._number_misses = 0
+
+	def get_positions(self, graph, layout, layout_kwargs=None):
+		## exact hit ==> same structure and same layout parameters; None otherwise
+		entry = self.entries.get(
+			self.get_layout_key(
+				layout=layout,
+				layout_kwargs=layout_kwargs))
+		if (entry is None) or (entry["structural_hash"] != self.get_structural_hash(graph)):
+			return None
+		self._number_hits += 1
+		positions = {
+			node : tuple(position)
+				for node, position in entry["positions"].items()}
+		return positions
+
+	def get_warm_start(self, graph, layout, layout_kwargs=None, seed=0):
+		## cached positions for known nodes; new nodes start at the mean of their known neighbours;
+		## nodes whose neighbours are unchanged are fixed ==> only new or changed nodes settle
+		entry = self.entries.get(
+			self.get_layout_key(
+				layout=layout,
+				layout_kwargs=layout_kwargs))
+		if (entry is None) or (layout not in self.get_warm_start_layouts()):
+			self._number_misses += 1
+			return None, None
+		cached_positions = entry["positions"]
+		previous_neighbors = self.get_neighbors(
+			nodes=cached_positions.keys(),
+			edges=entry["edges"])
+		neighbors = self.get_neighbors(
+			nodes=graph.nodes(),
+			edges=graph.edges())
+		random_state = random.Random(
+			seed)
+		initial_positions = dict()
+		fixed_nodes = list()
+		for node in graph.nodes():
+			if node in cached_positions:
+				initial_positions[node] = tuple(
+					cached_positions[node])
+				if previous_neighbors[node] == neighbors[node]:
+					fixed_nodes.append(
+						node)
+		for node in graph.nodes():
+			if node not in initial_positions:
+				known_positions = [
+					initial_positions[neighbor]
+						for neighbor in neighbors[node]
+							if neighbor in initial_positions]
+				if len(known_positions) == 0:
+					initial_positions[node] = (
+						random_state.uniform(-1, 1),
+						random_state.uniform(-1, 1))
+				else:
+					## a small offset keeps the new node off its neighbours
+					initial_positions[node] = (
+						sum(x for x, y in known_positions) / len(known_positions) + random_state.uniform(-0.05, 0.05),
+						sum(y for x, y in known_positions) / len(known_positions) + random_state.uniform(-0.05, 0.05))
+		self._number_warm_starts += 1
+		return initial_positions, fixed_nodes
+
+	def update_positions(self, graph, layout, positions, layout_kwargs=None):
+		self._entries[self.get_layout_key(layout=layout, layout_kwargs=layout_kwargs)] = {
+			"structural_hash" : self.get_structural_hash(
+				graph),
+			"positions" : {
+				node : [float(value) for value in position]
+					for node, position in positions.items()},
+			"edges" : [
+				[source, target]
+					for source, target in graph.edges()]}
+
+	def save(self):
+		data = {
+			"version" : self.get_cache_version(),
+			"entries" : self.entries}
+		path_to_temporary_file = "{}.tmp".format(
+			self.path_to_cache)
+		with open(path_to_temporary_file, "w") as data_file:
+			json.dump(
+				data,
+				data_file)
+		## atomic replace ==> a crashed run never leaves a half-written cache behind
+		os.replace(
+			path_to_temporary_file,
+			self.path_to_cache)
+
+class LayoutCacheConfiguration(BaseLayoutCacheConfiguration):
+
+	def __init__(self, path_to_cache):
+		super().__init__()
+		self.initialize_entries(
+			path_to_cache=path_to_cache)
+
+	def __repr__(self):
+		layout_cache = f"LayoutCacheConfiguration({self.path_to_cache!r})"
+		return layout_cache
+
+	def __str__(self):
+		s = "layout cache: {} hits, {} warm starts, {} misses, {} entries".format(
+			self.number_hits,
+			self.number_warm_starts,
+			self.number_misses,
+			len(self.entries))
+		return s
+
+##
@@ -1,9 +1,21 @@
+import os
 from tree_configuration import ModuleTreeConfiguration
 from network_configuration import NetworkConfiguration
 
 
-path_to_directory = "/Users/owner/Desktop/programming/module_network_tree/src/"
-path_to_save_directory = "/Users/owner/Desktop/programming/module_network_tree/output/"
+## this repository's own src/ and output/ ==> runs as is; point both at another code-base to map it
+path_to_directory = os.path.join(
+	os.path.dirname(
+		os.path.abspath(
+			__file__)),
+	"")
+path_to_save_directory = os.path.join(
+	os.path.dirname(
+		os.path.dirname(
+			os.path.abspath(
+				__file__))),
+	"output",
+	"")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,442 @@
+import numpy as np
+
+
+class BaseCompactGraphConfiguration():
+
+	def __init__(self):
+		super().__init__()
+		self._names = None
+		self._indices_at_names = None
+		self._out_index_pointers = None
+		self._out_indices = None
+		self._in_index_pointers = None
+		self._in_indices = None
+
+	@property
+	def names(self):
+		return self._names
+
+	@property
+	def indices_at_names(self):
+		return self._indices_at_names
+
+	@property
+	def out_index_pointers(self):
+		return self._out_index_pointers
+
+	@property
+	def out_indices(self):
+		return self._out_indices
+
+	@property
+	def in_index_pointers(self):
+		return self._in_index_pointers
+
+	@property
+	def in_indices(self):
+		return self._in_indices
+
+	@property
+	def number_nodes(self):
+		return len(self.names)
+
+	@property
+	def number_edges(self):
+		return int(self.out_indices.size)
+
+	@staticmethod
+	def get_compressed_rows(rows, columns, number_rows):
+		## CSR ==> neighbours of row i are columns[index_pointers[i] : index_pointers[i + 1]];
+		## a stable sort keeps neighbours in edge-insertion order, as in an nx.DiGraph
+		order = np.argsort(
+			rows,
+			kind="stable")
+		compressed_columns = columns[order]
+		counts = np.bincount(
+			rows,
+			minlength=number_rows)
+		index_pointers = np.zeros(
+			number_rows + 1,
+			dtype=np.int64)
+		np.cumsum(
+			counts,
+			out=index_pointers[1:])
+		return index_pointers, compressed_columns
+
+	@staticmethod
+	def get_neighbors_at(index_pointers, indices, nodes):
+		## vectorized gather of the concatenated neighbour lists of several nodes
+		starts = index_pointers[nodes]
+		lengths = index_pointers[nodes + 1] - starts
+		number_neighbors = int(
+			np.sum(
+				lengths))
+		if number_neighbors == 0:
+			return np.zeros(
+				0,
+				dtype=indices.dtype)
+		offsets = np.repeat(
+			starts - (np.cumsum(lengths) - lengths),
+			lengths)
+		neighbors = indices[offsets + np.arange(number_neighbors)]
+		return neighbors
+
+	def initialize_names(self, names):
+		## interning ==> every module name is stored once and referred to by its integer id
+		modified_names = list()
+		indices_at_names = dict()
+		for name in names:
+			if name not in indices_at_names:
+				indices_at_names[name] = len(modified_names)
+				modified_names.append(
+					name)
+		self._names = modified_names
+		self._indices_at_names = indices_at_names
+
+	def initialize_edges(self, edges):
+		if len(edges) == 0:
+			sources = np.zeros(
+				0,
+				dtype=np.int32)
+			targets = np.zeros(
+				0,
+				dtype=np.int32)
+		else:
+			## duplicate edges collapse, as in a DiGraph
+			edge_indices = np.array(
+				[(self.indices_at_names[source], self.indices_at_names[target]) for source, target in dict.fromkeys(edges)],
+				dtype=np.int32)
+			sources = edge_indices[:, 0]
+			targets = edge_indices[:, 1]
+		self.initialize_edge_indices(
+			sources=sources,
+			targets=targets)
+
+	def initialize_edge_indices(self, sources, targets):
+		out_index_pointers, out_indices = self.get_compressed_rows(
+			rows=sources,
+			columns=targets,
+			number_rows=self.number_nodes)
+		in_index_pointers, in_indices = self.get_compressed_rows(
+			rows=targets,
+			columns=sources,
+			number_rows=self.number_nodes)
+		self._out_index_pointers = out_index_pointers
+		self._out_indices = out_indices
+		self._in_index_pointers = in_index_pointers
+		self._in_indices = in_indices
+
+	def has_node(self, name):
+		return name in self.indices_at_names
+
+	def get_out_degrees(self):
+		out_degrees = np.diff(
+			self.out_index_pointers)
+		return out_degrees
+
+	def get_in_degrees(self):
+		in_degrees = np.diff(
+			self.in_index_pointers)
+		return in_degrees
+
+	def get_top_level_indices(self):
+		top_level_indices = np.flatnonzero(
+			self.get_in_degrees() == 0)
+		return top_level_indices
+
+	def get_top_level_names(self):
+		top_level_names = [
+			self.names[index]
+				for index in self.get_top_level_indices()]
+		return top_level_names
+
+	def get_successor_indices(self, index):
+		successor_indices = self.out_indices[self.out_index_pointers[index] : self.out_index_pointers[index + 1]]
+		return successor_indices
+
+	def get_predecessor_indices(self, index):
+		predecessor_indices = self.in_indices[self.in_index_pointers[index] : self.in_index_pointers[index + 1]]
+		return predecessor_indices
+
+	def get_successors(self, name):
+		successors = [
+			self.names[index]
+				for index in self.get_successor_indices(
+					index=self.indices_at_names[name])]
+		return successors
+
+	def get_predecessors(self, name):
+		predecessors = [
+			self.names[index]
+				for index in self.get_predecessor_indices(
+					index=self.indices_at_names[name])]
+		return predecessors
+
+	def get_edge_indices(self):
+		sources = np.repeat(
+			np.arange(
+				self.number_nodes,
+				dtype=self.out_indices.dtype),
+			self.get_out_degrees())
+		targets = self.out_indices
+		return sources, targets
+
+	def get_topological_generations(self):
+		## Kahn's algorithm, one vectorized step per generation
+		in_degrees = self.get_in_degrees().copy()
+		generation = np.flatnonzero(
+			in_degrees == 0)
+		generations = list()
+		number_visited_nodes = 0
+		while generation.size > 0:
+			generations.append(
+				generation)
+			number_visited_nodes += generation.size
+			successors = self.get_neighbors_at(
+				index_pointers=self.out_index_pointers,
+				indices=self.out_indices,
+				nodes=generation)
+			decrements = np.bincount(
+				successors,
+				minlength=self.number_nodes)
+			in_degrees -= decrements
+			candidates = np.flatnonzero(
+				decrements)
+			generation = candidates[in_degrees[candidates] == 0]
+		if number_visited_nodes != self.number_nodes:
+			raise ValueError("graph contains cycles; topological generations are undefined")
+		return generations
+
+	def get_strongly_connected_components(self):
+		## iterative Tarjan ==> O(V + E) without recursion limits
+		number_nodes = self.number_nodes
+		out_index_pointers = self.out_index_pointers.tolist()
+		out_indices = self.out_indices.tolist()
+		visit_order = [-1] * number_nodes
+		low_links = [0] * number_nodes
+		is_on_stack = [False] * number_nodes
+		stack = list()
+		components = list()
+		counter = 0
+		for root in range(number_nodes):
+			if visit_order[root] != -1:
+				continue
+			call_stack = [(root, out_index_pointers[root])]
+			visit_order[root] = low_links[root] = counter
+			counter += 1
+			stack.append(
+				root)
+			is_on_stack[root] = True
+			while len(call_stack) > 0:
+				node, position = call_stack[-1]
+				if position < out_index_pointers[node + 1]:
+					call_stack[-1] = (node, position + 1)
+					successor = out_indices[position]
+					if visit_order[successor] == -1:
+						visit_order[successor] = low_links[successor] = counter
+						counter += 1
+						stack.append(
+							successor)
+						is_on_stack[successor] = True
+						call_stack.append(
+							(successor, out_index_pointers[successor]))
+					elif is_on_stack[successor]:
+						low_links[node] = min(
+							low_links[node],
+							visit_order[successor])
+				else:
+					call_stack.pop()
+					if len(call_stack) > 0:
+						parent = call_stack[-1][0]
+						low_links[parent] = min(
+							low_links[parent],
+							low_links[node])
+					if low_links[node] == visit_order[node]:
+						component = list()
+						while True:
+							member = stack.pop()
+							is_on_stack[member] = False
+							component.append(
+								member)
+							if member == node:
+								break
+						components.append(
+							component)
+		return components
+
+	def get_shortest_cycle_indices(self, indices):
+		## breadth-first search from the first member back to itself, restricted to the component
+		members = set(
+			indices)
+		source = min(
+			indices,
+			key=lambda index : self.names[index])
+		parents = {
+			source : None}
+		queue = [source]
+		index_at_queue = 0
+		while index_at_queue < len(queue):
+			node = queue[index_at_queue]
+			index_at_queue += 1
+			for successor in self.get_successor_indices(node).tolist():
+				if successor == source:
+					cycle = list()
+					while node is not None:
+						cycle.append(
+							node)
+						node = parents[node]
+					cycle.reverse()
+					return cycle
+				if (successor in members) and (successor not in parents):
+					parents[successor] = node
+					queue.append(
+						successor)
+		raise ValueError("indices do not form a cycle: {}".format(indices))
+
+	def get_condensation(self, components=None):
+		## one node per strongly-connected component; the result is always acyclic
+		if components is None:
+			components = self.get_strongly_connected_components()
+		membership = np.zeros(
+			self.number_nodes,
+			dtype=np.int32)
+		for index_at_component, component in enumerate(components):
+			membership[component] = index_at_component
+		sources, targets = self.get_edge_indices()
+		component_sources = membership[sources]
+		component_targets = membership[targets]
+		is_external = (component_sources != component_targets)
+		condensed_edges = np.unique(
+			np.stack(
+				(component_sources[is_external], component_targets[is_external]),
+				axis=1),
+			axis=0)
+		condensation = CompactGraphConfiguration()
+		condensation.initialize_names(
+			names=range(
+				len(components)))
+		condensation.initialize_edge_indices(
+			sources=condensed_edges[:, 0],
+			targets=condensed_edges[:, 1])
+		return condensation, membership
+
+	def get_barycenters(self, index_pointers, indices, nodes, positions):
+		## mean position of the neighbours of each node; nodes without neighbours keep their own position
+		starts = index_pointers[nodes]
+		lengths = index_pointers[nodes + 1] - starts
+		neighbors = self.get_neighbors_at(
+			index_pointers=index_pointers,
+			indices=indices,
+			nodes=nodes)
+		owners = np.repeat(
+			np.arange(
+				nodes.size),
+			lengths)
+		sums = np.bincount(
+			owners,
+			weights=positions[neighbors],
+			minlength=nodes.size)
+		barycenters = positions[nodes].copy()
+		is_connected = (lengths > 0)
+		barycenters[is_connected] = sums[is_connected] / lengths[is_connected]
+		return barycenters
+
+	@staticmethod
+	def update_layer_positions(positions, layer, widths):
+		## consecutive spans of width widths[node], centred on zero, in the order given by layer
+		layer_widths = widths[layer]
+		ends = np.cumsum(
+			layer_widths)
+		positions[layer] = ends - (layer_widths + 1) / 2 - (ends[-1] - 1) / 2
+
+	def get_layered_positions(self, number_sweeps=4):
+		## rows are topological generations of the condensation ==> O(V + E), and cycles are allowed;
+		## the members of one strongly-connected component sit side by side in the same row
+		if not isinstance(number_sweeps, int):
+			raise ValueError("invalid type(number_sweeps): {}".format(type(number_sweeps)))
+		if number_sweeps < 0:
+			raise ValueError("invalid number_sweeps: {}".format(number_sweeps))
+		if self.number_nodes == 0:
+			return np.zeros(0), np.zeros(0)
+		components = self.get_strongly_connected_components()
+		condensation, membership = self.get_condensation(
+			components=components)
+		layers = condensation.get_topological_generations()
+		widths = np.array(
+			[len(component) for component in components],
+			dtype=float)
+		positions = np.zeros(
+			condensation.number_nodes)
+		for layer in layers:
+			self.update_layer_positions(
+				positions=positions,
+				layer=layer,
+				widths=widths)
+		## barycenter heuristic; downward sweeps follow predecessors, upward sweeps follow successors
+		for index_at_sweep in range(number_sweeps):
+			if index_at_sweep % 2 == 0:
+				indices_at_layers = range(1, len(layers))
+				index_pointers = condensation.in_index_pointers
+				indices = condensation.in_indices
+			else:
+				indices_at_layers = range(len(layers) - 2, -1, -1)
+				index_pointers = condensation.out_index_pointers
+				indices = condensation.out_indices
+			for index_at_layer in indices_at_layers:
+				layer = layers[index_at_layer]
+				barycenters = condensation.get_barycenters(
+					index_pointers=index_pointers,
+					indices=indices,
+					nodes=layer,
+					positions=positions)
+				layer = layer[np.argsort(barycenters, kind="stable")]
+				layers[index_at_layer] = layer
+				self.update_layer_positions(
+					positions=positions,
+					layer=layer,
+					widths=widths)
+		rows = np.zeros(
+			condensation.number_nodes)
+		for index_at_layer, layer in enumerate(layers):
+			rows[layer] = index_at_layer
+		offsets = np.zeros(
+			self.number_nodes)
+		for component in components:
+			if len(component) > 1:
+				offsets[component] = np.arange(len(component)) - (len(component) - 1) / 2
+		## normalized to [-0.5, 0.5] horizontally and [-1, 0] vertically; the first generation is on top
+		maximum_width = max(
+			float(np.sum(widths[layer]))
+				for layer in layers)
+		x = (positions[membership] + offsets) / max(maximum_width, 1.0)
+		y = -rows[membership] / max(len(layers) - 1, 1)
+		return x, y
+
+	def to_networkx(self):
+		import networkx as nx
+		graph = nx.DiGraph()
+		graph.add_nodes_from(
+			self.names)
+		sources, targets = self.get_edge_indices()
+		graph.add_edges_from(
+			(self.names[source], self.names[target])
+				for source, target in zip(sources.tolist(), targets.tolist()))
+		return graph
+
+class CompactGraphConfiguration(BaseCompactGraphConfiguration):
+
+	def __init__(self, names=None, edges=None):
+		super().__init__()
+		if names is not None:
+			self.initialize_names(
+				names=names)
+			if edges is None:
+				edges = list()
+			self.initialize_edges(
+				edges=edges)
+
+	def __repr__(self):
+		compact_graph = f"CompactGraphConfiguration(number_nodes={self.number_nodes}, number_edges={self.number_edges})"
+		return compact_graph
+
+##
\ No newline at end of file
@@ -0,0 +1,51 @@
+import argparse
+from history_configuration import HistoryConfiguration
+
+
+## e.g. python src/history_analysis.py . --subdirectory src --range v1.0..HEAD --json output/history.json
+## the same from python: history = HistoryConfiguration(path_to_repository=".", subdirectory="src"),
+## history.initialize(revision_range="v1.0..HEAD"), history.write_history_to_file("output/history.json");
+## each distinct blob is parsed once, and only a bounded number of blob sources wait in the pool
+if __name__ == "__main__":
+
+	parser = argparse.ArgumentParser(
+		description="print import-graph metrics for every commit of a git repository, read from the object database without checkouts")
+	parser.add_argument("path_to_repository")
+	parser.add_argument("--subdirectory", default=None, help="only python files below this path (relative to the top level)")
+	parser.add_argument("--range", default="HEAD", help="revision range passed to git rev-list")
+	parser.add_argument("--maximum-number-commits", type=int, default=None, help="only the most recent commits of the range")
+	parser.add_argument("--all-parents", action="store_true", help="follow merged branches too, not only first parents")
+	parser.add_argument("--scan-mode", default="process", choices=("serial", "process", "thread"))
+	parser.add_argument("--number-workers", type=int, default=None)
+	parser.add_argument("--extractor", default="ast", choices=("ast", "tokenize", "mmap"))
+	parser.add_argument("--maximum-file-size", type=int, default=None, help="larger files are skipped (bytes)")
+	parser.add_argument("--json", default=None, help="also write the series and the edge diffs to this file")
+	arguments = parser.parse_args()
+	history = HistoryConfiguration(
+		path_to_repository=arguments.path_to_repository,
+		subdirectory=arguments.subdirectory,
+		extractor=arguments.extractor,
+		maximum_file_size=arguments.maximum_file_size)
+	history.initialize(
+		revision_range=arguments.range,
+		maximum_number_commits=arguments.maximum_number_commits,
+		is_first_parent=not arguments.all_parents,
+		scan_mode=arguments.scan_mode,
+		number_workers=arguments.number_workers)
+	keys = (
+		"number_files",
+		"number_nodes",
+		"number_edges",
+		"number_cyclic_components",
+		"depth",
+		"number_top_level_nodes")
+	## tab-separated ==> ready for a spreadsheet or a plotting script
+	print("\t".join(("commit", "time") + keys))
+	for record in history.history:
+		print("\t".join(
+			[record["commit"][:12], str(record["time"])] + [str(record["metrics"][key]) for key in keys]))
+	if arguments.json is not None:
+		history.write_history_to_file(
+			path_to_file=arguments.json)
+
+##
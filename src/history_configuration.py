@@ -0,0 +1,500 @@
+import os
+import json
+import threading
+import subprocess
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from node_visitor_configuration import NodeVisitorConfiguration
+from tree_configuration import ModuleTreeConfiguration, get_imported_module_names_from_source
+from network_configuration import NetworkConfiguration
+
+
+def get_commit_metrics(path_to_directory, paths_to_files, module_names_per_file, skipped_files, extractor, reader_settings, network_settings):
+	## module-level so that process-pool workers can unpickle it
+	tree = ModuleTreeConfiguration()
+	tree.initialize_from_module_names(
+		path_to_directory=path_to_directory,
+		paths_to_files=paths_to_files,
+		module_names_per_file=module_names_per_file,
+		skipped_files=skipped_files,
+		extractor=extractor,
+		**reader_settings)
+	network = NetworkConfiguration(
+		tree=tree,
+		cycle_mode="condense",
+		graph_backend="compact",
+		**network_settings)
+	core = network.core
+	names = list(
+		core.names)
+	sources, targets = core.get_edge_indices()
+	edges = [
+		(names[source], names[target])
+			for source, target in zip(sources.tolist(), targets.tolist())]
+	## depth ==> the longest import chain, counted in edges; members of a cycle count as one module
+	if network.is_acyclic:
+		generations = core.get_topological_generations()
+	else:
+		generations = network.condensation.get_topological_generations()
+	metrics = {
+		"number_files" : len(paths_to_files),
+		"number_skipped_files" : len(skipped_files),
+		"number_nodes" : len(names),
+		"number_edges" : len(edges),
+		"number_cyclic_components" : len(network.cyclic_components),
+		"number_cyclic_nodes" : sum(
+			len(cyclic_component["nodes"])
+				for cyclic_component in network.cyclic_components),
+		"depth" : max(0, len(generations) - 1),
+		"number_top_level_nodes" : len(network.top_level_nodes),
+		"top_level_nodes" : sorted(network.top_level_nodes)}
+	return metrics, names, edges
+
+
+class BaseHistoryConfiguration():
+
+	def __init__(self):
+		super().__init__()
+		self._path_to_repository = None
+		self._subdirectory = None
+		self._extractor = None
+		self._reader_settings = None
+		self._network_settings = None
+		self._commits = None
+		self._entries_per_commit = None
+		self._module_names_at_blobs = None
+		self._skipped_blobs = None
+		self._history = None
+		self._diffs = None
+		self._number_parsed_blobs = None
+		self._number_reused_blobs = None
+
+	@property
+	def path_to_repository(self):
+		return self._path_to_repository
+
+	@property
+	def subdirectory(self):
+		return self._subdirectory
+
+	@property
+	def extractor(self):
+		return self._extractor
+
+	@property
+	def reader_settings(self):
+		return self._reader_settings
+
+	@property
+	def network_settings(self):
+		return self._network_settings
+
+	@property
+	def commits(self):
+		return self._commits
+
+	@property
+	def entries_per_commit(self):
+		return self._entries_per_commit
+
+	@property
+	def module_names_at_blobs(self):
+		return self._module_names_at_blobs
+
+	@property
+	def skipped_blobs(self):
+		return self._skipped_blobs
+
+	@property
+	def history(self):
+		return self._history
+
+	@property
+	def diffs(self):
+		return self._diffs
+
+	@property
+	def number_parsed_blobs(self):
+		return self._number_parsed_blobs
+
+	@property
+	def number_reused_blobs(self):
+		return self._number_reused_blobs
+
+	def get_git_output(self, arguments):
+		process = subprocess.run(
+			["git", "-C", self.path_to_repository] + arguments,
+			stdout=subprocess.PIPE,
+			stderr=subprocess.PIPE)
+		if process.returncode != 0:
+			raise ValueError("git {} failed: {}".format(
+				arguments[0],
+				process.stderr.decode("utf-8", "replace").strip()))
+		return process.stdout
+
+	def initialize_repository(self, path_to_repository, subdirectory=None):
+		if not isinstance(path_to_repository, str):
+			raise ValueError("invalid type(path_to_repository): {}".format(type(path_to_repository)))
+		if (subdirectory is not None) and (not isinstance(subdirectory, str)):
+			raise ValueError("invalid type(subdirectory): {}".format(type(subdirectory)))
+		self._path_to_repository = path_to_repository
+		## paths from git ls-tree are relative to the top level, wherever path_to_repository points
+		self._path_to_repository = self.get_git_output(
+			["rev-parse", "--show-toplevel"]).decode("utf-8").strip()
+		self._subdirectory = subdirectory
+
+	def initialize_settings(self, extractor, is_header_only, maximum_file_size, maximum_parse_time, is_qualified, is_include_common, is_include_uncommon, is_include_custom):
+		extractors = (
+			"ast",
+			"tokenize",
+			"mmap")
+		if extractor not in extractors:
+			raise ValueError("invalid extractor: {}".format(extractor))
+		reader_settings = {
+			"is_header_only" : is_header_only,
+			"maximum_file_size" : maximum_file_size,
+			"maximum_parse_time" : maximum_parse_time,
+			"is_qualified" : is_qualified}
+		## validated here ==> a bad setting fails before git is asked for anything
+		NodeVisitorConfiguration(
+			extractor=extractor,
+			**reader_settings)
+		self._extractor = extractor
+		self._reader_settings = reader_settings
+		self._network_settings = {
+			"is_include_common" : is_include_common,
+			"is_include_uncommon" : is_include_uncommon,
+			"is_include_custom" : is_include_custom}
+
+	def initialize_commits(self, revision_range, maximum_number_commits=None, is_first_parent=True):
+		## oldest first; with maximum_number_commits, the most recent commits of the range
+		if not isinstance(revision_range, str):
+			raise ValueError("invalid type(revision_range): {}".format(type(revision_range)))
+		arguments = [
+			"rev-list",
+			"--reverse",
+			"--timestamp"]
+		if is_first_parent:
+			arguments.append(
+				"--first-parent")
+		if maximum_number_commits is not None:
+			if (not isinstance(maximum_number_commits, int)) or (maximum_number_commits <= 0):
+				raise ValueError("invalid maximum_number_commits: {}".format(maximum_number_commits))
+			arguments.append(
+				"--max-count={}".format(maximum_number_commits))
+		arguments.extend([
+			revision_range,
+			"--"])
+		commits = list()
+		for line in self.get_git_output(arguments).decode("utf-8").splitlines():
+			commit_time, commit = line.split()
+			commits.append({
+				"commit" : commit,
+				"time" : int(commit_time)})
+		self._commits = commits
+
+	@staticmethod
+	def get_walk_order(path):
+		## the order of get_paths_to_files: files of a directory before those of its sub-directories
+		parts = path.split(
+			"/")
+		walk_order = (parts[:-1], parts[-1])
+		return walk_order
+
+	def get_entries(self, commit):
+		## (path, blob id) of every python file in the commit; no checkout, only the tree objects are read
+		arguments = [
+			"ls-tree",
+			"-r",
+			"-z",
+			commit]
+		if self.subdirectory is not None:
+			arguments.extend([
+				"--",
+				self.subdirectory])
+		entries = list()
+		for record in self.get_git_output(arguments).decode("utf-8").split("\0"):
+			if len(record) > 0:
+				information, path = record.split(
+					"\t",
+					1)
+				mode, object_type, object_id = information.split()
+				## symbolic links and submodules have no source to parse
+				if (object_type == "blob") and (mode != "120000") and path.endswith(".py"):
+					entries.append(
+						(path, object_id))
+		entries.sort(
+			key=lambda entry : self.get_walk_order(
+				path=entry[0]))
+		return tuple(entries)
+
+	def initialize_entries_per_commit(self, number_workers=None):
+		## one git ls-tree per commit; waiting on git releases the GIL ==> threads are enough
+		with ThreadPoolExecutor(max_workers=number_workers) as executor:
+			entries_per_commit = list(
+				executor.map(
+					self.get_entries,
+					[commit["commit"] for commit in self.commits]))
+		self._entries_per_commit = entries_per_commit
+
+	def get_blobs(self, object_ids):
+		## one git cat-file --batch for every blob ==> no process per file; yields (object id, bytes or None)
+		process = subprocess.Popen(
+			["git", "-C", self.path_to_repository, "cat-file", "--batch"],
+			stdin=subprocess.PIPE,
+			stdout=subprocess.PIPE)
+
+		def write():
+			## written from a thread ==> git never blocks on a full stdout pipe while we are still writing
+			try:
+				for object_id in object_ids:
+					process.stdin.write(
+						"{}\n".format(object_id).encode("ascii"))
+			finally:
+				process.stdin.close()
+
+		writer = threading.Thread(
+			target=write,
+			daemon=True)
+		writer.start()
+		try:
+			for object_id in object_ids:
+				header = process.stdout.readline().split()
+				if (len(header) == 3) and (header[1] == b"blob"):
+					size = int(header[2])
+					source = process.stdout.read(size + 1)[:size]
+				else:
+					source = None
+				yield object_id, source
+		finally:
+			writer.join()
+			process.stdout.close()
+			process.wait()
+
+	def update_module_names_at_blob(self, object_id, result):
+		module_names, skipped_files, number_bytes, elapsed_times = result
+		self._module_names_at_blobs[object_id] = module_names
+		for reason in skipped_files.values():
+			self._skipped_blobs[object_id] = reason
+
+	def update_module_names_at_blobs(self, executor, maximum_number_pending=256):
+		## a blob id names its content ==> each distinct blob is parsed once and every commit holding it reuses the result;
+		## at most maximum_number_pending sources wait in the executor ==> memory stays bounded on long histories
+		if not isinstance(maximum_number_pending, int):
+			raise ValueError("invalid type(maximum_number_pending): {}".format(type(maximum_number_pending)))
+		if maximum_number_pending <= 0:
+			raise ValueError("invalid maximum_number_pending: {}".format(maximum_number_pending))
+		paths_at_object_ids = dict()
+		for entries in self.entries_per_commit:
+			for path, object_id in entries:
+				if (object_id not in self.module_names_at_blobs) and (object_id not in paths_at_object_ids):
+					paths_at_object_ids[object_id] = path
+		object_ids = list(
+			paths_at_object_ids.keys())
+		object_ids_at_futures = dict()
+		for object_id, source in self.get_blobs(object_ids=object_ids):
+			if source is None:
+				self._module_names_at_blobs[object_id] = None
+				self._skipped_blobs[object_id] = "blob is missing from the object database"
+			elif executor is None:
+				self.update_module_names_at_blob(
+					object_id=object_id,
+					result=get_imported_module_names_from_source(
+						paths_at_object_ids[object_id],
+						source,
+						self.extractor,
+						False,
+						self.reader_settings))
+			else:
+				if len(object_ids_at_futures) >= maximum_number_pending:
+					## a completed future drops its source before the next one is submitted
+					done_futures, _ = wait(
+						object_ids_at_futures,
+						return_when=FIRST_COMPLETED)
+					for future in done_futures:
+						self.update_module_names_at_blob(
+							object_id=object_ids_at_futures.pop(future),
+							result=future.result())
+				object_ids_at_futures[executor.submit(
+					get_imported_module_names_from_source,
+					paths_at_object_ids[object_id],
+					source,
+					self.extractor,
+					False,
+					self.reader_settings)] = object_id
+		for future in as_completed(object_ids_at_futures):
+			self.update_module_names_at_blob(
+				object_id=object_ids_at_futures[future],
+				result=future.result())
+		self._number_parsed_blobs += len(
+			object_ids)
+		self._number_reused_blobs += sum(
+			len(entries)
+				for entries in self.entries_per_commit) - len(object_ids)
+
+	def get_commit_arguments(self, entries):
+		path_to_directory = self.path_to_repository if self.subdirectory is None else os.path.join(
+			self.path_to_repository,
+			self.subdirectory)
+		paths_to_files = list()
+		module_names_per_file = list()
+		skipped_files = dict()
+		for path, object_id in entries:
+			path_to_file = os.path.join(
+				self.path_to_repository,
+				*path.split("/"))
+			paths_to_files.append(
+				(path_to_file, os.path.basename(path_to_file)))
+			module_names_per_file.append(
+				self.module_names_at_blobs[object_id])
+			if object_id in self.skipped_blobs:
+				skipped_files[path_to_file] = self.skipped_blobs[object_id]
+		commit_arguments = (path_to_directory, paths_to_files, module_names_per_file, skipped_files, self.extractor, self.reader_settings, self.network_settings)
+		return commit_arguments
+
+	@staticmethod
+	def get_diff(commit, previous_commit, names, edges, previous_names, previous_edges):
+		names, previous_names = set(names), set(previous_names)
+		edges, previous_edges = set(edges), set(previous_edges)
+		diff = {
+			"commit" : commit,
+			"previous_commit" : previous_commit,
+			"added_nodes" : sorted(names - previous_names),
+			"removed_nodes" : sorted(previous_names - names),
+			"added_edges" : sorted(edges - previous_edges),
+			"removed_edges" : sorted(previous_edges - edges)}
+		return diff
+
+	def initialize_history(self, executor):
+		## consecutive commits that leave every python file untouched share one graph ==> built once
+		runs = list()
+		for commit, entries in zip(self.commits, self.entries_per_commit):
+			if (len(runs) > 0) and (runs[-1][0] == entries):
+				runs[-1][1].append(
+					commit)
+			else:
+				runs.append(
+					(entries, [commit]))
+		commit_arguments = [
+			self.get_commit_arguments(
+				entries=entries)
+					for entries, commits in runs]
+		if executor is None:
+			results = (
+				get_commit_metrics(*arguments)
+					for arguments in commit_arguments)
+		else:
+			## executor.map yields in submission order ==> the diffs see the commits oldest first
+			results = executor.map(
+				get_commit_metrics,
+				*zip(*commit_arguments))
+		history = list()
+		diffs = list()
+		previous_commit, previous_names, previous_edges = None, list(), list()
+		for (entries, commits), (metrics, names, edges) in zip(runs, results):
+			for commit in commits:
+				history.append({
+					"commit" : commit["commit"],
+					"time" : commit["time"],
+					"metrics" : metrics})
+			diff = self.get_diff(
+				commit=commits[0]["commit"],
+				previous_commit=previous_commit,
+				names=names,
+				edges=edges,
+				previous_names=previous_names,
+				previous_edges=previous_edges)
+			## only commits that change the graph get a diff
+			if any(len(diff[key]) > 0 for key in ("added_nodes", "removed_nodes", "added_edges", "removed_edges")):
+				diffs.append(
+					diff)
+			previous_commit, previous_names, previous_edges = commits[-1]["commit"], names, edges
+		self._history = history
+		self._diffs = diffs
+
+	@staticmethod
+	def get_executor(scan_mode, number_workers=None):
+		## None ==> serial
+		executor_mapping = {
+			"process" : ProcessPoolExecutor,
+			"thread" : ThreadPoolExecutor}
+		if scan_mode == "serial":
+			return None
+		if scan_mode not in executor_mapping.keys():
+			raise ValueError("invalid scan_mode: {}".format(scan_mode))
+		if number_workers is not None:
+			if not isinstance(number_workers, int):
+				raise ValueError("invalid type(number_workers): {}".format(type(number_workers)))
+			if number_workers <= 0:
+				raise ValueError("invalid number_workers: {}".format(number_workers))
+		executor = executor_mapping[scan_mode](
+			max_workers=number_workers)
+		return executor
+
+	def write_history_to_file(self, path_to_file):
+		data = {
+			"path_to_repository" : self.path_to_repository,
+			"subdirectory" : self.subdirectory,
+			"extractor" : self.extractor,
+			"reader_settings" : self.reader_settings,
+			"network_settings" : self.network_settings,
+			"history" : self.history,
+			"diffs" : self.diffs}
+		with open(path_to_file, "w") as data_file:
+			json.dump(
+				data,
+				data_file)
+
+class HistoryConfiguration(BaseHistoryConfiguration):
+
+	def __init__(self, path_to_repository, subdirectory=None, extractor="ast", is_header_only=False, maximum_file_size=None, maximum_parse_time=None, is_qualified=False, is_include_common=True, is_include_uncommon=True, is_include_custom=True):
+		super().__init__()
+		self.initialize_repository(
+			path_to_repository=path_to_repository,
+			subdirectory=subdirectory)
+		self.initialize_settings(
+			extractor=extractor,
+			is_header_only=is_header_only,
+			maximum_file_size=maximum_file_size,
+			maximum_parse_time=maximum_parse_time,
+			is_qualified=is_qualified,
+			is_include_common=is_include_common,
+			is_include_uncommon=is_include_uncommon,
+			is_include_custom=is_include_custom)
+		self._module_names_at_blobs = dict()
+		self._skipped_blobs = dict()
+		self._number_parsed_blobs = 0
+		self._number_reused_blobs = 0
+
+	def __repr__(self):
+		history = f"HistoryConfiguration({self.path_to_repository!r}, subdirectory={self.subdirectory!r})"
+		return history
+
+	def __str__(self):
+		s = "history: {} commits, {} graph changes, {} blobs parsed, {} reused".format(
+			len(self.history or ()),
+			len(self.diffs or ()),
+			self.number_parsed_blobs,
+			self.number_reused_blobs)
+		return s
+
+	def initialize(self, revision_range="HEAD", maximum_number_commits=None, is_first_parent=True, scan_mode="process", number_workers=None):
+		## blobs parsed by an earlier call are kept ==> a longer range only parses the new blobs
+		self.initialize_commits(
+			revision_range=revision_range,
+			maximum_number_commits=maximum_number_commits,
+			is_first_parent=is_first_parent)
+		self.initialize_entries_per_commit(
+			number_workers=number_workers)
+		executor = self.get_executor(
+			scan_mode=scan_mode,
+			number_workers=number_workers)
+		try:
+			self.update_module_names_at_blobs(
+				executor=executor)
+			self.initialize_history(
+				executor=executor)
+		finally:
+			if executor is not None:
+				executor.shutdown()
+
+##
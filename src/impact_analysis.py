@@ -0,0 +1,66 @@
+import os
+import sys
+import json
+import argparse
+from tree_configuration import ModuleTreeConfiguration
+from impact_configuration import ImpactConfiguration
+
+
+## e.g. git diff --name-only origin/main | python src/impact_analysis.py src/ --snapshot .module_tree.snapshot --tests
+## --snapshot: no scan while every file keeps the mtime and size it had when the snapshot was written;
+## --source-roots: the sys.path directories of the code, e.g. "--source-roots src tests" for a src layout;
+## a changed file that was deleted still selects the files that imported it
+if __name__ == "__main__":
+
+	parser = argparse.ArgumentParser(
+		description="print the files that transitively import any changed file read from stdin (one path per line)")
+	parser.add_argument("path_to_directory")
+	parser.add_argument("--cache", default=None, help="parse cache; repeated runs only re-parse changed files")
+	parser.add_argument("--snapshot", default=None, help="tree snapshot; loaded instead of scanning while no file changed, rewritten after a scan")
+	parser.add_argument("--extractor", default="ast", choices=("ast", "tokenize", "mmap"))
+	parser.add_argument("--header-only", action="store_true", help="stop at the first top-level def or class (tokenize and mmap only)")
+	parser.add_argument("--maximum-file-size", type=int, default=None, help="larger files are skipped (bytes)")
+	parser.add_argument("--source-roots", nargs="+", default=None, help="directories on sys.path, e.g. src tests (default: inferred per file)")
+	parser.add_argument("--tests", action="store_true", help="print only test files")
+	parser.add_argument("--json", action="store_true", help="print modules, paths, test paths and ignored paths as json")
+	arguments = parser.parse_args()
+	paths_to_changed_files = [
+		line.strip()
+			for line in sys.stdin
+				if len(line.strip()) > 0]
+	reader_settings = {
+		"extractor" : arguments.extractor,
+		"is_header_only" : arguments.header_only,
+		"maximum_file_size" : arguments.maximum_file_size,
+		## qualified names ==> relative imports and files that share a name are resolved per path
+		"is_qualified" : True}
+	module_tree = None
+	if (arguments.snapshot is not None) and os.path.isfile(arguments.snapshot):
+		module_tree = ModuleTreeConfiguration()
+		module_tree.initialize_from_snapshot(
+			path_to_snapshot=arguments.snapshot)
+		if not module_tree.is_snapshot_current(path_to_directory=arguments.path_to_directory, **reader_settings):
+			module_tree = None
+	if module_tree is None:
+		module_tree = ModuleTreeConfiguration()
+		module_tree.initialize(
+			path_to_directory=arguments.path_to_directory,
+			path_to_cache=arguments.cache,
+			**reader_settings)
+		if arguments.snapshot is not None:
+			module_tree.write_snapshot_to_file(
+				path_to_snapshot=arguments.snapshot)
+	impact = ImpactConfiguration(
+		tree=module_tree,
+		source_roots=arguments.source_roots).get_impact(
+			paths_to_changed_files=paths_to_changed_files)
+	if arguments.json:
+		print(json.dumps(
+			impact,
+			indent=1))
+	else:
+		selected_paths = impact["test_paths"] if arguments.tests else impact["paths"]
+		for path_to_file in selected_paths:
+			print(path_to_file)
+
+##
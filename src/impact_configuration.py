@@ -0,0 +1,208 @@
+import os
+import fnmatch
+
+
+class BaseImpactConfiguration():
+
+	def __init__(self):
+		super().__init__()
+		self._tree = None
+		self._path_to_directory = None
+		self._test_patterns = None
+		self._test_directory_names = None
+		self._resolution = None
+		self._paths_at_absolute_paths = None
+		self._importers_at_module_names = None
+		self._test_paths = None
+
+	@property
+	def tree(self):
+		return self._tree
+
+	@property
+	def path_to_directory(self):
+		return self._path_to_directory
+
+	@property
+	def test_patterns(self):
+		return self._test_patterns
+
+	@property
+	def test_directory_names(self):
+		return self._test_directory_names
+
+	@property
+	def resolution(self):
+		return self._resolution
+
+	@property
+	def importers_at_module_names(self):
+		## module name ==> paths of the files that import it (or a module inside it)
+		return self._importers_at_module_names
+
+	@property
+	def test_paths(self):
+		return self._test_paths
+
+	def initialize_tree(self, tree):
+		if tree.canopy is None:
+			raise ValueError("tree.canopy is not initialized")
+		self._tree = tree
+		self._path_to_directory = os.path.abspath(
+			tree.path_to_directory)
+
+	def initialize_test_patterns(self, test_patterns, test_directory_names):
+		if isinstance(test_patterns, str):
+			test_patterns = (test_patterns,)
+		if isinstance(test_directory_names, str):
+			test_directory_names = (test_directory_names,)
+		self._test_patterns = tuple(
+			test_patterns)
+		self._test_directory_names = set(
+			test_directory_names)
+
+	def initialize_resolution(self, source_roots=None):
+		## qualified names ==> relative imports resolve against the importer's package
+		from resolution_configuration import ResolutionConfiguration
+		self._resolution = ResolutionConfiguration(
+			tree=self.tree,
+			source_roots=source_roots)
+
+	def initialize_importers(self):
+		## built once per tree and keyed by path ==> files that share a name are all kept, and a query
+		## only walks the importers. Importing a.b.c runs a/__init__.py and a/b/__init__.py too, so every
+		## enclosing package counts as imported
+		paths_at_absolute_paths = dict()
+		importers_at_module_names = dict()
+		test_paths = set()
+		for path_to_file in self.resolution.module_names_at_paths.keys():
+			paths_at_absolute_paths[os.path.abspath(path_to_file)] = path_to_file
+			if self.is_test_file(path_to_file=path_to_file):
+				test_paths.add(
+					path_to_file)
+		for path_to_file, imported_names in self.resolution.imported_names_at_paths.items():
+			for imported_name in imported_names:
+				parts = imported_name.split(
+					".")
+				for index in range(1, len(parts) + 1):
+					importers_at_module_names.setdefault(
+						".".join(parts[:index]),
+						set()).add(
+							path_to_file)
+		self._paths_at_absolute_paths = paths_at_absolute_paths
+		self._importers_at_module_names = importers_at_module_names
+		self._test_paths = test_paths
+
+	def get_relative_path(self, path_to_file):
+		## None ==> not a python file below the scanned directory
+		if not path_to_file.endswith(".py"):
+			return None
+		relative_path = os.path.relpath(
+			os.path.abspath(
+				path_to_file),
+			self.path_to_directory)
+		if relative_path.startswith(os.pardir):
+			return None
+		return relative_path
+
+	def is_test_file(self, path_to_file):
+		relative_path = self.get_relative_path(
+			path_to_file=path_to_file)
+		if relative_path is None:
+			return False
+		parts = relative_path.split(
+			os.sep)
+		if any(part in self.test_directory_names for part in parts[:-1]):
+			return True
+		is_test = any(
+			fnmatch.fnmatch(parts[-1], test_pattern)
+				for test_pattern in self.test_patterns)
+		return is_test
+
+	def get_module_name(self, path_to_file):
+		## a file deleted in the diff is not in the index ==> its name follows from its path
+		path_to_file = self._paths_at_absolute_paths.get(
+			os.path.abspath(path_to_file),
+			path_to_file)
+		if path_to_file in self.resolution.module_names_at_paths:
+			return self.resolution.module_names_at_paths[path_to_file]
+		module_name = ".".join(
+			self.resolution.get_module_parts(
+				path_to_file=path_to_file))
+		return module_name
+
+	def get_impacted_paths(self, paths_to_changed_files):
+		## breadth-first walk over the reverse edges of the path-level import graph; files that share a
+		## module name (e.g. tests/a/test_models.py and tests/b/test_models.py) are walked together, which
+		## may select more files but never fewer
+		impacted_paths = set()
+		queue = list()
+		for path_to_file in paths_to_changed_files:
+			if self.get_relative_path(path_to_file=path_to_file) is not None:
+				if os.path.abspath(path_to_file) in self._paths_at_absolute_paths:
+					impacted_paths.add(
+						self._paths_at_absolute_paths[os.path.abspath(path_to_file)])
+				queue.append(
+					self.get_module_name(
+						path_to_file=path_to_file))
+		is_visited = set(
+			queue)
+		index_at_queue = 0
+		while index_at_queue < len(queue):
+			module_name = queue[index_at_queue]
+			index_at_queue += 1
+			for importer in self.importers_at_module_names.get(module_name, ()):
+				if importer not in impacted_paths:
+					impacted_paths.add(
+						importer)
+					importer_name = self.resolution.module_names_at_paths[importer]
+					if importer_name not in is_visited:
+						is_visited.add(
+							importer_name)
+						queue.append(
+							importer_name)
+		return impacted_paths
+
+	def get_impact(self, paths_to_changed_files):
+		paths_to_changed_files = list(
+			paths_to_changed_files)
+		impacted_paths = self.get_impacted_paths(
+			paths_to_changed_files=paths_to_changed_files)
+		## modules that are no longer on disk (e.g. deleted in the diff) have no path
+		impacted_modules = {
+			self.get_module_name(path_to_file=path_to_file)
+				for path_to_file in list(impacted_paths) + paths_to_changed_files
+					if self.get_relative_path(path_to_file=path_to_file) is not None}
+		paths_to_ignored_files = sorted(
+			path_to_file
+				for path_to_file in paths_to_changed_files
+					if self.get_relative_path(path_to_file) is None)
+		impact = {
+			"modules" : sorted(
+				impacted_modules),
+			"paths" : sorted(
+				impacted_paths),
+			"test_paths" : sorted(
+				impacted_paths & self.test_paths),
+			"ignored_paths" : paths_to_ignored_files}
+		return impact
+
+class ImpactConfiguration(BaseImpactConfiguration):
+
+	def __init__(self, tree, test_patterns=("test_*.py", "*_test.py"), test_directory_names=("test", "tests"), source_roots=None):
+		## tree: scanned with is_qualified=True; source_roots: see ResolutionConfiguration
+		super().__init__()
+		self.initialize_tree(
+			tree=tree)
+		self.initialize_test_patterns(
+			test_patterns=test_patterns,
+			test_directory_names=test_directory_names)
+		self.initialize_resolution(
+			source_roots=source_roots)
+		self.initialize_importers()
+
+	def __repr__(self):
+		impact = f"ImpactConfiguration({self.path_to_directory!r})"
+		return impact
+
+##
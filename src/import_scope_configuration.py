@@ -0,0 +1,260 @@
+from node_visitor_configuration import NodeVisitorConfiguration
+
+
+class BaseImportScopeConfiguration():
+
+	def __init__(self):
+		super().__init__()
+		self._network = None
+		self._scoped_imports_at_nodes = None
+		self._skipped_files = None
+		self._scopes_at_edges = None
+		self._deferral_candidates = None
+
+	@property
+	def network(self):
+		return self._network
+
+	@property
+	def scoped_imports_at_nodes(self):
+		return self._scoped_imports_at_nodes
+
+	@property
+	def skipped_files(self):
+		return self._skipped_files
+
+	@property
+	def scopes_at_edges(self):
+		## (importer, imported) ==> sorted scopes of every import statement behind the edge
+		return self._scopes_at_edges
+
+	@property
+	def deferral_candidates(self):
+		return self._deferral_candidates
+
+	@staticmethod
+	def get_scopes_at_view(view):
+		## startup ==> executed while the importer is imported; runtime ==> at some point when the
+		## program runs; static_only ==> only type checkers follow the edge; all ==> network.graph
+		scopes_at_views = {
+			"startup" : ("module", "conditional"),
+			"runtime" : ("module", "conditional", "function"),
+			"static_only" : ("type_checking",),
+			"all" : NodeVisitorConfiguration.get_import_scopes()}
+		if view not in scopes_at_views.keys():
+			raise ValueError("invalid view: {}".format(view))
+		return scopes_at_views[view]
+
+	def initialize_network(self, network):
+		if network.tree.canopy is None:
+			raise ValueError("network.tree.canopy is not initialized")
+		self._network = network
+
+	def initialize_scoped_imports(self):
+		## one more ast pass over the files that are nodes; the tree itself stores no scopes
+		node_visitor = NodeVisitorConfiguration(
+			extractor="ast",
+			maximum_file_size=self.network.tree.reader_settings["maximum_file_size"])
+		scoped_imports_at_nodes = dict()
+		for file_name, path_to_file in self.network.tree.paths_at_file_names.items():
+			canopy_key = self.network.tree.get_canopy_key(
+				file_name=file_name)
+			if self.network.graph.has_node(canopy_key):
+				scoped_imports = node_visitor.get_scoped_imports(
+					path_to_file=path_to_file)
+				if scoped_imports is not None:
+					scoped_imports_at_nodes[canopy_key] = scoped_imports
+		self._scoped_imports_at_nodes = scoped_imports_at_nodes
+		self._skipped_files = dict(
+			node_visitor.skipped_files)
+
+	def initialize_scopes_at_edges(self):
+		## an edge that cannot be matched to a statement (e.g. the file changed since the scan) is
+		## assumed to be module-level, the conservative choice for startup
+		scopes_at_edges = dict()
+		for importer, imported in self.network.graph.edges():
+			scopes = {
+				record["scope"]
+					for record in self.scoped_imports_at_nodes.get(importer, ())
+						if record["module"] == imported}
+			scopes_at_edges[(importer, imported)] = sorted(
+				scopes or {"module"},
+				key=NodeVisitorConfiguration.get_import_scopes().index)
+		self._scopes_at_edges = scopes_at_edges
+
+	def get_edges(self, view="runtime"):
+		scopes_at_view = set(
+			self.get_scopes_at_view(
+				view=view))
+		if view == "static_only":
+			edges = [
+				edge
+					for edge, scopes in self.scopes_at_edges.items()
+						if set(scopes) <= scopes_at_view]
+		else:
+			edges = [
+				edge
+					for edge, scopes in self.scopes_at_edges.items()
+						if len(scopes_at_view.intersection(scopes)) > 0]
+		return edges
+
+	def get_graph(self, view="runtime"):
+		## a view of network.graph; every edge keeps its scopes as an attribute
+		import networkx as nx
+		graph = nx.DiGraph()
+		graph.add_nodes_from(
+			self.network.graph.nodes())
+		for importer, imported in self.get_edges(view=view):
+			graph.add_edge(
+				importer,
+				imported,
+				scopes=self.scopes_at_edges[(importer, imported)])
+		return graph
+
+	@staticmethod
+	def get_reachable_nodes(successors_at_nodes, source, skipped_edge=None):
+		reachable_nodes = {source}
+		queue = [source]
+		index_at_queue = 0
+		while index_at_queue < len(queue):
+			node = queue[index_at_queue]
+			index_at_queue += 1
+			for successor in successors_at_nodes.get(node, ()):
+				if ((node, successor) != skipped_edge) and (successor not in reachable_nodes):
+					reachable_nodes.add(
+						successor)
+					queue.append(
+						successor)
+		return reachable_nodes
+
+	def initialize_deferral_candidates(self):
+		## a module-level import whose names are only used inside functions can move into them; the
+		## modules kept off the startup path are those the importer reaches at startup only through it.
+		## Other importers may still load them ==> an estimate per file, not for the whole program
+		successors_at_nodes = dict()
+		for importer, imported in self.get_edges(view="startup"):
+			successors_at_nodes.setdefault(
+				importer,
+				list()).append(
+					imported)
+		deferral_candidates = list()
+		for importer, scoped_imports in self.scoped_imports_at_nodes.items():
+			records_at_modules = dict()
+			for record in scoped_imports:
+				if record["scope"] in ("module", "conditional"):
+					records_at_modules.setdefault(
+						record["module"],
+						list()).append(
+							record)
+			for module_name, records in records_at_modules.items():
+				is_deferrable = all(
+					(record["scope"] == "module") and (record["name"] is not None) and record["is_used_in_functions"] and (not record["is_used_at_startup"]) and (not record["is_exported"])
+						for record in records)
+				## an import that is not a node (e.g. an excluded category) has no edge to remove
+				if is_deferrable and ((importer, module_name) in self.scopes_at_edges):
+					reachable_nodes = self.get_reachable_nodes(
+						successors_at_nodes=successors_at_nodes,
+						source=importer)
+					remaining_nodes = self.get_reachable_nodes(
+						successors_at_nodes=successors_at_nodes,
+						source=importer,
+						skipped_edge=(importer, module_name))
+					deferred_nodes = sorted(
+						reachable_nodes - remaining_nodes)
+					if self.network.import_costs is None:
+						deferred_time = None
+					else:
+						deferred_time = sum(
+							self.network.import_costs.get(node, {"self" : 0})["self"]
+								for node in deferred_nodes)
+					deferral_candidates.append({
+						"importer" : importer,
+						"module" : module_name,
+						"lines" : [record["line"] for record in records],
+						"names" : sorted({record["name"] for record in records}),
+						"deferred_nodes" : deferred_nodes,
+						"deferred_time" : deferred_time})
+		## largest savings first: measured time if there is a trace, else the number of modules
+		deferral_candidates.sort(
+			key=lambda candidate : (-(candidate["deferred_time"] or 0), -len(candidate["deferred_nodes"]), candidate["importer"], candidate["module"]))
+		self._deferral_candidates = deferral_candidates
+
+	def get_labels(self):
+
+		def get_title_with_under_line(title, symbol):
+			under_line = symbol * (len(title) + 2)
+			label = "\n{}\n{}\n".format(
+				title,
+				under_line)
+			return label
+
+		yield get_title_with_under_line(
+			title=" ** IMPORT SCOPE INFORMATION **",
+			symbol="=")
+		yield get_title_with_under_line(
+			title=" ** Number of Edges per Import Scope **",
+			symbol="-")
+		for scope in NodeVisitorConfiguration.get_import_scopes():
+			number_edges = sum(
+				scope in scopes
+					for scopes in self.scopes_at_edges.values())
+			yield " .. {}: {}\n".format(
+				scope,
+				number_edges)
+		yield get_title_with_under_line(
+			title=" ** Deferral Candidates (Module-Level Imports Only Used Inside Functions) **",
+			symbol="-")
+		for candidate in self.deferral_candidates:
+			label = "\n {} imports {} (line {}; {}):\n".format(
+				candidate["importer"],
+				candidate["module"],
+				", ".join(str(line) for line in candidate["lines"]),
+				", ".join(candidate["names"]))
+			if candidate["deferred_time"] is None:
+				label += " .. keeps {} modules off the startup path\n".format(
+					len(candidate["deferred_nodes"]))
+			else:
+				label += " .. keeps {} modules ({:.1f} ms self import time) off the startup path\n".format(
+					len(candidate["deferred_nodes"]),
+					candidate["deferred_time"] / 1000)
+			for node in candidate["deferred_nodes"]:
+				label += " .... {}\n".format(
+					node)
+			yield label
+
+	def get_string(self):
+		s = "\n".join(
+			self.get_labels())
+		return s
+
+class ImportScopeConfiguration(BaseImportScopeConfiguration):
+
+	def __init__(self, network):
+		## e.g. ImportScopeConfiguration(network=network).write_to_file(), or get_graph(view="startup") for the
+		## module-level and conditional edges only
+		super().__init__()
+		self.initialize_network(
+			network=network)
+		self.initialize_scoped_imports()
+		self.initialize_scopes_at_edges()
+		self.initialize_deferral_candidates()
+
+	def __repr__(self):
+		import_scope = f"ImportScopeConfiguration(number_edges={len(self.scopes_at_edges)})"
+		return import_scope
+
+	def __str__(self):
+		s = self.get_string()
+		return s
+
+	def write_to_file(self, path_to_file=None):
+		## default ==> next to module_hierarchy.txt
+		if path_to_file is None:
+			path_to_file = self.network.get_output_path(
+				file_name="import_scopes",
+				extension=".txt")
+		with open(path_to_file, "w") as data_file:
+			data_file.write(
+				self.get_string())
+
+##
@@ -0,0 +1,191 @@
+import os
+import re
+import sys
+import subprocess
+
+
+class BaseImportTimeConfiguration():
+
+	def __init__(self):
+		super().__init__()
+		self._entry_module = None
+		self._entries = None
+		self._costs_at_top_level_names = None
+		self._costs_at_last_names = None
+
+	@property
+	def entry_module(self):
+		return self._entry_module
+
+	@property
+	def entries(self):
+		## one per imported module, in trace order: {"module", "self", "cumulative", "depth"}; times in microseconds
+		return self._entries
+
+	@property
+	def costs_at_top_level_names(self):
+		return self._costs_at_top_level_names
+
+	@property
+	def costs_at_last_names(self):
+		return self._costs_at_last_names
+
+	@staticmethod
+	def get_line_pattern():
+		## "import time:       412 |       1203 |     encodings.aliases"; the header line has no numbers
+		line_pattern = re.compile(
+			r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( +)(\S+)\s*$")
+		return line_pattern
+
+	@staticmethod
+	def get_trace_from_module(entry_module, path_to_directory=None):
+		## a fresh interpreter ==> nothing is imported yet, so every import of entry_module is measured
+		if not isinstance(entry_module, str):
+			raise ValueError("invalid type(entry_module): {}".format(type(entry_module)))
+		environment = dict(
+			os.environ)
+		if path_to_directory is not None:
+			environment["PYTHONPATH"] = os.pathsep.join(
+				path for path in (path_to_directory, environment.get("PYTHONPATH")) if path)
+		process = subprocess.run(
+			[sys.executable, "-X", "importtime", "-c", "import {}".format(entry_module)],
+			cwd=path_to_directory,
+			env=environment,
+			stdout=subprocess.DEVNULL,
+			stderr=subprocess.PIPE)
+		trace = process.stderr.decode(
+			"utf-8",
+			"replace")
+		if process.returncode != 0:
+			error_lines = [
+				line
+					for line in trace.splitlines()
+						if not line.startswith("import time:")]
+			raise ValueError("import of {} failed: {}".format(
+				entry_module,
+				"\n".join(error_lines[-5:])))
+		return trace
+
+	def initialize_entries(self, trace):
+		line_pattern = self.get_line_pattern()
+		entries = list()
+		for line in trace.splitlines():
+			match = line_pattern.match(
+				line)
+			if match is not None:
+				self_time, cumulative_time, indent, module_name = match.groups()
+				entries.append({
+					"module" : module_name,
+					"self" : int(self_time),
+					"cumulative" : int(cumulative_time),
+					## two spaces per nesting level
+					"depth" : (len(indent) - 1) // 2})
+		if len(entries) == 0:
+			raise ValueError("invalid trace: no 'import time:' lines (was python run with -X importtime?)")
+		self._entries = entries
+
+	def get_parents(self):
+		## a module is printed after everything it imports ==> its parent is the next line with a smaller depth
+		parents = [None] * len(self.entries)
+		stack = list()
+		for index in range(len(self.entries) - 1, -1, -1):
+			depth = self.entries[index]["depth"]
+			while (len(stack) > 0) and (self.entries[stack[-1]]["depth"] >= depth):
+				stack.pop()
+			if len(stack) > 0:
+				parents[index] = stack[-1]
+			stack.append(
+				index)
+		return parents
+
+	def initialize_costs(self):
+		## graph nodes are top-level import names (and file names for custom modules):
+		## self adds up over every module of the name; cumulative adds up only where the trace
+		## enters the name from outside, so that time nested inside the same name is not counted twice
+		parents = self.get_parents()
+		costs_at_top_level_names = dict()
+		costs_at_last_names = dict()
+		for entry, parent in zip(self.entries, parents):
+			parent_module = None if parent is None else self.entries[parent]["module"]
+			name = entry["module"].split(".")[0]
+			costs = costs_at_top_level_names.setdefault(
+				name,
+				{"self" : 0, "cumulative" : 0})
+			costs["self"] += entry["self"]
+			if (parent_module is None) or (parent_module.split(".")[0] != name):
+				costs["cumulative"] += entry["cumulative"]
+			if "." in entry["module"]:
+				## last name ==> {module name : costs}; kept apart per module so that a match can be checked for ambiguity
+				costs = costs_at_last_names.setdefault(
+					entry["module"].split(".")[-1],
+					dict()).setdefault(
+						entry["module"],
+						{"self" : 0, "cumulative" : 0})
+				costs["self"] += entry["self"]
+				costs["cumulative"] += entry["cumulative"]
+		self._costs_at_top_level_names = costs_at_top_level_names
+		self._costs_at_last_names = costs_at_last_names
+
+	def get_costs_at_names(self, names, local_names=()):
+		## a name is matched as a top-level import name first, then as the last part of a module
+		## name (e.g. the node "tree_configuration" of "package.tree_configuration"); the second match
+		## only counts for a module below a local package (local_names) and only if exactly one module
+		## matches, so that a custom file is not charged for e.g. json.decoder; unmatched ==> absent
+		local_names = set(
+			local_names)
+		costs_at_names = dict()
+		for name in names:
+			if name in self.costs_at_top_level_names:
+				costs_at_names[name] = dict(
+					self.costs_at_top_level_names[name])
+			elif name in self.costs_at_last_names:
+				module_names = [
+					module_name
+						for module_name in self.costs_at_last_names[name].keys()
+							if module_name.split(".")[0] in local_names]
+				if len(module_names) == 1:
+					costs_at_names[name] = dict(
+						self.costs_at_last_names[name][module_names[0]])
+		return costs_at_names
+
+class ImportTimeConfiguration(BaseImportTimeConfiguration):
+
+	def __init__(self, path_to_trace=None, trace=None, entry_module=None, path_to_directory=None):
+		## exactly one source: a saved trace (python -X importtime ... 2> trace.txt), its text, or a module to import now;
+		## e.g. network.initialize_import_times(import_times=ImportTimeConfiguration(entry_module="example", path_to_directory="src/")),
+		## then network.view_graph(cost_mode="size", ...) or cost_mode="color"
+		super().__init__()
+		number_sources = sum(
+			source is not None
+				for source in (path_to_trace, trace, entry_module))
+		if number_sources != 1:
+			raise ValueError("invalid sources: give exactly one of path_to_trace, trace, entry_module")
+		if path_to_trace is not None:
+			with open(path_to_trace, "r", errors="replace") as data_file:
+				trace = data_file.read()
+		elif entry_module is not None:
+			trace = self.get_trace_from_module(
+				entry_module=entry_module,
+				path_to_directory=path_to_directory)
+		elif not isinstance(trace, str):
+			raise ValueError("invalid type(trace): {}".format(type(trace)))
+		self._entry_module = entry_module
+		self.initialize_entries(
+			trace=trace)
+		self.initialize_costs()
+
+	def __repr__(self):
+		import_time = f"ImportTimeConfiguration(entry_module={self.entry_module!r})"
+		return import_time
+
+	def __str__(self):
+		total_time = sum(
+			entry["cumulative"]
+				for entry in self.entries
+					if entry["depth"] == 0)
+		s = "import time: {} modules, {:.1f} ms in total".format(
+			len(self.entries),
+			total_time / 1000)
+		return s
+
+##
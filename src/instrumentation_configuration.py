@@ -0,0 +1,173 @@
+import json
+import time
+import heapq
+import contextlib
+
+
+## shared by every disabled stage ==> no allocation and no timer calls when instrumentation is off
+null_stage = contextlib.nullcontext()
+
+
+def get_stage(instrumentation, stage):
+	if instrumentation is None:
+		return null_stage
+	return instrumentation.measure(
+		stage=stage)
+
+
+class BaseInstrumentationConfiguration():
+
+	def __init__(self):
+		super().__init__()
+		self._stages = None
+		self._counters = None
+		self._slowest_files = None
+		self._number_slowest_files = None
+		self._callback = None
+
+	@property
+	def stages(self):
+		return self._stages
+
+	@property
+	def counters(self):
+		return self._counters
+
+	@property
+	def slowest_files(self):
+		## slowest first
+		slowest_files = [
+			(path_to_file, elapsed_time)
+				for elapsed_time, path_to_file in sorted(self._slowest_files, reverse=True)]
+		return slowest_files
+
+	@property
+	def number_slowest_files(self):
+		return self._number_slowest_files
+
+	@property
+	def callback(self):
+		return self._callback
+
+	def pre_initialize(self, number_slowest_files, callback):
+		if not isinstance(number_slowest_files, int):
+			raise ValueError("invalid type(number_slowest_files): {}".format(type(number_slowest_files)))
+		if number_slowest_files < 0:
+			raise ValueError("invalid number_slowest_files: {}".format(number_slowest_files))
+		if (callback is not None) and (not callable(callback)):
+			raise ValueError("invalid callback: {}".format(callback))
+		self._stages = dict()
+		self._counters = dict()
+		self._slowest_files = list()
+		self._number_slowest_files = number_slowest_files
+		self._callback = callback
+
+	@contextlib.contextmanager
+	def measure(self, stage):
+		start_wall_time = time.perf_counter()
+		start_cpu_time = time.process_time()
+		try:
+			yield self
+		finally:
+			wall_time = time.perf_counter() - start_wall_time
+			cpu_time = time.process_time() - start_cpu_time
+			self.update_stage(
+				stage=stage,
+				wall_time=wall_time,
+				cpu_time=cpu_time)
+
+	def update_stage(self, stage, wall_time, cpu_time):
+		## repeated stages (e.g. one graph update per watch iteration) accumulate
+		if stage not in self._stages:
+			self._stages[stage] = {
+				"wall_time" : 0.0,
+				"cpu_time" : 0.0,
+				"number_calls" : 0}
+		self._stages[stage]["wall_time"] += wall_time
+		self._stages[stage]["cpu_time"] += cpu_time
+		self._stages[stage]["number_calls"] += 1
+		if self.callback is not None:
+			self.callback(
+				self,
+				stage,
+				wall_time,
+				cpu_time)
+
+	def update_counter(self, name, value=1):
+		if name in self._counters:
+			self._counters[name] += value
+		else:
+			self._counters[name] = value
+
+	def set_counter(self, name, value):
+		## for sizes (e.g. number of nodes) that replace rather than accumulate
+		self._counters[name] = value
+
+	def update_slowest_files(self, elapsed_times):
+		## bounded min-heap ==> the n slowest files without sorting every file
+		for path_to_file, elapsed_time in elapsed_times.items():
+			if len(self._slowest_files) < self.number_slowest_files:
+				heapq.heappush(
+					self._slowest_files,
+					(elapsed_time, path_to_file))
+			elif (self.number_slowest_files > 0) and (elapsed_time > self._slowest_files[0][0]):
+				heapq.heapreplace(
+					self._slowest_files,
+					(elapsed_time, path_to_file))
+
+	def get_summary(self):
+		summary = {
+			"stages" : {
+				stage : dict(measurement)
+					for stage, measurement in self.stages.items()},
+			"counters" : dict(
+				self.counters),
+			"slowest_files" : [
+				{"path" : path_to_file, "elapsed_time" : elapsed_time}
+					for path_to_file, elapsed_time in self.slowest_files]}
+		return summary
+
+	def write_to_file(self, path_to_file):
+		with open(path_to_file, "w") as data_file:
+			json.dump(
+				self.get_summary(),
+				data_file,
+				indent=1)
+
+class InstrumentationConfiguration(BaseInstrumentationConfiguration):
+
+	def __init__(self, number_slowest_files=10, callback=None):
+		super().__init__()
+		self.pre_initialize(
+			number_slowest_files=number_slowest_files,
+			callback=callback)
+
+	def __repr__(self):
+		instrumentation = f"InstrumentationConfiguration(number_slowest_files={self.number_slowest_files})"
+		return instrumentation
+
+	def __str__(self):
+		labels = [
+			"{:>12} {:>12} {:>12} {:>8}".format("stage", "wall [s]", "cpu [s]", "calls")]
+		for stage, measurement in self.stages.items():
+			labels.append(
+				"{:>12} {:>12.4f} {:>12.4f} {:>8}".format(
+					stage,
+					measurement["wall_time"],
+					measurement["cpu_time"],
+					measurement["number_calls"]))
+		for name, value in self.counters.items():
+			labels.append(
+				" .. {}: {}".format(
+					name,
+					value))
+		for path_to_file, elapsed_time in self.slowest_files:
+			labels.append(
+				" .. {:.4f} s: {}".format(
+					elapsed_time,
+					path_to_file))
+		s = "\n".join(
+			labels)
+		return s
+
+##
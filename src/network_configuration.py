@@ -1,7 +1,16 @@
+import os
+import itertools
+import collections
 import networkx as nx
 from tree_configuration import ModuleTreeConfiguration
-from plotter_network_configuration import NetworkViewer
 from plotter_base_configuration import BasePlotterConfiguration
+from instrumentation_configuration import InstrumentationConfiguration, get_stage
+## the compact core (numpy) and the viewer (matplotlib) are imported on first use
+
+class CycleError(ValueError):
+	## raised by cycle_mode="raise"; a ValueError ==> callers that caught ValueError still do
+	pass
+
 
 class BaseNetworkConfiguration(BasePlotterConfiguration):
 
@@ -9,11 +18,25 @@ class BaseNetworkConfiguration(BasePlotterConfiguration):
 		super().__init__()
 		self._tree = None
 		self._graph = None
+		self._graph_backend = None
+		self._core = None
 		self._hierarchy = None
 		self._top_level_nodes = None
 		self._is_include_common = None
 		self._is_include_uncommon = None
 		self._is_include_custom = None
+		self._is_acyclic = None
+		self._cycle_mode = None
+		self._maximum_number_cycles = None
+		self._cyclic_components = None
+		self._condensation = None
+		self._cycles = None
+		self._instrumentation = None
+		self._reachability = None
+		self._import_times = None
+		self._import_costs = None
+		self._maximum_number_chains = None
+		self._output_suffix = None
 
 	@property
 	def tree(self):
@@ -21,7 +44,48 @@ class BaseNetworkConfiguration(BasePlotterConfiguration):
 	
 	@property
 	def graph(self):
+		if (self._graph is None) and (self._core is not None):
+			## the compact backend exports an nx.DiGraph only when something asks for it
+			self._graph = self._core.to_networkx()
+			self.update_import_time_attributes()
 		return self._graph
+
+	@property
+	def graph_backend(self):
+		return self._graph_backend
+
+	@property
+	def instrumentation(self):
+		return self._instrumentation
+
+	@property
+	def reachability(self):
+		## built on first use, then kept up to date by update_graph
+		if self._reachability is None:
+			self.initialize_reachability()
+		return self._reachability
+
+	@property
+	def core(self):
+		return self._core
+
+	@property
+	def import_times(self):
+		return self._import_times
+
+	@property
+	def import_costs(self):
+		## {node : {"self" : us, "cumulative" : us}}; nodes missing from the trace are absent
+		return self._import_costs
+
+	@property
+	def maximum_number_chains(self):
+		return self._maximum_number_chains
+
+	@property
+	def output_suffix(self):
+		## appended to the names of saved files ==> a subnetwork does not overwrite the full report
+		return self._output_suffix or ""
 	
 	@property
 	def hierarchy(self):
@@ -43,20 +107,287 @@ class BaseNetworkConfiguration(BasePlotterConfiguration):
 	def is_include_custom(self):
 		return self._is_include_custom
 
+	@property
+	def is_acyclic(self):
+		return self._is_acyclic
+
+	@property
+	def cycle_mode(self):
+		return self._cycle_mode
+
+	@property
+	def maximum_number_cycles(self):
+		return self._maximum_number_cycles
+
+	@property
+	def cyclic_components(self):
+		return self._cyclic_components
+
+	@property
+	def condensation(self):
+		## built on first use; nothing in the report needs it
+		if (self._condensation is None) and (self.is_acyclic is False):
+			if self.graph_backend == "compact":
+				condensation, membership = self.core.get_condensation()
+			else:
+				condensation = nx.condensation(
+					self.graph)
+			self._condensation = condensation
+		return self._condensation
+
+	@property
+	def cycles(self):
+		return self._cycles
+
+	@staticmethod
+	def get_shortest_cycle(graph, nodes):
+		## breadth-first search from one member back to itself, restricted to its component
+		source = min(
+			nodes)
+		if graph.has_edge(source, source):
+			return [source]
+		parents = {
+			source : None}
+		queue = collections.deque([
+			source])
+		while len(queue) > 0:
+			node = queue.popleft()
+			for successor in graph.successors(node):
+				if successor == source:
+					cycle = list()
+					while node is not None:
+						cycle.append(
+							node)
+						node = parents[node]
+					cycle.reverse()
+					return cycle
+				if (successor in nodes) and (successor not in parents):
+					parents[successor] = node
+					queue.append(
+						successor)
+		raise ValueError("nodes do not form a cycle: {}".format(nodes))
+
+	def get_cyclic_components_at_core(self):
+		cyclic_components = list()
+		for component in self.core.get_strongly_connected_components():
+			is_cyclic = (
+				(len(component) > 1) or (component[0] in self.core.get_successor_indices(component[0])))
+			if is_cyclic:
+				cycle = self.core.get_shortest_cycle_indices(
+					indices=component)
+				cyclic_component = {
+					"nodes" : sorted(self.core.names[index] for index in component),
+					"cycle" : [self.core.names[index] for index in cycle]}
+				cyclic_components.append(
+					cyclic_component)
+		cyclic_components.sort(
+			key=lambda cyclic_component : cyclic_component["nodes"])
+		return cyclic_components
+
+	def get_cyclic_components(self):
+		## strongly-connected components are found in O(V + E), unlike enumerating every cycle
+		if self.graph_backend == "compact":
+			return self.get_cyclic_components_at_core()
+		cyclic_components = list()
+		for component in nx.strongly_connected_components(self.graph):
+			if len(component) > 1:
+				is_cyclic = True
+			else:
+				## a single module is cyclic only if it imports itself
+				node = next(
+					iter(
+						component))
+				is_cyclic = self.graph.has_edge(
+					node,
+					node)
+			if is_cyclic:
+				cycle = self.get_shortest_cycle(
+					graph=self.graph,
+					nodes=component)
+				cyclic_component = {
+					"nodes" : sorted(component),
+					"cycle" : cycle}
+				cyclic_components.append(
+					cyclic_component)
+		cyclic_components.sort(
+			key=lambda cyclic_component : cyclic_component["nodes"])
+		return cyclic_components
+
+	@staticmethod
+	def get_cycle_label(cycle):
+		label = " -> ".join(
+			cycle + cycle[:1])
+		return label
+
+	def get_cycle_error_message(self):
+		partial_labels = list()
+		for cyclic_component in self.cyclic_components:
+			partial_label = "{} modules (witness: {})".format(
+				len(cyclic_component["nodes"]),
+				self.get_cycle_label(
+					cycle=cyclic_component["cycle"]))
+			partial_labels.append(
+				partial_label)
+		message = "graph contains cycles in {} strongly-connected components: {}".format(
+			len(self.cyclic_components),
+			"; ".join(
+				partial_labels))
+		return message
+
+	def initialize_cycle_settings(self, cycle_mode, maximum_number_cycles):
+		cycle_modes = (
+			"raise",
+			"condense")
+		if cycle_mode not in cycle_modes:
+			raise ValueError("invalid cycle_mode: {}".format(cycle_mode))
+		if not isinstance(maximum_number_cycles, int):
+			raise ValueError("invalid type(maximum_number_cycles): {}".format(type(maximum_number_cycles)))
+		if maximum_number_cycles < 0:
+			raise ValueError("invalid maximum_number_cycles: {}".format(maximum_number_cycles))
+		self._cycle_mode = cycle_mode
+		self._maximum_number_cycles = maximum_number_cycles
+
+	def initialize_cycles(self, cyclic_components=None):
+		## cyclic_components ==> already known (e.g. saved in a snapshot), no search
+		if cyclic_components is None:
+			cyclic_components = self.get_cyclic_components()
+		if self.maximum_number_cycles > 0:
+			## full enumeration is exponential in the worst case, hence opt-in and capped
+			cycles = list(
+				itertools.islice(
+					nx.simple_cycles(
+						self.graph),
+					self.maximum_number_cycles))
+		else:
+			cycles = None
+		self._is_acyclic = (len(cyclic_components) == 0)
+		self._cyclic_components = cyclic_components
+		self._condensation = None
+		self._cycles = cycles
+		if (not self.is_acyclic) and (self.cycle_mode == "raise"):
+			raise CycleError(self.get_cycle_error_message())
+
 	def initialize_tree(self, tree):
 		if not isinstance(tree, ModuleTreeConfiguration):
 			raise ValueError("invalid type(tree): {}".format(type(tree)))
-		if tree.canopy is None:
+		## a tree loaded from a snapshot builds its canopy on first use
+		if (tree.snapshot is None) and (tree.canopy is None):
 			raise ValueError("tree.canopy is not initialized")
 		self._tree = tree
 
-	def initialize_graph(self, is_include_common, is_include_uncommon, is_include_custom):
-		
-		def get_import_state(module_name, key, is_include):
-			state = (
-				(module_name in self.tree.import_names[key]) and is_include)
-			return state
+	def initialize_instrumentation(self, instrumentation=None):
+		## shares the tree's instrumentation unless another one is given
+		if instrumentation is None:
+			instrumentation = self.tree.instrumentation
+		elif not isinstance(instrumentation, InstrumentationConfiguration):
+			raise ValueError("invalid type(instrumentation): {}".format(type(instrumentation)))
+		self._instrumentation = instrumentation
+
+	def initialize_reachability(self):
+		from reachability_configuration import ReachabilityConfiguration
+		with get_stage(self.instrumentation, "reachability"):
+			reachability = ReachabilityConfiguration(
+				network=self)
+		self._reachability = reachability
+
+	def update_reachability(self):
+		if self._reachability is not None:
+			with get_stage(self.instrumentation, "reachability"):
+				self._reachability.update(
+					network=self)
 
+	def update_graph_counters(self):
+		if self.instrumentation is not None:
+			if self.graph_backend == "compact":
+				number_nodes = self.core.number_nodes
+				number_edges = self.core.number_edges
+			else:
+				number_nodes = self.graph.number_of_nodes()
+				number_edges = self.graph.number_of_edges()
+			self._instrumentation.set_counter(
+				name="number_nodes",
+				value=number_nodes)
+			self._instrumentation.set_counter(
+				name="number_edges",
+				value=number_edges)
+
+	def get_import_state(self, module_name, is_include_common, is_include_uncommon, is_include_custom):
+		state = (
+			(is_include_common and (module_name in self.tree.import_names["common"])) or (is_include_uncommon and (module_name in self.tree.import_names["uncommon"])) or (is_include_custom and (module_name in self.tree.import_names["custom"])))
+		return state
+
+	def get_successors(self, module_name, is_include_common, is_include_uncommon, is_include_custom):
+		import_names = self.tree.canopy.get(
+			module_name)
+		successors = list()
+		if import_names is not None:
+			for import_name in import_names:
+				is_include = self.get_import_state(
+					module_name=import_name,
+					is_include_common=is_include_common,
+					is_include_uncommon=is_include_uncommon,
+					is_include_custom=is_include_custom)
+				if is_include:
+					successors.append(
+						import_name)
+		return successors
+
+	def get_nodes_and_edges(self, is_include_common, is_include_uncommon, is_include_custom):
+		nodes = list()
+		edges = list()
+		for module_name in self.tree.canopy.keys():
+			is_include_at_root = self.get_import_state(
+				module_name=module_name,
+				is_include_common=is_include_common,
+				is_include_uncommon=is_include_uncommon,
+				is_include_custom=is_include_custom)
+			if is_include_at_root:
+				nodes.append(
+					module_name)
+				successors = self.get_successors(
+					module_name=module_name,
+					is_include_common=is_include_common,
+					is_include_uncommon=is_include_uncommon,
+					is_include_custom=is_include_custom)
+				for successor in successors:
+					nodes.append(
+						successor)
+					edges.append(
+						(module_name, successor))
+		return nodes, edges
+
+	def get_nodes_and_edges_from_snapshot(self, is_include_common, is_include_uncommon, is_include_custom):
+		## a tree loaded from a snapshot carries the graph that was saved with it ==> no pass over
+		## the canopy; returns None if there is none or it was saved with other include flags
+		snapshot = self.tree.snapshot
+		if (snapshot is None) or ("network" not in snapshot.metadata):
+			return None
+		network_settings = snapshot.network_settings
+		is_match = (
+			(network_settings["is_include_common"] == is_include_common) and (network_settings["is_include_uncommon"] == is_include_uncommon) and (network_settings["is_include_custom"] == is_include_custom))
+		if not is_match:
+			return None
+		nodes = snapshot.get_names_at(
+			name="nodes")
+		## edge arrays index into nodes
+		sources = snapshot.get_array(
+			name="edge_sources")
+		targets = snapshot.get_array(
+			name="edge_targets")
+		cyclic_components = [
+			{"nodes" : nodes_at_component, "cycle" : cycle}
+				for nodes_at_component, cycle in zip(snapshot.get_lists_at(name="cyclic_nodes"), snapshot.get_lists_at(name="cyclic_cycle"))]
+		return nodes, sources, targets, cyclic_components
+
+	def initialize_graph_backend(self, graph_backend):
+		graph_backends = (
+			"networkx",
+			"compact")
+		if graph_backend not in graph_backends:
+			raise ValueError("invalid graph_backend: {}".format(graph_backend))
+		self._graph_backend = graph_backend
+
+	def initialize_graph(self, is_include_common, is_include_uncommon, is_include_custom):
 		if not isinstance(is_include_common, bool):
 			raise ValueError("invalid type(is_include_common): {}".format(type(is_include_common)))		
 		if not isinstance(is_include_uncommon, bool):
@@ -65,74 +396,458 @@ class BaseNetworkConfiguration(BasePlotterConfiguration):
 			raise ValueError("invalid type(is_include_custom): {}".format(type(is_include_custom)))
 		if not (is_include_common or is_include_uncommon or is_include_custom):
 			raise ValueError("invalid inputs: is_include_common=False, is_include_uncommon=False, is_include_custom=False")
-		graph = nx.DiGraph()
-		for module_name, import_names in self.tree.canopy.items():
-			common_state_at_root = get_import_state(
-				module_name=module_name,
-				key="common",
-				is_include=is_include_common)
-			uncommon_state_at_root = get_import_state(
-				module_name=module_name,
-				key="uncommon",
-				is_include=is_include_uncommon)
-			custom_state_at_root = get_import_state(
-				module_name=module_name,
-				key="custom",
-				is_include=is_include_custom)
-			if (common_state_at_root or uncommon_state_at_root or custom_state_at_root):
-				if not graph.has_node(module_name):
-					graph.add_node(
-						module_name)
-				if import_names is not None:
-					for import_name in import_names:
-						if not graph.has_edge(module_name, import_name):
-							common_state_at_successor = get_import_state(
-								module_name=import_name,
-								key="common",
-								is_include=is_include_common)
-							uncommon_state_at_successor = get_import_state(
-								module_name=import_name,
-								key="uncommon",
-								is_include=is_include_uncommon)
-							custom_state_at_successor = get_import_state(
-								module_name=import_name,
-								key="custom",
-								is_include=is_include_custom)
-							if (common_state_at_successor or uncommon_state_at_successor or custom_state_at_successor):
-								graph.add_edge(
-									module_name,
-									import_name)
-		cycles = list(
-			nx.simple_cycles(
-				graph))
-		number_cycles = len(
-			cycles)
-		if number_cycles != 0:
-			raise ValueError("graph contains cycles: {}".format(cycles))
+		with get_stage(self.instrumentation, "graph"):
+			snapshot_graph = self.get_nodes_and_edges_from_snapshot(
+				is_include_common=is_include_common,
+				is_include_uncommon=is_include_uncommon,
+				is_include_custom=is_include_custom)
+			if snapshot_graph is None:
+				nodes, edges = self.get_nodes_and_edges(
+					is_include_common=is_include_common,
+					is_include_uncommon=is_include_uncommon,
+					is_include_custom=is_include_custom)
+			else:
+				nodes, sources, targets, cyclic_components = snapshot_graph
+				if self.graph_backend != "compact":
+					edges = [
+						(nodes[source], nodes[target])
+							for source, target in zip(sources.tolist(), targets.tolist())]
+			if self.graph_backend == "compact":
+				from graph_core_configuration import CompactGraphConfiguration
+				if snapshot_graph is None:
+					core = CompactGraphConfiguration(
+						names=nodes,
+						edges=edges)
+				else:
+					## the saved edge arrays become the CSR arrays without a python-level pass
+					core = CompactGraphConfiguration()
+					core.initialize_names(
+						names=nodes)
+					core.initialize_edge_indices(
+						sources=sources,
+						targets=targets)
+				graph = None
+			else:
+				core = None
+				graph = nx.DiGraph()
+				graph.add_nodes_from(
+					nodes)
+				graph.add_edges_from(
+					edges)
 		self._graph = graph
+		self._core = core
 		self._is_include_common = is_include_common
 		self._is_include_uncommon = is_include_uncommon
 		self._is_include_custom = is_include_custom
+		self._reachability = None
+		self.update_graph_counters()
+		with get_stage(self.instrumentation, "cycles"):
+			self.initialize_cycles(
+				cyclic_components=None if snapshot_graph is None else cyclic_components)
+
+	def update_core(self, changed_import_names=()):
+		## CSR arrays are immutable; the compact backend rebuilds and compares instead
+		from graph_core_configuration import CompactGraphConfiguration
+		previous_core = self.core
+		nodes, edges = self.get_nodes_and_edges(
+			is_include_common=self.is_include_common,
+			is_include_uncommon=self.is_include_uncommon,
+			is_include_custom=self.is_include_custom)
+		core = CompactGraphConfiguration(
+			names=nodes,
+			edges=edges)
+		is_changed = (
+			(set(previous_core.names) != set(core.names)) or (previous_core.number_edges != core.number_edges))
+		if not is_changed:
+			previous_edges = {
+				(previous_core.names[source], previous_core.names[target])
+					for source, target in zip(*[indices.tolist() for indices in previous_core.get_edge_indices()])}
+			is_changed = (previous_edges != set(edges))
+		## a module that became (or stopped being) custom changes the hierarchy even without an edge delta
+		is_changed = is_changed or (len(changed_import_names) > 0)
+		self._core = core
+		self._graph = None
+		if is_changed:
+			self.initialize_hierarchy()
+			self.initialize_top_level_nodes()
+			self.update_reachability()
+			self.initialize_cycles()
+			self.update_import_costs()
+		return is_changed
+
+	def update_graph(self, canopy_keys, changed_import_names):
+		## applies the edge deltas implied by ModuleTreeConfiguration.update_branches;
+		## returns True if any node, edge or import name changed
+		if self.graph_backend == "compact":
+			return self.update_core(
+				changed_import_names=changed_import_names)
+		is_include = {
+			"is_include_common" : self.is_include_common,
+			"is_include_uncommon" : self.is_include_uncommon,
+			"is_include_custom" : self.is_include_custom}
+		module_names = set(canopy_keys) | set(changed_import_names)
+		added_edges = list()
+		removed_edges = list()
+		touched_nodes = set()
+		is_nodes_changed = False
+		for module_name in module_names:
+			## only files (canopy keys) that are themselves included contribute out-going edges
+			is_root = (
+				(module_name in self.tree.canopy) and self.get_import_state(module_name=module_name, **is_include))
+			if self.graph.has_node(module_name):
+				previous_successors = set(
+					self.graph.successors(
+						module_name))
+			else:
+				previous_successors = set()
+			if is_root:
+				if not self.graph.has_node(module_name):
+					self._graph.add_node(
+						module_name)
+					is_nodes_changed = True
+				successors = set(
+					self.get_successors(
+						module_name=module_name,
+						**is_include))
+			else:
+				successors = set()
+			for successor in previous_successors - successors:
+				self._graph.remove_edge(
+					module_name,
+					successor)
+				removed_edges.append(
+					(module_name, successor))
+				touched_nodes.add(
+					successor)
+			for successor in successors - previous_successors:
+				if not self.graph.has_node(successor):
+					is_nodes_changed = True
+				self._graph.add_edge(
+					module_name,
+					successor)
+				added_edges.append(
+					(module_name, successor))
+				touched_nodes.add(
+					successor)
+			touched_nodes.add(
+				module_name)
+		for node in touched_nodes:
+			## a node that is not an included file only exists while something imports it
+			if self.graph.has_node(node) and (not self.graph.in_degree(node)):
+				is_root = (
+					(node in self.tree.canopy) and self.get_import_state(module_name=node, **is_include))
+				if not is_root:
+					self._graph.remove_node(
+						node)
+					is_nodes_changed = True
+		is_changed = (
+			is_nodes_changed or (len(added_edges) > 0) or (len(removed_edges) > 0) or (len(changed_import_names) > 0))
+		if is_changed:
+			self.update_hierarchy(
+				module_names=module_names)
+			self.update_top_level_nodes(
+				module_names=touched_nodes)
+			self.update_reachability()
+			self.update_cycle_status(
+				added_edges=added_edges)
+			self.update_import_costs()
+		return is_changed
+
+	def update_cycle_status(self, added_edges):
+		if self.is_acyclic:
+			## removing edges cannot create a cycle; an added edge (u, v) closes one iff v reaches u
+			is_acyclic = True
+			for source, target in added_edges:
+				if nx.has_path(self.graph, target, source):
+					is_acyclic = False
+					break
+			if is_acyclic:
+				return
+		self.initialize_cycles()
+
+	def initialize_import_times(self, import_times, maximum_number_chains=10):
+		## import_times: an ImportTimeConfiguration, e.g. from python -X importtime
+		from import_time_configuration import ImportTimeConfiguration
+		if not isinstance(import_times, ImportTimeConfiguration):
+			raise ValueError("invalid type(import_times): {}".format(type(import_times)))
+		if not isinstance(maximum_number_chains, int):
+			raise ValueError("invalid type(maximum_number_chains): {}".format(type(maximum_number_chains)))
+		if maximum_number_chains < 0:
+			raise ValueError("invalid maximum_number_chains: {}".format(maximum_number_chains))
+		self._import_times = import_times
+		self._maximum_number_chains = maximum_number_chains
+		self.update_import_costs()
+
+	def update_import_costs(self):
+		if self.import_times is not None:
+			if self.graph_backend == "compact":
+				nodes = self.core.names
+			else:
+				nodes = self.graph.nodes()
+			self._import_costs = self.import_times.get_costs_at_names(
+				names=nodes,
+				local_names=self.get_local_names())
+			self.update_import_time_attributes()
+
+	def get_local_names(self):
+		## top-level names that can only be this repository: its files, the custom imports and the
+		## scanned directory itself (imported as a package from its parent)
+		local_names = set(
+			self.tree.import_names["custom"])
+		if self.tree.canopy is not None:
+			local_names.update(
+				self.tree.canopy.keys())
+		if self.tree.path_to_directory is not None:
+			local_names.add(
+				os.path.basename(
+					os.path.normpath(
+						self.tree.path_to_directory)))
+		return local_names
+
+	def update_import_time_attributes(self):
+		## node attributes of self.graph (in microseconds); the compact backend sets them when it exports
+		if (self.import_costs is not None) and (self._graph is not None):
+			for key in ("self", "cumulative"):
+				nx.set_node_attributes(
+					self._graph,
+					{node : costs[key] for node, costs in self.import_costs.items() if self._graph.has_node(node)},
+					name="{}_import_time".format(key))
+
+	def get_expensive_import_chains(self):
+		## heaviest path from each top-level module, weighted by self import time; the members of an
+		## import cycle are imported together ==> one step of the chain. Tarjan emits components
+		## sinks first ==> every successor has its heaviest chain before its predecessors need it
+		from graph_core_configuration import CompactGraphConfiguration
+		if self.graph_backend == "compact":
+			core = self.core
+		else:
+			core = CompactGraphConfiguration(
+				names=list(
+					self.graph.nodes()),
+				edges=list(
+					self.graph.edges()))
+		components = core.get_strongly_connected_components()
+		condensation, membership = core.get_condensation(
+			components=components)
+		out_index_pointers = condensation.out_index_pointers.tolist()
+		out_indices = condensation.out_indices.tolist()
+		in_degrees = condensation.get_in_degrees().tolist()
+		names = core.names
+		labels = list()
+		weights = list()
+		for component in components:
+			members = sorted(
+				names[index]
+					for index in component)
+			labels.append(
+				members[0] if len(members) == 1 else "{{{}}}".format(", ".join(members)))
+			weights.append(
+				sum(
+					self.import_costs.get(member, {"self" : 0})["self"]
+						for member in members))
+		costs = [0] * len(components)
+		next_components = [None] * len(components)
+		for index_at_component in range(len(components)):
+			for successor in out_indices[out_index_pointers[index_at_component] : out_index_pointers[index_at_component + 1]]:
+				if (next_components[index_at_component] is None) or (costs[successor] > costs[next_components[index_at_component]]):
+					next_components[index_at_component] = successor
+			costs[index_at_component] = weights[index_at_component] + (
+				0 if next_components[index_at_component] is None else costs[next_components[index_at_component]])
+		chains = list()
+		for index_at_component in range(len(components)):
+			if (in_degrees[index_at_component] == 0) and (costs[index_at_component] > 0):
+				chain = list()
+				index_at_step = index_at_component
+				while index_at_step is not None:
+					chain.append(
+						labels[index_at_step])
+					index_at_step = next_components[index_at_step]
+				chains.append(
+					(costs[index_at_component], chain))
+		chains.sort(
+			key=lambda cost_and_chain : (-cost_and_chain[0], cost_and_chain[1]))
+		return chains[:self.maximum_number_chains]
 
 	def initialize_hierarchy(self):
+		if self.graph_backend == "compact":
+			selected_graph = self.core
+			## one conversion of the CSR arrays instead of a numpy slice per node
+			out_index_pointers = self.core.out_index_pointers.tolist()
+			out_indices = self.core.out_indices.tolist()
+			names = self.core.names
+		else:
+			selected_graph = self.graph
 		hierarchy = dict()
 		for node in self.tree.import_names["custom"]:
 			if node not in hierarchy.keys():
 				hierarchy[node] = list()
-				for successor in self.graph.successors(node):
-					hierarchy[node].append(
-						successor)
+				## custom modules imported only by excluded files are not nodes
+				if selected_graph.has_node(node):
+					if self.graph_backend == "compact":
+						index = self.core.indices_at_names[node]
+						successors = [
+							names[successor]
+								for successor in out_indices[out_index_pointers[index] : out_index_pointers[index + 1]]]
+					else:
+						successors = self.graph.successors(
+							node)
+					for successor in successors:
+						hierarchy[node].append(
+							successor)
 		self._hierarchy = hierarchy
 
 	def initialize_top_level_nodes(self):
-		top_level_nodes = list()
-		for node in self.graph.nodes():
-			if not self.graph.in_degree(node):  # No incoming edges
-				top_level_nodes.append(
-					node)
+		if self.graph_backend == "compact":
+			top_level_nodes = self.core.get_top_level_names()
+		else:
+			top_level_nodes = list()
+			for node in self.graph.nodes():
+				if not self.graph.in_degree(node):  # No incoming edges
+					top_level_nodes.append(
+						node)
 		self._top_level_nodes = top_level_nodes
 
-	def get_string(self):
+	def update_hierarchy(self, module_names):
+		for module_name in module_names:
+			if module_name in self.tree.import_names["custom"]:
+				if self.graph.has_node(module_name):
+					successors = list(
+						self.graph.successors(
+							module_name))
+				else:
+					successors = list()
+				self._hierarchy[module_name] = successors
+			else:
+				self._hierarchy.pop(
+					module_name,
+					None)
+
+	def update_top_level_nodes(self, module_names):
+		top_level_nodes = set(
+			self.top_level_nodes)
+		for module_name in module_names:
+			if self.graph.has_node(module_name) and (not self.graph.in_degree(module_name)):
+				if module_name not in top_level_nodes:
+					self._top_level_nodes.append(
+						module_name)
+					top_level_nodes.add(
+						module_name)
+			elif module_name in top_level_nodes:
+				self._top_level_nodes.remove(
+					module_name)
+				top_level_nodes.discard(
+					module_name)
+
+	def get_reported_import_names(self, key):
+		return self.tree.import_names[key]
+
+	def has_node(self, node):
+		if self.graph_backend == "compact":
+			return self.core.has_node(node)
+		return self.graph.has_node(node)
+
+	def get_neighbor_names(self, node, direction):
+		## CSR rows (compact) or adjacency dictionaries (networkx) ==> O(degree), no pass over the graph
+		if direction not in ("imports", "importers"):
+			raise ValueError("invalid direction: {}".format(direction))
+		if self.graph_backend == "compact":
+			index = self.core.indices_at_names[node]
+			if direction == "imports":
+				indices = self.core.get_successor_indices(
+					index=index)
+			else:
+				indices = self.core.get_predecessor_indices(
+					index=index)
+			names = self.core.names
+			neighbor_names = [
+				names[neighbor]
+					for neighbor in indices.tolist()]
+		elif direction == "imports":
+			neighbor_names = list(
+				self.graph.successors(
+					node))
+		else:
+			neighbor_names = list(
+				self.graph.predecessors(
+					node))
+		return neighbor_names
+
+	def is_top_level_node(self, node):
+		## nothing imports it in this network
+		if self.graph_backend == "compact":
+			index = self.core.indices_at_names[node]
+			is_top_level = (self.core.in_index_pointers[index + 1] == self.core.in_index_pointers[index])
+		else:
+			is_top_level = (self.graph.in_degree(node) == 0)
+		return bool(is_top_level)
+
+	def get_ego_nodes(self, seeds, depth=1, direction="both"):
+		## breadth-first from the seeds, up to depth steps along imports, importers or each of both
+		## (not alternating, which would add siblings); work grows with the neighbourhood only
+		directions_at_modes = {
+			"imports" : ("imports",),
+			"importers" : ("importers",),
+			"both" : ("imports", "importers")}
+		if direction not in directions_at_modes.keys():
+			raise ValueError("invalid direction: {}".format(direction))
+		if depth is not None:
+			if not isinstance(depth, int):
+				raise ValueError("invalid type(depth): {}".format(type(depth)))
+			if depth < 0:
+				raise ValueError("invalid depth: {}".format(depth))
+		if isinstance(seeds, str):
+			seeds = [seeds]
+		seeds = list(
+			dict.fromkeys(
+				seeds))
+		if len(seeds) == 0:
+			raise ValueError("invalid seeds: {}".format(seeds))
+		for seed in seeds:
+			if not self.has_node(seed):
+				raise ValueError("invalid seed: {}".format(seed))
+		## dictionary ==> an ordered set; seeds first, then nodes by distance
+		ego_nodes = dict.fromkeys(
+			seeds)
+		for selected_direction in directions_at_modes[direction]:
+			frontier = list(
+				seeds)
+			is_visited = set(
+				seeds)
+			number_steps = 0
+			while (len(frontier) > 0) and ((depth is None) or (number_steps < depth)):
+				next_frontier = list()
+				for node in frontier:
+					for neighbor in self.get_neighbor_names(node=node, direction=selected_direction):
+						if neighbor not in is_visited:
+							is_visited.add(
+								neighbor)
+							next_frontier.append(
+								neighbor)
+				ego_nodes.update(
+					dict.fromkeys(
+						next_frontier))
+				frontier = next_frontier
+				number_steps += 1
+		return list(
+			ego_nodes)
+
+	def get_subnetwork(self, seeds, depth=1, direction="both"):
+		## a network around the seeds; it renders and reports like this one, see SubNetworkConfiguration
+		subnetwork = SubNetworkConfiguration(
+			network=self,
+			seeds=seeds,
+			depth=depth,
+			direction=direction)
+		return subnetwork
+
+	def get_labels(self, is_sorted=False):
+		## yields the report piece by piece ==> "".join(...) gives the same text as get_string, without holding it in memory
+
+		def get_ordered(values):
+			if is_sorted:
+				return sorted(
+					values)
+			return values
 
 		def get_title_with_under_line(title, symbol):
 			number_characters = len(
@@ -151,102 +866,143 @@ class BaseNetworkConfiguration(BasePlotterConfiguration):
 			return label
 
 		def get_labels_at_top_level_nodes():
-			labels = list()
-			for node in self.top_level_nodes:
+			title = " ** List of Modules at Top-Level **"
+			yield get_title_with_under_line(
+				title=title,
+				symbol="-")
+			for node in get_ordered(self.top_level_nodes):
 				partial_label = " .. {}\n".format(
 					node)
-				labels.append(
-					partial_label)
-			title = " ** List of Modules at Top-Level **"
-			title_with_under_line = get_title_with_under_line(
+				yield partial_label
+
+		def get_labels_at_imports(top_level_nodes):
+			title = " ** List of Imported Modules **"
+			yield get_title_with_under_line(
 				title=title,
 				symbol="-")
-			labels.insert(
-				0,
-				title_with_under_line)
-			return labels
-
-		def get_labels_at_imports():
-			module_names = list()
-			module_names.extend(
-				list(
-					self.tree.import_names["common"]))
-			module_names.extend(
-				list(
-					self.tree.import_names["uncommon"]))
-			module_names.extend(
-				list(
-					self.tree.import_names["custom"]))
-			labels = list()
-			for module_name in module_names:
-				if (module_name in self.tree.import_names["common"]) or (module_name in self.tree.import_names["uncommon"]):
+			for key in ("common", "uncommon"):
+				for module_name in get_ordered(self.get_reported_import_names(key=key)):
 					label = "\n .. {} (Standard Library or Third-Party Module/Package)".format(
 						module_name)
-				elif module_name in self.tree.import_names["custom"]:
-					label = "\n .. {} (Custom Module/Package)".format(
-						module_name)
-				else:
-					raise ValueError("invalid module_name: {}".format(module_name))
-				if module_name in self.top_level_nodes:
+					if module_name in top_level_nodes:
+						label = label.replace(
+							"(",
+							"(Top-Level; ")
+					yield label
+			for module_name in get_ordered(self.get_reported_import_names(key="custom")):
+				label = "\n .. {} (Custom Module/Package)".format(
+					module_name)
+				if module_name in top_level_nodes:
 					label = label.replace(
 						"(",
 						"(Top-Level; ")
-				labels.append(
-					label)
-			title = " ** List of Imported Modules **"
-			title_with_under_line = get_title_with_under_line(
-				title=title,
-				symbol="-")
-			labels.insert(
-				0,
-				title_with_under_line)
-			return labels
+				yield label
 
 		def get_labels_at_import_hierarchy():
-			labels = list()
-			for module_name, import_names in self.hierarchy.items():
-				partial_label = "\n {}:\n".format(
-					module_name)
-				for import_name in import_names:
-					partial_label += " .. {}\n".format(
-						import_name)
-				labels.append(
-					partial_label)
 			title = " ** Hierarchy of Imported Modules **"
-			title_with_under_line = get_title_with_under_line(
+			yield get_title_with_under_line(
+				title=title,
+				symbol="-")
+			for module_name in get_ordered(self.hierarchy.keys()):
+				partial_labels = ["\n {}:\n".format(module_name)]
+				for import_name in get_ordered(self.hierarchy[module_name]):
+					partial_labels.append(
+						" .. {}\n".format(
+							import_name))
+				yield "".join(
+					partial_labels)
+
+		def get_labels_at_cycles():
+			title = " ** Import Cycles (Strongly-Connected Components) **"
+			yield get_title_with_under_line(
+				title=title,
+				symbol="-")
+			for cyclic_component in self.cyclic_components:
+				partial_labels = ["\n {} modules:\n".format(len(cyclic_component["nodes"]))]
+				for node in cyclic_component["nodes"]:
+					partial_labels.append(
+						" .. {}\n".format(
+							node))
+				partial_labels.append(
+					" (shortest witness: {})\n".format(
+						self.get_cycle_label(
+							cycle=cyclic_component["cycle"])))
+				yield "".join(
+					partial_labels)
+
+		def get_labels_at_import_times():
+			title = " ** Import Time (Slowest Import Chains) **"
+			yield get_title_with_under_line(
 				title=title,
 				symbol="-")
-			labels.insert(
-				0,
-				title_with_under_line)
-			return labels
-
-		label_at_title = get_label_at_title()
-		labels_at_top_level_nodes = get_labels_at_top_level_nodes()
-		labels_at_imports = get_labels_at_imports()
-		labels_at_import_hierarchy = get_labels_at_import_hierarchy()
-		labels = [
-			label_at_title,
-			*labels_at_top_level_nodes,
-			*labels_at_imports,
-			*labels_at_import_hierarchy]
-		s = "\n".join(
-			labels)
+			## sorted by cost, not by name ==> is_sorted does not apply
+			for cost, chain in self.get_expensive_import_chains():
+				yield " .. {:.1f} ms: {}\n".format(
+					cost / 1000,
+					" -> ".join(
+						chain))
+			title = " ** Import Time (Most Expensive Modules) **"
+			yield get_title_with_under_line(
+				title=title,
+				symbol="-")
+			expensive_nodes = sorted(
+				self.import_costs.items(),
+				key=lambda node_and_costs : (-node_and_costs[1]["cumulative"], node_and_costs[0]))
+			for node, costs in expensive_nodes[:self.maximum_number_chains]:
+				yield " .. {}: {:.1f} ms cumulative, {:.1f} ms self\n".format(
+					node,
+					costs["cumulative"] / 1000,
+					costs["self"] / 1000)
+
+		## set ==> O(1) membership instead of a scan of the top-level list per module
+		top_level_nodes = set(
+			self.top_level_nodes)
+		sections = [
+			(get_label_at_title(),),
+			get_labels_at_top_level_nodes(),
+			get_labels_at_imports(
+				top_level_nodes=top_level_nodes),
+			get_labels_at_import_hierarchy()]
+		if len(self.cyclic_components) > 0:
+			sections.append(
+				get_labels_at_cycles())
+		if self.import_costs is not None:
+			sections.append(
+				get_labels_at_import_times())
+		## labels are separated by one new-line, as in "\n".join(labels)
+		separator = ""
+		for label in itertools.chain.from_iterable(sections):
+			yield separator
+			yield label
+			separator = "\n"
+
+	def get_string(self, is_sorted=False):
+		s = "".join(
+			self.get_labels(
+				is_sorted=is_sorted))
 		return s
 
 class NetworkConfiguration(BaseNetworkConfiguration):
 
-	def __init__(self, tree, is_include_common=False, is_include_uncommon=False, is_include_custom=False):
+	def __init__(self, tree, is_include_common=False, is_include_uncommon=False, is_include_custom=False, cycle_mode="raise", maximum_number_cycles=0, graph_backend="networkx", instrumentation=None):
 		super().__init__()
 		self.initialize_visual_settings()
 		self.initialize_tree(
 			tree=tree)
+		self.initialize_instrumentation(
+			instrumentation=instrumentation)
+		self.initialize_graph_backend(
+			graph_backend=graph_backend)
+		self.initialize_cycle_settings(
+			cycle_mode=cycle_mode,
+			maximum_number_cycles=maximum_number_cycles)
 		self.initialize_graph(
 			is_include_common=is_include_common,
 			is_include_uncommon=is_include_uncommon,
 			is_include_custom=is_include_custom)
-		self.initialize_hierarchy()
-		self.initialize_top_level_nodes()
+		with get_stage(self.instrumentation, "hierarchy"):
+			self.initialize_hierarchy()
+			self.initialize_top_level_nodes()
 
 	def __repr__(self):
 		network = f"NetworkConfiguration()"
@@ -256,29 +1012,125 @@ class NetworkConfiguration(BaseNetworkConfiguration):
 		s = self.get_string()
 		return s
 
-	def write_module_hierarchy_to_file(self, extension=".txt"):
+	def get_output_path(self, file_name, extension):
 		self.verify_visual_settings()
 		if self.visual_settings.path_to_save_directory is None:
 			# raise ValueError("self.visual_settings.path_to_directory is not initialized")
 			path_to_save_directory = self.tree.path_to_directory[:]
 		else:
 			path_to_save_directory = self.visual_settings.path_to_save_directory[:]
+		output_path = "{}{}{}{}".format(
+			path_to_save_directory,
+			file_name,
+			self.output_suffix,
+			extension)
+		return output_path
+
+	def write_module_hierarchy_to_file(self, extension=".txt", is_sorted=False, is_compress=False, buffer_size=1024*1024, is_write_instrumentation=False):
 		allowed_extensions = (
 			".txt",
 			)
 		if extension not in allowed_extensions:
 			raise ValueError("invalid extension: {}".format(extension))
-		file_name = "module_hierarchy"
-		output_path = "{}{}{}".format(
-			path_to_save_directory,
-			file_name,
-			extension)
-		with open(output_path, "w") as data_file:
-			data_file.write(
-				str(
-					self))
+		output_path = self.get_output_path(
+			file_name="module_hierarchy",
+			extension=extension)
+		if is_compress:
+			## gzip is only imported when asked for; gzip.open has no buffer size ==> the labels are
+			## collected in a buffer of buffer_size before each (slow) write to the compressor
+			import io
+			import gzip
+			output_path = "{}.gz".format(
+				output_path)
+			data_file = io.TextIOWrapper(
+				io.BufferedWriter(
+					gzip.GzipFile(
+						output_path,
+						"wb"),
+					buffer_size))
+		else:
+			data_file = open(
+				output_path,
+				"w",
+				buffering=buffer_size)
+		with get_stage(self.instrumentation, "report"):
+			with data_file:
+				for label in self.get_labels(
+					is_sorted=is_sorted):
+					data_file.write(
+						label)
+		if is_write_instrumentation:
+			self.write_instrumentation_to_file()
+
+	def write_snapshot_to_file(self, path_to_snapshot=None):
+		## the tree plus the graph and its settings; reload with
+		## tree.initialize_from_snapshot(...) and NetworkConfiguration(tree=tree, **tree.snapshot.network_settings)
+		if path_to_snapshot is None:
+			path_to_snapshot = self.get_output_path(
+				file_name="module_network",
+				extension=".snapshot")
+		self.tree.write_snapshot_to_file(
+			path_to_snapshot=path_to_snapshot,
+			update_snapshot_data=self.update_snapshot_data)
+
+	def update_snapshot_data(self, metadata, names, indices_at_names, arrays):
+		## adds the network section to the data of ModuleTreeConfiguration.get_snapshot_data
+		from snapshot_configuration import SnapshotConfiguration
+		if self.graph_backend == "compact":
+			nodes = list(
+				self.core.names)
+			sources, targets = self.core.get_edge_indices()
+		else:
+			nodes = list(
+				self.graph.nodes())
+			indices_at_nodes = {
+				node : index
+					for index, node in enumerate(nodes)}
+			sources = list()
+			targets = list()
+			for source, target in self.graph.edges():
+				sources.append(
+					indices_at_nodes[source])
+				targets.append(
+					indices_at_nodes[target])
+		metadata["network"] = {
+			"is_include_common" : self.is_include_common,
+			"is_include_uncommon" : self.is_include_uncommon,
+			"is_include_custom" : self.is_include_custom,
+			"cycle_mode" : self.cycle_mode,
+			"maximum_number_cycles" : self.maximum_number_cycles,
+			"graph_backend" : self.graph_backend}
+		arrays["nodes"] = (
+			"<i4",
+			[SnapshotConfiguration.get_interned_index(names=names, indices_at_names=indices_at_names, name=node) for node in nodes])
+		arrays["edge_sources"] = ("<i4", sources)
+		arrays["edge_targets"] = ("<i4", targets)
+		## the nodes and the witness cycle of each cyclic component ==> no search when loading
+		for key in ("nodes", "cycle"):
+			index_pointers = [0]
+			indices = list()
+			for cyclic_component in self.cyclic_components:
+				indices.extend(
+					indices_at_names[node]
+						for node in cyclic_component[key])
+				index_pointers.append(
+					len(indices))
+			arrays["cyclic_{}_index_pointers".format(key)] = ("<i8", index_pointers)
+			arrays["cyclic_{}_indices".format(key)] = ("<i4", indices)
 
-	def view_graph(self, layout="shell", top_level_color="orange", common_successor_color="skyblue", uncommon_successor_color="gold", custom_successor_color="limegreen", edge_color="silver", font_weight="bold", margins=0.4, is_with_legend=False, figsize=None, is_save=False):
+	def write_instrumentation_to_file(self):
+		## written next to module_hierarchy.txt
+		if self.instrumentation is None:
+			raise ValueError("self.instrumentation is not initialized")
+		output_path = self.get_output_path(
+			file_name="module_hierarchy_instrumentation",
+			extension=".json")
+		self.instrumentation.write_to_file(
+			path_to_file=output_path)
+
+	def view_graph(self, layout="shell", top_level_color="orange", common_successor_color="skyblue", uncommon_successor_color="gold", custom_successor_color="limegreen", edge_color="silver", font_weight="bold", margins=0.4, is_with_legend=False, figsize=None, is_save=False, render_mode="default", maximum_number_labels=None, dpi=None, extension=None, is_rasterize_edges=False, path_to_layout_cache=None, cost_mode=None, cost_key="cumulative", cost_cmap="YlOrRd"):
+		## cost_mode="size" or "color" ==> nodes scaled or coloured by import time (see initialize_import_times)
+		from plotter_network_configuration import NetworkViewer
 		plotter = NetworkViewer()
 		plotter.initialize_visual_settings()
 		plotter.update_save_directory(
@@ -295,6 +1147,125 @@ class NetworkConfiguration(BaseNetworkConfiguration):
 			margins=margins,
 			is_with_legend=is_with_legend,
 			figsize=figsize,
-			is_save=is_save)
+			is_save=is_save,
+			render_mode=render_mode,
+			maximum_number_labels=maximum_number_labels,
+			dpi=dpi,
+			extension=extension,
+			is_rasterize_edges=is_rasterize_edges,
+			path_to_layout_cache=path_to_layout_cache,
+			cost_mode=cost_mode,
+			cost_key=cost_key,
+			cost_cmap=cost_cmap)
+
+class SubNetworkConfiguration(NetworkConfiguration):
+
+	def __init__(self, network, seeds, depth=1, direction="both"):
+		## cut from a built network instead of built from a tree ==> NetworkConfiguration.__init__ is skipped
+		BaseNetworkConfiguration.__init__(self)
+		self.initialize_visual_settings()
+		self.update_save_directory(
+			path_to_save_directory=network.visual_settings.path_to_save_directory)
+		self._seeds = None
+		self._depth = None
+		self._direction = None
+		self._network = None
+		self.initialize_subnetwork(
+			network=network,
+			seeds=seeds,
+			depth=depth,
+			direction=direction)
+
+	def __repr__(self):
+		subnetwork = f"SubNetworkConfiguration(seeds={self.seeds!r}, depth={self.depth!r}, direction={self.direction!r})"
+		return subnetwork
+
+	@property
+	def network(self):
+		return self._network
+
+	@property
+	def seeds(self):
+		return self._seeds
+
+	@property
+	def depth(self):
+		return self._depth
+
+	@property
+	def direction(self):
+		return self._direction
+
+	def initialize_subnetwork(self, network, seeds, depth, direction):
+		if isinstance(seeds, str):
+			seeds = [seeds]
+		seeds = list(
+			dict.fromkeys(
+				seeds))
+		nodes = network.get_ego_nodes(
+			seeds=seeds,
+			depth=depth,
+			direction=direction)
+		is_node = set(
+			nodes)
+		## induced edges ==> only the out-going edges of the selected nodes are read
+		graph = nx.DiGraph()
+		graph.add_nodes_from(
+			nodes)
+		for node in nodes:
+			for successor in network.get_neighbor_names(node=node, direction="imports"):
+				if successor in is_node:
+					graph.add_edge(
+						node,
+						successor)
+		self._network = network
+		self._seeds = seeds
+		self._depth = depth
+		self._direction = direction
+		self._output_suffix = "_subgraph"
+		self._tree = network.tree
+		self._instrumentation = network.instrumentation
+		self._graph_backend = "networkx"
+		self._graph = graph
+		self._is_include_common = network.is_include_common
+		self._is_include_uncommon = network.is_include_uncommon
+		self._is_include_custom = network.is_include_custom
+		## the full network already applied cycle_mode="raise"
+		self.initialize_cycle_settings(
+			cycle_mode="condense",
+			maximum_number_cycles=0)
+		self.initialize_cycles()
+		self._hierarchy = {
+			node : list(graph.successors(node))
+				for node in nodes
+					if node in self.tree.import_names["custom"]}
+		## top-level in the full network, not merely without importers inside the subgraph
+		self._top_level_nodes = [
+			node
+				for node in nodes
+					if network.is_top_level_node(node=node)]
+		if network.import_times is not None:
+			self.initialize_import_times(
+				import_times=network.import_times,
+				maximum_number_chains=network.maximum_number_chains)
+
+	def is_top_level_node(self, node):
+		## a subnetwork of a subnetwork still refers to the full network
+		is_top_level = self.network.is_top_level_node(
+			node=node)
+		return is_top_level
+
+	def get_reported_import_names(self, key):
+		reported_import_names = [
+			node
+				for node in self.graph.nodes()
+					if node in self.tree.import_names[key]]
+		return reported_import_names
+
+	def update_graph(self, canopy_keys, changed_import_names):
+		raise ValueError("a subnetwork is not updated in place; extract it again from the updated network")
+
+	def write_snapshot_to_file(self, path_to_snapshot=None):
+		raise ValueError("a subnetwork has no snapshot; write the snapshot of the full network")
 
-##
\ No newline at end of file
+##
@@ -1,4 +1,12 @@
+import io
+import os
+import re
 import ast
+import sys
+import mmap
+import time
+import bisect
+import tokenize
 
 
 class BaseNodeVisitorConfiguration():
@@ -7,6 +15,19 @@ class BaseNodeVisitorConfiguration():
 		super().__init__()
 		self._module_names = None
 		self._node_visitor = None
+		self._extractor = None
+		self._is_prefilter = None
+		self._scanner_pattern = None
+		self._skipped_files = None
+		self._number_fallbacks = None
+		self._number_bytes = None
+		self._elapsed_times = None
+		self._byte_scanner_pattern = None
+		self._is_header_only = None
+		self._maximum_file_size = None
+		self._maximum_parse_time = None
+		self._start_time = None
+		self._is_qualified = None
 
 	@property
 	def module_names(self):
@@ -16,18 +37,133 @@ class BaseNodeVisitorConfiguration():
 	def node_visitor(self):
 		return self._node_visitor
 
-	def pre_initialize(self):
+	@property
+	def extractor(self):
+		return self._extractor
+
+	@property
+	def is_prefilter(self):
+		return self._is_prefilter
+
+	@property
+	def skipped_files(self):
+		return self._skipped_files
+
+	@property
+	def number_fallbacks(self):
+		return self._number_fallbacks
+
+	@property
+	def number_bytes(self):
+		return self._number_bytes
+
+	@property
+	def elapsed_times(self):
+		return self._elapsed_times
+
+	@property
+	def is_header_only(self):
+		return self._is_header_only
+
+	@property
+	def maximum_file_size(self):
+		return self._maximum_file_size
+
+	@property
+	def maximum_parse_time(self):
+		return self._maximum_parse_time
+
+	@property
+	def is_qualified(self):
+		return self._is_qualified
+
+	@staticmethod
+	def get_parser_signature(extractor="ast", is_header_only=False, is_qualified=False):
+		## ast output may differ between interpreter versions
+		parser_signature = "{}-extractor-2-py{}.{}".format(
+			extractor,
+			*sys.version_info[:2])
+		if is_header_only:
+			parser_signature = "{}-header".format(
+				parser_signature)
+		if is_qualified:
+			parser_signature = "{}-qualified".format(
+				parser_signature)
+		return parser_signature
+
+	@staticmethod
+	def get_qualified_name(level, module_name, name):
+		## "from ..a.b import c" ==> "..a.b.c"; "from . import c" ==> ".c"; "*" names the module itself
+		qualified_name = "." * level
+		if module_name is not None:
+			qualified_name += module_name
+			if name != "*":
+				qualified_name += "."
+		if name != "*":
+			qualified_name += name
+		return qualified_name
+
+	@staticmethod
+	def get_scanner_pattern(is_bytes=False):
+		## comments and string literals are matched first so that keywords inside them are consumed;
+		## a definition at column 0 ends the header, where imports are expected (see is_header_only)
+		scanner_pattern = (
+			r"""(?P<comment>\#[^\r\n]*)"""
+			r"""|(?P<string>\"\"\"(?:\\.|[^\\])*?\"\"\"|'''(?:\\.|[^\\])*?'''|"(?:\\.|[^"\\\r\n])*"|'(?:\\.|[^'\\\r\n])*')"""
+			r"""|(?P<keyword>\b(?:import|from)\b)"""
+			r"""|(?P<definition>^(?:(?:async[ \t]+)?def|class)\b|^@)""")
+		if is_bytes:
+			scanner_pattern = scanner_pattern.encode(
+				"ascii")
+		scanner_pattern = re.compile(
+			scanner_pattern,
+			re.S | re.M)
+		return scanner_pattern
+
+	def pre_initialize(self, extractor="ast", is_prefilter=True, is_time_files=False, is_header_only=False, maximum_file_size=None, maximum_parse_time=None, is_qualified=False):
+		extractors = (
+			"ast",
+			"tokenize",
+			"mmap")
+		if extractor not in extractors:
+			raise ValueError("invalid extractor: {}".format(extractor))
+		for name, value in (("is_prefilter", is_prefilter), ("is_time_files", is_time_files), ("is_header_only", is_header_only), ("is_qualified", is_qualified)):
+			if not isinstance(value, bool):
+				raise ValueError("invalid type({}): {}".format(name, type(value)))
+		if is_header_only and (extractor == "ast"):
+			raise ValueError("invalid extractor for is_header_only: {}".format(extractor))
+		if maximum_file_size is not None:
+			if not isinstance(maximum_file_size, int):
+				raise ValueError("invalid type(maximum_file_size): {}".format(type(maximum_file_size)))
+			if maximum_file_size <= 0:
+				raise ValueError("invalid maximum_file_size: {}".format(maximum_file_size))
+		if maximum_parse_time is not None:
+			if not isinstance(maximum_parse_time, (int, float)):
+				raise ValueError("invalid type(maximum_parse_time): {}".format(type(maximum_parse_time)))
+			if maximum_parse_time <= 0:
+				raise ValueError("invalid maximum_parse_time: {}".format(maximum_parse_time))
 
 		def visit_Import(node):
 			for name in node.names:
-				self._module_names.add(
-					name.name.split(
-						".")[0])
+				if is_qualified:
+					self._module_names.add(
+						name.name)
+				else:
+					self._module_names.add(
+						name.name.split(
+							".")[0])
 
 		def visit_ImportFrom(node):
 			## missing node.module ==> "from foo import bar"
 			## level > 0 ==> "from .foo import bar"
-			if node.module is not None and node.level == 0:
+			if is_qualified:
+				for name in node.names:
+					self._module_names.add(
+						self.get_qualified_name(
+							level=node.level,
+							module_name=node.module,
+							name=name.name))
+			elif node.module is not None and node.level == 0:
 				self._module_names.add(
 					node.module.split(
 						".")[0])
@@ -38,21 +174,609 @@ class BaseNodeVisitorConfiguration():
 		node_visitor.visit_ImportFrom = visit_ImportFrom
 		self._module_names = module_names
 		self._node_visitor = node_visitor
+		self._extractor = extractor
+		self._is_prefilter = is_prefilter
+		self._scanner_pattern = self.get_scanner_pattern()
+		self._byte_scanner_pattern = self.get_scanner_pattern(
+			is_bytes=True)
+		self._skipped_files = dict()
+		self._number_fallbacks = 0
+		self._number_bytes = 0
+		## None ==> per-file timing is off and costs nothing
+		self._elapsed_times = dict() if is_time_files else None
+		self._is_header_only = is_header_only
+		self._maximum_file_size = maximum_file_size
+		self._maximum_parse_time = maximum_parse_time
+		## True ==> dotted and relative names (see get_qualified_name) instead of top-level names
+		self._is_qualified = is_qualified
+
+	def verify_file_size(self, number_bytes):
+		if (self.maximum_file_size is not None) and (number_bytes > self.maximum_file_size):
+			raise ValueError("file size {} bytes exceeds maximum_file_size {} bytes".format(number_bytes, self.maximum_file_size))
+
+	def verify_parse_time(self):
+		## checked between import statements (and after ast.parse, which cannot be interrupted)
+		if self.maximum_parse_time is not None:
+			elapsed_time = time.perf_counter() - self._start_time
+			if elapsed_time > self.maximum_parse_time:
+				raise TimeoutError("parse time {:.3f} s exceeds maximum_parse_time {} s".format(elapsed_time, self.maximum_parse_time))
+
+	def get_module_names_from_ast(self, source):
+		tree = ast.parse(
+			source)
+		self.verify_parse_time()
+		self._node_visitor.visit(
+			tree)
+		module_names = self.module_names
+		self._module_names = set()
+		return module_names
+
+	def get_module_names_from_statements(self, source):
+		## imports are always statements, so expressions never need to be visited
+		statements = list(
+			ast.parse(
+				source).body)
+		while len(statements) > 0:
+			statement = statements.pop()
+			if isinstance(statement, (ast.Import, ast.ImportFrom)):
+				self._node_visitor.visit(
+					statement)
+			else:
+				for field in ("body", "orelse", "finalbody", "handlers", "cases"):
+					statements.extend(
+						getattr(
+							statement,
+							field,
+							()))
+		module_names = self.module_names
+		self._module_names = set()
+		return module_names
+
+	@staticmethod
+	def get_import_statement(get_line, column, is_qualified=False):
+		## tokenizes one logical line starting at the keyword; returns None if it is not an import.
+		## get_line(0) is the line of the keyword, get_line(1) the next one, ... and "" past the end
+		index_at_line = 0
+
+		def readline():
+			nonlocal index_at_line
+			if index_at_line == 0:
+				line = get_line(0)[column:]
+			else:
+				line = get_line(
+					index_at_line)
+			index_at_line += 1
+			return line
+
+		def get_next_token():
+			token = next(
+				tokens)
+			while token.type in (tokenize.NL, tokenize.COMMENT):
+				token = next(
+					tokens)
+			return token
+
+		def is_end_of_statement(token):
+			state = (
+				(token.type in (tokenize.NEWLINE, tokenize.ENDMARKER)) or (token.exact_type == tokenize.SEMI))
+			return state
+
+		tokens = tokenize.generate_tokens(
+			readline)
+		module_names = set()
+		try:
+			keyword = get_next_token()
+			token = get_next_token()
+			if keyword.string == "import":
+				while True:
+					if token.type != tokenize.NAME:
+						return None
+					module_name = token.string
+					token = get_next_token()
+					while token.exact_type == tokenize.DOT:
+						token = get_next_token()
+						if token.type != tokenize.NAME:
+							return None
+						if is_qualified:
+							module_name += ".{}".format(
+								token.string)
+						token = get_next_token()
+					module_names.add(
+						module_name)
+					if (token.type == tokenize.NAME) and (token.string == "as"):
+						token = get_next_token()
+						if token.type != tokenize.NAME:
+							return None
+						token = get_next_token()
+					if is_end_of_statement(token):
+						break
+					if token.exact_type != tokenize.COMMA:
+						return None
+					token = get_next_token()
+			else:
+				level = 0
+				while token.exact_type in (tokenize.DOT, tokenize.ELLIPSIS):
+					level += len(
+						token.string)
+					token = get_next_token()
+				module_name = None
+				if (token.type == tokenize.NAME) and (token.string != "import"):
+					module_name = token.string
+					token = get_next_token()
+					while token.exact_type == tokenize.DOT:
+						token = get_next_token()
+						if token.type != tokenize.NAME:
+							return None
+						if is_qualified:
+							module_name += ".{}".format(
+								token.string)
+						token = get_next_token()
+				## "yield from x" and "raise x from y" stop here
+				if (token.type != tokenize.NAME) or (token.string != "import"):
+					return None
+				## names after "import", skipping parentheses, commas and "as" aliases
+				names = list()
+				is_alias = False
+				while not is_end_of_statement(token):
+					token = get_next_token()
+					if (token.type == tokenize.NAME) and (token.string == "as"):
+						is_alias = True
+					elif (token.type == tokenize.NAME) or (token.exact_type == tokenize.STAR):
+						if not is_alias:
+							names.append(
+								token.string)
+						is_alias = False
+				if is_qualified:
+					for name in names:
+						module_names.add(
+							BaseNodeVisitorConfiguration.get_qualified_name(
+								level=level,
+								module_name=module_name,
+								name=name))
+				elif (module_name is not None) and (level == 0):
+					module_names.add(
+						module_name)
+		except (tokenize.TokenError, StopIteration, SyntaxError):
+			return None
+		end_row, end_column = token.start
+		return module_names, end_row, end_column
+
+	def get_module_names_from_tokens(self, source):
+		## returns None whenever the scan is ambiguous; the caller then falls back to ast
+		encoding, _ = tokenize.detect_encoding(
+			io.BytesIO(
+				source).readline)
+		if not self.is_ascii_compatible(encoding=encoding):
+			## e.g. a utf-16 cookie: the decoded text has no keywords to find ==> ast decides
+			return None
+		text = source.decode(
+			encoding)
+		lines = io.StringIO(
+			text,
+			newline="").readlines()
+		line_offsets = [0]
+		for line in lines:
+			line_offsets.append(
+				line_offsets[-1] + len(line))
+		module_names = set()
+		position_at_statement_end = 0
+
+		def get_line(index):
+			if index_at_line + index < len(lines):
+				line = lines[index_at_line + index]
+			else:
+				line = ""
+			return line
+
+		for match in self._scanner_pattern.finditer(text):
+			if match.group("definition") is not None:
+				if self.is_header_only:
+					break
+				continue
+			keyword = match.group("keyword")
+			if keyword is None:
+				continue
+			position = match.start()
+			## the "import" of a "from ... import ..." statement that was already read
+			if position < position_at_statement_end:
+				continue
+			self.verify_parse_time()
+			index_at_line = bisect.bisect_right(
+				line_offsets,
+				position) - 1
+			column = position - line_offsets[index_at_line]
+			statement = self.get_import_statement(
+				get_line=get_line,
+				column=column,
+				is_qualified=self.is_qualified)
+			if statement is None:
+				if keyword == "import":
+					return None
+				continue
+			statement_module_names, end_row, end_column = statement
+			module_names.update(
+				statement_module_names)
+			if end_row == 1:
+				end_column += column
+			index_at_end_line = min(
+				index_at_line + end_row - 1,
+				len(lines))
+			position_at_statement_end = line_offsets[index_at_end_line] + end_column
+		return module_names
+
+	@staticmethod
+	def is_ascii_compatible(encoding):
+		## the cookie itself was read as ascii ==> an encoding that spells keywords differently
+		## (utf-16, utf-32, cp037, ...) cannot be the encoding of the text the scanners see
+		is_ascii_compatible = ("import".encode(encoding) == b"import")
+		return is_ascii_compatible
+
+	@staticmethod
+	def get_encoding(source):
+		## PEP 263: the cookie (or a utf-8 bom) can only be on the first two lines
+		position = source.find(
+			b"\n")
+		if position != -1:
+			position = source.find(
+				b"\n",
+				position + 1)
+		header = source[:position + 1] if position != -1 else source[:]
+		encoding, _ = tokenize.detect_encoding(
+			io.BytesIO(
+				header).readline)
+		## the bom is skipped by the scan ==> each line decodes as plain utf-8
+		if encoding == "utf-8-sig":
+			encoding = "utf-8"
+		return encoding
+
+	def get_module_names_from_buffer(self, source):
+		## scans bytes (e.g. a memory-mapped file) and decodes only the lines of import statements;
+		## returns None whenever the scan is ambiguous, like get_module_names_from_tokens
+		encoding = self.get_encoding(
+			source=source)
+		if not self.is_ascii_compatible(encoding=encoding):
+			## byte offsets do not line up with the keywords ==> ambiguous, the caller falls back to ast
+			return None
+		number_bytes = len(
+			source)
+		module_names = set()
+		position_at_statement_end = 0
+		line_offsets = list()
+
+		def get_line(index):
+			## line_offsets[i] is where line i (counted from the keyword) starts
+			while len(line_offsets) <= index + 1:
+				if line_offsets[-1] >= number_bytes:
+					return ""
+				position = source.find(
+					b"\n",
+					line_offsets[-1])
+				line_offsets.append(
+					number_bytes if position == -1 else position + 1)
+			line = source[line_offsets[index] : line_offsets[index + 1]].decode(
+				encoding)
+			return line
+
+		for match in self._byte_scanner_pattern.finditer(source):
+			if match.group("definition") is not None:
+				if self.is_header_only:
+					break
+				continue
+			keyword = match.group("keyword")
+			if keyword is None:
+				continue
+			position = match.start()
+			if position < position_at_statement_end:
+				continue
+			self.verify_parse_time()
+			line_offsets.clear()
+			line_offsets.append(
+				position)
+			statement = self.get_import_statement(
+				get_line=get_line,
+				column=0,
+				is_qualified=self.is_qualified)
+			if statement is None:
+				if keyword == b"import":
+					return None
+				continue
+			statement_module_names, end_row, end_column = statement
+			module_names.update(
+				statement_module_names)
+			## tokenize counts columns in characters ==> re-encode the end line up to the column
+			line = get_line(
+				end_row - 1)
+			if end_row - 1 < len(line_offsets):
+				position_at_statement_end = line_offsets[end_row - 1] + len(
+					line[:end_column].encode(
+						encoding))
+			else:
+				position_at_statement_end = number_bytes
+		return module_names
+
+	def get_module_names_from_source(self, source):
+		if self.is_prefilter and (source.find(b"import") == -1):
+			## every import statement spells out the keyword
+			module_names = set()
+		elif self.extractor == "ast":
+			module_names = self.get_module_names_from_ast(
+				source=source)
+		else:
+			if self.extractor == "mmap":
+				module_names = self.get_module_names_from_buffer(
+					source=source)
+			else:
+				module_names = self.get_module_names_from_tokens(
+					source=source)
+			if module_names is None:
+				self._number_fallbacks += 1
+				module_names = self.get_module_names_from_statements(
+					source=source)
+		## sorted ==> identical output across processes (string hashes are salted per process)
+		module_names = sorted(
+			module_names)
+		return module_names
+
+	@staticmethod
+	def get_import_scopes():
+		## by precedence: an import inside a function under "if TYPE_CHECKING:" is type_checking, etc.
+		import_scopes = (
+			"module",
+			"conditional",
+			"function",
+			"type_checking")
+		return import_scopes
+
+	@staticmethod
+	def is_type_checking_test(node):
+		## "if TYPE_CHECKING:" and "if typing.TYPE_CHECKING:"
+		is_type_checking = (
+			(isinstance(node, ast.Name) and (node.id == "TYPE_CHECKING")) or (isinstance(node, ast.Attribute) and (node.attr == "TYPE_CHECKING")))
+		return is_type_checking
+
+	@staticmethod
+	def is_import_error_handler(handler):
+		## a bare except, ImportError or ModuleNotFoundError ==> the guarded import may be missing
+		if handler.type is None:
+			return True
+		types = handler.type.elts if isinstance(handler.type, ast.Tuple) else [handler.type]
+		is_import_error = any(
+			(isinstance(type_node, ast.Name) and (type_node.id in ("ImportError", "ModuleNotFoundError")))
+				for type_node in types)
+		return is_import_error
+
+	def get_scoped_imports_from_source(self, source):
+		## one record per imported name: {"module", "name", "scope", "line", "is_used_at_startup",
+		## "is_used_in_functions", "is_exported"}. name is the local binding (None for "*"); uses
+		## count loads of the name, at startup (module level, class bodies, decorators, defaults)
+		## or inside function bodies; annotations that are never evaluated do not count
+		import_scopes = self.get_import_scopes()
+		tree = ast.parse(
+			source)
+		self.verify_parse_time()
+		is_postponed_annotations = any(
+			isinstance(statement, ast.ImportFrom) and (statement.module == "__future__") and any(alias.name == "annotations" for alias in statement.names)
+				for statement in tree.body)
+		imports = list()
+		scopes_at_names = dict()
+		exported_names = set()
+		## None ==> not evaluated at all (e.g. a postponed annotation)
+		stack = [(tree, "module")]
+
+		def get_scope(scope, inner_scope):
+			if scope is None:
+				return None
+			modified_scope = max(
+				scope,
+				inner_scope,
+				key=import_scopes.index)
+			return modified_scope
+
+		def push(children, child_scope):
+			for child in children:
+				if isinstance(child, ast.AST):
+					stack.append(
+						(child, child_scope))
+
+		while len(stack) > 0:
+			node, scope = stack.pop()
+			if isinstance(node, (ast.Import, ast.ImportFrom)):
+				for alias in node.names:
+					if isinstance(node, ast.Import):
+						module_name = alias.name if self.is_qualified else alias.name.split(".")[0]
+						name = alias.asname or alias.name.split(".")[0]
+					elif self.is_qualified:
+						module_name = self.get_qualified_name(
+							level=node.level,
+							module_name=node.module,
+							name=alias.name)
+						name = None if alias.name == "*" else (alias.asname or alias.name)
+					elif (node.module is not None) and (node.level == 0):
+						module_name = node.module.split(".")[0]
+						name = None if alias.name == "*" else (alias.asname or alias.name)
+					else:
+						continue
+					if (scope is not None) and (module_name != "__future__"):
+						imports.append({
+							"module" : module_name,
+							"name" : name,
+							"scope" : scope,
+							"line" : node.lineno})
+			elif isinstance(node, ast.Name):
+				if isinstance(node.ctx, ast.Load) and (scope is not None):
+					scopes_at_names.setdefault(
+						node.id,
+						set()).add(
+							scope)
+			elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)):
+				## decorators and defaults run when the function is defined; the body when it is called
+				push(
+					getattr(node, "decorator_list", ()),
+					scope)
+				push(
+					node.args.defaults + [default for default in node.args.kw_defaults if default is not None],
+					scope)
+				annotations = [
+					argument.annotation
+						for argument in node.args.posonlyargs + node.args.args + node.args.kwonlyargs + [node.args.vararg, node.args.kwarg]
+							if (argument is not None) and (argument.annotation is not None)]
+				if getattr(node, "returns", None) is not None:
+					annotations.append(
+						node.returns)
+				push(
+					annotations,
+					None if is_postponed_annotations else scope)
+				body = node.body if isinstance(node.body, list) else [node.body]
+				push(
+					body,
+					get_scope(scope, "function"))
+			elif isinstance(node, ast.AnnAssign):
+				## local variable annotations are never evaluated
+				is_evaluated = (not is_postponed_annotations) and (scope in ("module", "conditional"))
+				push(
+					(node.annotation,),
+					scope if is_evaluated else None)
+				push(
+					(node.target, node.value),
+					scope)
+			elif isinstance(node, ast.If):
+				push(
+					(node.test,),
+					scope)
+				if self.is_type_checking_test(node.test):
+					push(
+						node.body,
+						get_scope(scope, "type_checking"))
+					push(
+						node.orelse,
+						get_scope(scope, "conditional"))
+				else:
+					push(
+						node.body + node.orelse,
+						get_scope(scope, "conditional"))
+			elif isinstance(node, ast.Try) or (type(node).__name__ == "TryStar"):
+				if any(self.is_import_error_handler(handler) for handler in node.handlers):
+					inner_scope = get_scope(scope, "conditional")
+				else:
+					inner_scope = scope
+				push(
+					node.body + node.handlers + node.orelse + node.finalbody,
+					inner_scope)
+			else:
+				if (scope == "module") and isinstance(node, (ast.Assign, ast.AugAssign)):
+					## __all__ = ["name", ...] ==> name is re-exported and must stay bound at import time
+					targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+					if any(isinstance(target, ast.Name) and (target.id == "__all__") for target in targets):
+						exported_names.update(
+							element.value
+								for element in ast.walk(node.value)
+									if isinstance(element, ast.Constant) and isinstance(element.value, str))
+				if type(node).__name__ == "match_case":
+					inner_scope = get_scope(scope, "conditional")
+				else:
+					inner_scope = scope
+				push(
+					ast.iter_child_nodes(node),
+					inner_scope)
+		for record in imports:
+			scopes = scopes_at_names.get(
+				record["name"],
+				set())
+			record["is_used_at_startup"] = bool(
+				scopes & {"module", "conditional"})
+			record["is_used_in_functions"] = ("function" in scopes)
+			record["is_exported"] = (record["name"] in exported_names)
+		imports.sort(
+			key=lambda record : (record["line"], record["module"]))
+		return imports
 
 class NodeVisitorConfiguration(BaseNodeVisitorConfiguration):
 
-	def __init__(self):
+	def __init__(self, extractor="ast", is_prefilter=True, is_time_files=False, is_header_only=False, maximum_file_size=None, maximum_parse_time=None, is_qualified=False):
 		super().__init__()
-		self.pre_initialize()
-
-	def get_imported_module_names(self, path_to_file):
-		with open(path_to_file) as f:
-			self._node_visitor.visit(
-				ast.parse(
-					f.read()))
-		module_names = list(
-			self.module_names)
-		self._module_names = set()
+		self.pre_initialize(
+			extractor=extractor,
+			is_prefilter=is_prefilter,
+			is_time_files=is_time_files,
+			is_header_only=is_header_only,
+			maximum_file_size=maximum_file_size,
+			maximum_parse_time=maximum_parse_time,
+			is_qualified=is_qualified)
+
+	def get_module_names_from_mapped_file(self, path_to_file):
+		## the page cache backs the scan ==> a huge generated file is never copied into memory
+		with open(path_to_file, "rb") as f:
+			number_bytes = os.fstat(
+				f.fileno()).st_size
+			self.verify_file_size(
+				number_bytes=number_bytes)
+			self._number_bytes += number_bytes
+			## an empty file cannot be mapped
+			if number_bytes == 0:
+				return list()
+			with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as source:
+				module_names = self.get_module_names_from_source(
+					source=source)
+		return module_names
+
+	def get_imported_module_names(self, path_to_file, source=None):
+		## source ==> the bytes of path_to_file, already read elsewhere (e.g. by an async reader)
+		self._start_time = time.perf_counter()
+		try:
+			if source is not None:
+				self.verify_file_size(
+					number_bytes=len(source))
+				self._number_bytes += len(
+					source)
+				module_names = self.get_module_names_from_source(
+					source=source)
+			elif self.extractor == "mmap":
+				module_names = self.get_module_names_from_mapped_file(
+					path_to_file=path_to_file)
+			else:
+				with open(path_to_file, "rb") as f:
+					if self.maximum_file_size is not None:
+						self.verify_file_size(
+							number_bytes=os.fstat(f.fileno()).st_size)
+					source = f.read()
+				self._number_bytes += len(
+					source)
+				module_names = self.get_module_names_from_source(
+					source=source)
+		except (OSError, SyntaxError, UnicodeDecodeError, LookupError, ValueError, RecursionError, MemoryError) as error:
+			## one broken file must not abort the whole scan; deeply nested (e.g. generated) sources
+			## exhaust the recursion limit or the parser stack of ast.parse
+			self._skipped_files[path_to_file] = "{}: {}".format(
+				type(error).__name__,
+				error)
+			self._module_names = set()
+			module_names = None
+		if self.elapsed_times is not None:
+			self._elapsed_times[path_to_file] = time.perf_counter() - self._start_time
 		return module_names
 
-##
\ No newline at end of file
+	def get_scoped_imports(self, path_to_file, source=None):
+		## the ast path only: scopes need the syntax tree. None ==> skipped, see skipped_files
+		self._start_time = time.perf_counter()
+		try:
+			if source is None:
+				with open(path_to_file, "rb") as f:
+					if self.maximum_file_size is not None:
+						self.verify_file_size(
+							number_bytes=os.fstat(f.fileno()).st_size)
+					source = f.read()
+			else:
+				self.verify_file_size(
+					number_bytes=len(source))
+			self._number_bytes += len(
+				source)
+			scoped_imports = self.get_scoped_imports_from_source(
+				source=source)
+		except (OSError, SyntaxError, UnicodeDecodeError, LookupError, ValueError, RecursionError, MemoryError) as error:
+			self._skipped_files[path_to_file] = "{}: {}".format(
+				type(error).__name__,
+				error)
+			scoped_imports = None
+		return scoped_imports
+
+##
@@ -1,6 +1,7 @@
 import networkx as nx
 import matplotlib.pyplot as plt
 from plotter_base_configuration import BasePlotterConfiguration
+from instrumentation_configuration import get_stage
 
 
 class BaseNetworkViewer(BasePlotterConfiguration):
@@ -11,8 +12,10 @@ class BaseNetworkViewer(BasePlotterConfiguration):
 	@staticmethod
 	def get_node_colors(network, top_level_color, common_successor_color, uncommon_successor_color, custom_successor_color):
 		node_color = list()
+		top_level_nodes = set(
+			network.top_level_nodes)
 		for node in network.graph.nodes():
-			if node in network.top_level_nodes:
+			if node in top_level_nodes:
 				node_color.append(
 					top_level_color)
 			else:
@@ -30,9 +33,58 @@ class BaseNetworkViewer(BasePlotterConfiguration):
 		return node_color
 
 	@staticmethod
-	def get_pos(network, layout):
+	def get_node_costs(network, cost_key):
+		## import time per node in milliseconds; nodes missing from the trace cost 0
+		cost_keys = (
+			"self",
+			"cumulative")
+		if cost_key not in cost_keys:
+			raise ValueError("invalid cost_key: {}".format(cost_key))
+		if network.import_costs is None:
+			raise ValueError("network.import_costs is not initialized; call network.initialize_import_times first")
+		node_costs = [
+			network.import_costs[node][cost_key] / 1000 if node in network.import_costs else 0
+				for node in network.graph.nodes()]
+		return node_costs
+
+	@staticmethod
+	def get_node_sizes(node_costs, node_size):
+		## marker area grows linearly with cost, from a quarter to four times the usual size
+		maximum_cost = max(
+			node_costs,
+			default=0)
+		if maximum_cost == 0:
+			return node_size
+		node_sizes = [
+			node_size / 4 + (node_size * 4 - node_size / 4) * node_cost / maximum_cost
+				for node_cost in node_costs]
+		return node_sizes
+
+	@staticmethod
+	def get_layered_pos(network):
+		## rows by topological generation of the condensation ==> works with import cycles
+		from graph_core_configuration import CompactGraphConfiguration
+		if network.graph_backend == "compact":
+			core = network.core
+		else:
+			core = CompactGraphConfiguration(
+				names=list(
+					network.graph.nodes()),
+				edges=list(
+					network.graph.edges()))
+		x, y = core.get_layered_positions()
+		pos = {
+			name : (float(x_value), float(y_value))
+				for name, x_value, y_value in zip(core.names, x, y)}
+		return pos
+
+	@staticmethod
+	def get_pos(network, layout, initial_pos=None, fixed_nodes=None):
 		if layout is None:
 			pos = None
+		elif layout == "layered":
+			pos = BaseNetworkViewer.get_layered_pos(
+				network=network)
 		else:
 			layout_mapping = {
 				"arf" : nx.arf_layout,
@@ -44,10 +96,187 @@ class BaseNetworkViewer(BasePlotterConfiguration):
 			if layout not in layout_mapping.keys():
 				raise ValueError("invalid layout: {}".format(layout))
 			selected_layout = layout_mapping[layout]
-			pos = selected_layout(
-				network.graph)
+			if initial_pos is None:
+				pos = selected_layout(
+					network.graph)
+			elif layout == "spring":
+				## fixed nodes keep their cached place; only new or changed nodes move
+				pos = nx.spring_layout(
+					network.graph,
+					pos=initial_pos,
+					fixed=(fixed_nodes if len(fixed_nodes) > 0 else None))
+			else:
+				pos = selected_layout(
+					network.graph,
+					pos=initial_pos)
 		return pos
 
+	def get_cached_pos(self, network, layout, path_to_layout_cache):
+		from cache_configuration import LayoutCacheConfiguration
+		layout_cache = LayoutCacheConfiguration(
+			path_to_cache=path_to_layout_cache)
+		pos = layout_cache.get_positions(
+			graph=network.graph,
+			layout=layout)
+		if pos is None:
+			initial_pos, fixed_nodes = layout_cache.get_warm_start(
+				graph=network.graph,
+				layout=layout)
+			pos = self.get_pos(
+				network=network,
+				layout=layout,
+				initial_pos=initial_pos,
+				fixed_nodes=fixed_nodes)
+			layout_cache.update_positions(
+				graph=network.graph,
+				layout=layout,
+				positions=pos)
+			layout_cache.save()
+		return pos
+
+	@staticmethod
+	def get_render_mode(network, render_mode):
+		## "auto" ==> per-artist drawing only while it is still cheap
+		render_modes = (
+			"default",
+			"fast",
+			"auto")
+		if render_mode not in render_modes:
+			raise ValueError("invalid render_mode: {}".format(render_mode))
+		if render_mode == "auto":
+			if network.graph.number_of_nodes() > 500:
+				modified_render_mode = "fast"
+			else:
+				modified_render_mode = "default"
+		else:
+			modified_render_mode = render_mode
+		return modified_render_mode
+
+	@staticmethod
+	def get_dpi(number_nodes, render_mode, dpi=None):
+		if dpi is not None:
+			if not isinstance(dpi, (int, float)):
+				raise ValueError("invalid type(dpi): {}".format(type(dpi)))
+			if dpi <= 0:
+				raise ValueError("invalid dpi: {}".format(dpi))
+			return dpi
+		if render_mode == "default":
+			return 800
+		## the pixel count grows with dpi squared ==> lower resolution for larger graphs
+		modified_dpi = int(
+			min(
+				800,
+				max(
+					150,
+					800 * (50 / max(number_nodes, 1)) ** 0.5)))
+		return modified_dpi
+
+	@staticmethod
+	def get_labeled_nodes(network, maximum_number_labels=None):
+		## top-level nodes first, then by degree ==> the most connected modules keep their labels
+		number_nodes = network.graph.number_of_nodes()
+		if maximum_number_labels is None:
+			modified_maximum_number_labels = min(
+				number_nodes,
+				100)
+		else:
+			if not isinstance(maximum_number_labels, int):
+				raise ValueError("invalid type(maximum_number_labels): {}".format(type(maximum_number_labels)))
+			if maximum_number_labels < 0:
+				raise ValueError("invalid maximum_number_labels: {}".format(maximum_number_labels))
+			modified_maximum_number_labels = maximum_number_labels
+		if modified_maximum_number_labels >= number_nodes:
+			return list(
+				network.graph.nodes())
+		top_level_nodes = set(
+			network.top_level_nodes)
+		degrees = dict(
+			network.graph.degree())
+		nodes = sorted(
+			network.graph.nodes(),
+			key=lambda node : (node not in top_level_nodes, -degrees[node], node))
+		labeled_nodes = nodes[:modified_maximum_number_labels]
+		return labeled_nodes
+
+	def draw_graph(self, ax, network, pos, node_color, edge_color, font_weight, cost_mode=None, node_costs=None, cost_cmap=None):
+		if cost_mode == "color":
+			node_color = node_costs
+		nx.draw(
+			network.graph,
+			pos=pos,
+			ax=ax,
+			node_color=node_color,
+			node_size=self.get_node_sizes(node_costs=node_costs, node_size=300) if cost_mode == "size" else 300,
+			cmap=cost_cmap if cost_mode == "color" else None,
+			vmin=0 if cost_mode == "color" else None,
+			edge_color=edge_color,
+			font_weight=font_weight,
+			font_size=self.visual_settings.label_size,
+			with_labels=True,
+			arrows=True)
+
+	def draw_graph_fast(self, ax, network, pos, node_color, edge_color, font_weight, maximum_number_labels, is_rasterize_edges, cost_mode=None, node_costs=None, cost_cmap=None):
+		## one LineCollection for all edges and one scatter for all nodes instead of one artist each;
+		## edges are drawn without arrow heads, which are per-edge patches in matplotlib
+		import numpy as np
+		from matplotlib.collections import LineCollection
+		if pos is None:
+			pos = nx.spring_layout(
+				network.graph)
+		nodes = list(
+			network.graph.nodes())
+		number_nodes = len(
+			nodes)
+		positions = np.array(
+			[pos[node] for node in nodes],
+			dtype=float).reshape(-1, 2)
+		segments = [
+			(pos[source], pos[target])
+				for source, target in network.graph.edges()]
+		edge_collection = LineCollection(
+			segments,
+			colors=edge_color,
+			linewidths=0.5,
+			zorder=1,
+			rasterized=is_rasterize_edges)
+		ax.add_collection(
+			edge_collection)
+		node_size = min(
+			300,
+			max(
+				4,
+				300 * (100 / max(number_nodes, 1)) ** 0.5))
+		if cost_mode == "size":
+			node_size = self.get_node_sizes(
+				node_costs=node_costs,
+				node_size=node_size)
+		elif cost_mode == "color":
+			node_color = node_costs
+		ax.scatter(
+			positions[:, 0],
+			positions[:, 1],
+			c=node_color,
+			s=node_size,
+			cmap=cost_cmap if cost_mode == "color" else None,
+			vmin=0 if cost_mode == "color" else None,
+			linewidths=0,
+			zorder=2)
+		for node in self.get_labeled_nodes(
+			network=network,
+			maximum_number_labels=maximum_number_labels):
+			x, y = pos[node]
+			ax.text(
+				x,
+				y,
+				node,
+				fontsize=self.visual_settings.label_size,
+				fontweight=font_weight,
+				horizontalalignment="center",
+				verticalalignment="center",
+				zorder=3)
+		ax.autoscale_view()
+		ax.set_axis_off()
+
 	@staticmethod
 	def autocorrect_scaling(ax, margins):
 		ax.margins(
@@ -55,13 +284,31 @@ class BaseNetworkViewer(BasePlotterConfiguration):
 		return ax
 
 	@staticmethod
-	def get_save_name(is_save):
+	def get_save_name(is_save, network=None):
 		if is_save:
-			save_name = "module_network_graph"
+			save_name = "module_network_graph{}".format(
+				"" if network is None else network.output_suffix)
 		else:
 			save_name = None
 		return save_name
 
+	@staticmethod
+	def plot_colorbar(fig, ax, node_costs, cost_key, cost_cmap):
+		## colours encode cost instead of the kind of module ==> a colour bar instead of the legend
+		from matplotlib.cm import ScalarMappable
+		from matplotlib.colors import Normalize
+		mappable = ScalarMappable(
+			norm=Normalize(
+				vmin=0,
+				vmax=max(node_costs, default=0) or 1),
+			cmap=cost_cmap)
+		colorbar = fig.colorbar(
+			mappable,
+			ax=ax,
+			label="{} import time [ms]".format(
+				cost_key))
+		return fig, ax, colorbar
+
 	def plot_legend(self, fig, ax, network, top_level_color, common_successor_color, uncommon_successor_color, custom_successor_color, edge_color):
 
 		def get_unique_node_colors(network, top_level_color, common_successor_color, uncommon_successor_color, custom_successor_color):
@@ -169,46 +416,97 @@ class NetworkViewer(BaseNetworkViewer):
 	def __init__(self):
 		super().__init__()
 
-	def view_graph(self, network, layout, top_level_color, common_successor_color, uncommon_successor_color, custom_successor_color, edge_color, font_weight, margins, is_with_legend, figsize, is_save):
-		pos = self.get_pos(
+	def view_graph(self, network, layout, top_level_color, common_successor_color, uncommon_successor_color, custom_successor_color, edge_color, font_weight, margins, is_with_legend, figsize, is_save, render_mode="default", maximum_number_labels=None, dpi=None, extension=None, is_rasterize_edges=False, path_to_layout_cache=None, cost_mode=None, cost_key="cumulative", cost_cmap="YlOrRd"):
+		cost_modes = (
+			None,
+			"size",
+			"color")
+		if cost_mode not in cost_modes:
+			raise ValueError("invalid cost_mode: {}".format(cost_mode))
+		if cost_mode is None:
+			node_costs = None
+		else:
+			node_costs = self.get_node_costs(
+				network=network,
+				cost_key=cost_key)
+		modified_render_mode = self.get_render_mode(
 			network=network,
-			layout=layout)
+			render_mode=render_mode)
+		with get_stage(network.instrumentation, "layout"):
+			if (path_to_layout_cache is None) or (layout is None):
+				pos = self.get_pos(
+					network=network,
+					layout=layout)
+			else:
+				pos = self.get_cached_pos(
+					network=network,
+					layout=layout,
+					path_to_layout_cache=path_to_layout_cache)
 		node_color = self.get_node_colors(
 			network=network,
 			top_level_color=top_level_color,
 			common_successor_color=common_successor_color,
 			uncommon_successor_color=uncommon_successor_color,
 			custom_successor_color=custom_successor_color)
-		fig, ax = plt.subplots(
-			figsize=figsize)
-		nx.draw(
-			network.graph,
-			pos=pos,
-			ax=ax,
-			node_color=node_color,
-			edge_color=edge_color,
-			font_weight=font_weight,
-			font_size=self.visual_settings.label_size,
-			with_labels=True,
-			arrows=True)
-		ax = self.autocorrect_scaling(
-			ax=ax,
-			margins=margins)
-		if is_with_legend:
-			fig, ax, leg = self.plot_legend(
-				fig=fig,
+		with get_stage(network.instrumentation, "draw"):
+			fig, ax = plt.subplots(
+				figsize=figsize)
+			if modified_render_mode == "fast":
+				self.draw_graph_fast(
+					ax=ax,
+					network=network,
+					pos=pos,
+					node_color=node_color,
+					edge_color=edge_color,
+					font_weight=font_weight,
+					maximum_number_labels=maximum_number_labels,
+					is_rasterize_edges=is_rasterize_edges,
+					cost_mode=cost_mode,
+					node_costs=node_costs,
+					cost_cmap=cost_cmap)
+			else:
+				self.draw_graph(
+					ax=ax,
+					network=network,
+					pos=pos,
+					node_color=node_color,
+					edge_color=edge_color,
+					font_weight=font_weight,
+					cost_mode=cost_mode,
+					node_costs=node_costs,
+					cost_cmap=cost_cmap)
+			ax = self.autocorrect_scaling(
 				ax=ax,
-				network=network,
-				top_level_color=top_level_color,
-				common_successor_color=common_successor_color,
-				uncommon_successor_color=uncommon_successor_color,
-				custom_successor_color=custom_successor_color,
-				edge_color=edge_color)
+				margins=margins)
+			if is_with_legend and (cost_mode == "color"):
+				fig, ax, colorbar = self.plot_colorbar(
+					fig=fig,
+					ax=ax,
+					node_costs=node_costs,
+					cost_key=cost_key,
+					cost_cmap=cost_cmap)
+			elif is_with_legend:
+				fig, ax, leg = self.plot_legend(
+					fig=fig,
+					ax=ax,
+					network=network,
+					top_level_color=top_level_color,
+					common_successor_color=common_successor_color,
+					uncommon_successor_color=uncommon_successor_color,
+					custom_successor_color=custom_successor_color,
+					edge_color=edge_color)
 		save_name = self.get_save_name(
-			is_save=is_save)
-		self.visual_settings.display_image(
-			fig=fig,
-			save_name=save_name,
-			space_replacement="_")
+			is_save=is_save,
+			network=network)
+		with get_stage(network.instrumentation, "save"):
+			self.visual_settings.display_image(
+				fig=fig,
+				save_name=save_name,
+				dpi=self.get_dpi(
+					number_nodes=network.graph.number_of_nodes(),
+					render_mode=modified_render_mode,
+					dpi=dpi),
+				extension=extension,
+				space_replacement="_")
 
 ##
\ No newline at end of file
@@ -0,0 +1,246 @@
+from graph_core_configuration import CompactGraphConfiguration
+
+
+class BaseReachabilityConfiguration():
+
+	def __init__(self):
+		super().__init__()
+		self._names = None
+		self._indices_at_names = None
+		self._edges = None
+		self._components = None
+		self._membership = None
+		self._descendants = None
+		self._ancestors = None
+		self._number_rebuilds = None
+		self._number_incremental_updates = None
+
+	@property
+	def names(self):
+		return self._names
+
+	@property
+	def indices_at_names(self):
+		return self._indices_at_names
+
+	@property
+	def edges(self):
+		return self._edges
+
+	@property
+	def components(self):
+		return self._components
+
+	@property
+	def membership(self):
+		return self._membership
+
+	@property
+	def number_rebuilds(self):
+		return self._number_rebuilds
+
+	@property
+	def number_incremental_updates(self):
+		return self._number_incremental_updates
+
+	@staticmethod
+	def get_nodes_and_edges(network):
+		## the compact backend is read directly ==> no nx.DiGraph export just to build the index
+		if network.graph_backend == "compact":
+			core = network.core
+			sources, targets = core.get_edge_indices()
+			nodes = list(
+				core.names)
+			edges = [
+				(core.names[source], core.names[target])
+					for source, target in zip(sources.tolist(), targets.tolist())]
+		else:
+			nodes = list(
+				network.graph.nodes())
+			edges = list(
+				network.graph.edges())
+		return nodes, edges
+
+	@staticmethod
+	def get_indices_at_bits(bits):
+		## positions of the set bits, lowest first
+		indices = list()
+		while bits:
+			lowest_bit = bits & -bits
+			indices.append(
+				lowest_bit.bit_length() - 1)
+			bits ^= lowest_bit
+		return indices
+
+	def initialize_closure(self, nodes, edges):
+		## one bit per strongly-connected component; descendants[c] has bit d set iff c reaches d.
+		## Tarjan emits components sinks first ==> every successor is final before its predecessors
+		core = CompactGraphConfiguration(
+			names=nodes,
+			edges=edges)
+		components = core.get_strongly_connected_components()
+		condensation, membership = core.get_condensation(
+			components=components)
+		out_index_pointers = condensation.out_index_pointers.tolist()
+		out_indices = condensation.out_indices.tolist()
+		in_index_pointers = condensation.in_index_pointers.tolist()
+		in_indices = condensation.in_indices.tolist()
+		number_components = len(
+			components)
+		descendants = [0] * number_components
+		for index_at_component in range(number_components):
+			bits = 0
+			for successor in out_indices[out_index_pointers[index_at_component] : out_index_pointers[index_at_component + 1]]:
+				bits |= (1 << successor) | descendants[successor]
+			descendants[index_at_component] = bits
+		ancestors = [0] * number_components
+		for index_at_component in range(number_components - 1, -1, -1):
+			bits = 0
+			for predecessor in in_indices[in_index_pointers[index_at_component] : in_index_pointers[index_at_component + 1]]:
+				bits |= (1 << predecessor) | ancestors[predecessor]
+			ancestors[index_at_component] = bits
+		self._names = list(
+			core.names)
+		self._indices_at_names = dict(
+			core.indices_at_names)
+		self._edges = set(
+			edges)
+		self._components = components
+		self._membership = membership.tolist()
+		self._descendants = descendants
+		self._ancestors = ancestors
+		self._number_rebuilds += 1
+
+	def add_node(self, name):
+		## an isolated node is a component of its own
+		index = len(
+			self.names)
+		self._names.append(
+			name)
+		self._indices_at_names[name] = index
+		self._membership.append(
+			len(self.components))
+		self._components.append(
+			[index])
+		self._descendants.append(
+			0)
+		self._ancestors.append(
+			0)
+
+	def add_edge(self, source, target):
+		## returns False if the edge closes a new cycle, which needs a rebuild
+		source_component = self.membership[self.indices_at_names[source]]
+		target_component = self.membership[self.indices_at_names[target]]
+		self._edges.add(
+			(source, target))
+		if source_component == target_component:
+			return True
+		if (self._descendants[source_component] >> target_component) & 1:
+			return True
+		if (self._descendants[target_component] >> source_component) & 1:
+			return False
+		target_bits = (1 << target_component) | self._descendants[target_component]
+		source_bits = (1 << source_component) | self._ancestors[source_component]
+		for index_at_component in self.get_indices_at_bits(source_bits):
+			self._descendants[index_at_component] |= target_bits
+		for index_at_component in self.get_indices_at_bits(target_bits):
+			self._ancestors[index_at_component] |= source_bits
+		return True
+
+	def update(self, network):
+		## additions are applied to the closure in place; removals (and new cycles) rebuild it
+		nodes, edges = self.get_nodes_and_edges(
+			network=network)
+		edges = set(
+			edges)
+		added_edges = edges - self.edges
+		is_rebuild = (
+			(len(self.edges - edges) > 0) or (len(set(self.names) - set(nodes)) > 0))
+		if not is_rebuild:
+			for name in nodes:
+				if name not in self.indices_at_names:
+					self.add_node(
+						name=name)
+			for source, target in added_edges:
+				if not self.add_edge(source=source, target=target):
+					is_rebuild = True
+					break
+		if is_rebuild:
+			self.initialize_closure(
+				nodes=nodes,
+				edges=edges)
+		else:
+			self._number_incremental_updates += 1
+
+	def get_names_at_bits(self, bits):
+		names = set()
+		for index_at_component in self.get_indices_at_bits(bits):
+			for index in self.components[index_at_component]:
+				names.add(
+					self.names[index])
+		return names
+
+	def get_component_index(self, module_name):
+		if module_name not in self.indices_at_names:
+			raise ValueError("invalid module_name: {}".format(module_name))
+		index_at_component = self.membership[self.indices_at_names[module_name]]
+		return index_at_component
+
+	def descendants(self, module_name):
+		## every module that module_name imports directly or transitively
+		index_at_component = self.get_component_index(
+			module_name=module_name)
+		names = self.get_names_at_bits(
+			self._descendants[index_at_component])
+		if len(self.components[index_at_component]) > 1:
+			## members of an import cycle reach one another
+			names.update(
+				self.names[index]
+					for index in self.components[index_at_component])
+			names.discard(
+				module_name)
+		return names
+
+	def ancestors(self, module_name):
+		## every module that imports module_name directly or transitively
+		index_at_component = self.get_component_index(
+			module_name=module_name)
+		names = self.get_names_at_bits(
+			self._ancestors[index_at_component])
+		if len(self.components[index_at_component]) > 1:
+			names.update(
+				self.names[index]
+					for index in self.components[index_at_component])
+			names.discard(
+				module_name)
+		return names
+
+	def reaches(self, source, target):
+		## True iff target is in descendants(source); O(1) apart from the bit shift
+		source_component = self.get_component_index(
+			module_name=source)
+		target_component = self.get_component_index(
+			module_name=target)
+		if source_component == target_component:
+			return (source != target) and (len(self.components[source_component]) > 1)
+		is_reachable = bool(
+			(self._descendants[source_component] >> target_component) & 1)
+		return is_reachable
+
+class ReachabilityConfiguration(BaseReachabilityConfiguration):
+
+	def __init__(self, network):
+		super().__init__()
+		self._number_rebuilds = 0
+		self._number_incremental_updates = 0
+		nodes, edges = self.get_nodes_and_edges(
+			network=network)
+		self.initialize_closure(
+			nodes=nodes,
+			edges=edges)
+
+	def __repr__(self):
+		reachability = f"ReachabilityConfiguration(number_nodes={len(self.names)}, number_components={len(self.components)})"
+		return reachability
+
+##
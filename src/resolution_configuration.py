@@ -0,0 +1,350 @@
+import os
+import sys
+import sysconfig
+import functools
+
+
+@functools.lru_cache(maxsize=None)
+def get_standard_library_names():
+	## sys.stdlib_module_names exists from python 3.10; older interpreters list the stdlib directory once
+	standard_library_names = getattr(
+		sys,
+		"stdlib_module_names",
+		None)
+	if standard_library_names is None:
+		standard_library_names = set(
+			sys.builtin_module_names)
+		path_to_standard_library = sysconfig.get_paths()["stdlib"]
+		for name in os.listdir(path_to_standard_library):
+			if name.endswith(".py"):
+				standard_library_names.add(
+					name[:-3])
+			elif os.path.isfile(os.path.join(path_to_standard_library, name, "__init__.py")):
+				standard_library_names.add(
+					name)
+	return frozenset(
+		standard_library_names)
+
+
+@functools.lru_cache(maxsize=None)
+def get_distribution_index():
+	## top-level import name ==> distribution names; reading the metadata of every installed
+	## distribution is slow ==> once per process, and importlib.metadata only when it is needed
+	import importlib.metadata
+	distribution_index = {
+		name : tuple(distribution_names)
+			for name, distribution_names in importlib.metadata.packages_distributions().items()}
+	return distribution_index
+
+
+class BaseResolutionConfiguration():
+
+	def __init__(self):
+		super().__init__()
+		self._tree = None
+		self._path_to_directory = None
+		self._source_roots = None
+		self._source_roots_at_directories = None
+		self._module_names_at_paths = None
+		self._paths_at_module_names = None
+		self._package_names = None
+		self._local_names = None
+		self._edges = None
+		self._imported_names_at_paths = None
+		self._external_names = None
+		self._unresolved_names = None
+
+	@property
+	def tree(self):
+		return self._tree
+
+	@property
+	def path_to_directory(self):
+		return self._path_to_directory
+
+	@property
+	def source_roots(self):
+		## None ==> inferred per file, see get_source_root
+		return self._source_roots
+
+	@property
+	def module_names_at_paths(self):
+		return self._module_names_at_paths
+
+	@property
+	def paths_at_module_names(self):
+		return self._paths_at_module_names
+
+	@property
+	def package_names(self):
+		return self._package_names
+
+	@property
+	def local_names(self):
+		return self._local_names
+
+	@property
+	def edges(self):
+		return self._edges
+
+	@property
+	def imported_names_at_paths(self):
+		## path ==> every module name it imports, local or not; a local import is also spelled out in full
+		## ("from a import b" ==> a.b, module or not), so a deleted module still matches its importers.
+		## Keyed by path ==> files that share a module name (e.g. two tests/*/test_models.py) stay apart
+		return self._imported_names_at_paths
+
+	@property
+	def external_names(self):
+		return self._external_names
+
+	@property
+	def unresolved_names(self):
+		return self._unresolved_names
+
+	def initialize_tree(self, tree):
+		if tree.canopy is None:
+			raise ValueError("tree.canopy is not initialized")
+		if not tree.reader_settings["is_qualified"]:
+			raise ValueError("tree was not initialized with is_qualified=True")
+		self._tree = tree
+		self._path_to_directory = os.path.abspath(
+			tree.path_to_directory)
+
+	def initialize_source_roots(self, source_roots=None):
+		## the directories that are on sys.path when the code runs, e.g. ["src", "tests"] for a src layout;
+		## relative paths are relative to the scanned directory
+		if source_roots is not None:
+			if not isinstance(source_roots, (tuple, list)):
+				raise ValueError("invalid type(source_roots): {}".format(type(source_roots)))
+			paths_to_source_roots = list()
+			for source_root in source_roots:
+				if not isinstance(source_root, str):
+					raise ValueError("invalid type(source_root): {}".format(type(source_root)))
+				path_to_source_root = os.path.abspath(
+					os.path.join(
+						self.path_to_directory,
+						source_root))
+				if not os.path.isdir(path_to_source_root):
+					raise ValueError("invalid source_root: {}".format(source_root))
+				paths_to_source_roots.append(
+					path_to_source_root)
+			## longest first ==> a nested root wins over the root that contains it
+			source_roots = sorted(
+				paths_to_source_roots,
+				key=len,
+				reverse=True)
+		self._source_roots = source_roots
+		self._source_roots_at_directories = dict()
+
+	def get_source_root(self, path_to_directory):
+		## the nearest given root that contains the directory; without one, the nearest directory that is
+		## not a package, which is where python finds the top-level package (also above the scanned directory)
+		if path_to_directory not in self._source_roots_at_directories:
+			source_root = None
+			if self.source_roots is not None:
+				for path_to_source_root in self.source_roots:
+					if os.path.commonpath([path_to_source_root, path_to_directory]) == path_to_source_root:
+						source_root = path_to_source_root
+						break
+			if source_root is None:
+				path_to_parent = os.path.dirname(
+					path_to_directory)
+				if os.path.isfile(os.path.join(path_to_directory, "__init__.py")) and (path_to_parent != path_to_directory):
+					source_root = self.get_source_root(
+						path_to_directory=path_to_parent)
+				else:
+					source_root = path_to_directory
+			self._source_roots_at_directories[path_to_directory] = source_root
+		return self._source_roots_at_directories[path_to_directory]
+
+	def get_module_parts(self, path_to_file):
+		## "<root>/a/b/c.py" ==> ["a", "b", "c"]; "<root>/a/b/__init__.py" ==> ["a", "b"]
+		path_to_file = os.path.abspath(
+			path_to_file)
+		relative_path = os.path.relpath(
+			path_to_file,
+			self.get_source_root(
+				path_to_directory=os.path.dirname(
+					path_to_file)))
+		module_parts = relative_path[:-len(".py")].split(
+			os.sep)
+		if module_parts[-1] == "__init__":
+			module_parts.pop()
+		return module_parts
+
+	def initialize_module_index(self):
+		## built once per scan ==> each import resolves with a few dictionary lookups and no filesystem probing
+		paths_to_files = sorted(
+			set(self.tree.qualified_names_at_paths) | set(self.tree.skipped_files))
+		module_names_at_paths = dict()
+		paths_at_module_names = dict()
+		package_names = set()
+		local_names = set()
+		for path_to_file in paths_to_files:
+			module_parts = self.get_module_parts(
+				path_to_file=path_to_file)
+			if len(module_parts) == 0:
+				continue
+			module_name = ".".join(
+				module_parts)
+			module_names_at_paths[path_to_file] = module_name
+			paths_at_module_names[module_name] = path_to_file
+			if os.path.basename(path_to_file) == "__init__.py":
+				package_names.add(
+					module_name)
+			## every enclosing package, including namespace packages without an __init__.py
+			for index in range(1, len(module_parts) + 1):
+				local_names.add(
+					".".join(
+						module_parts[:index]))
+		self._module_names_at_paths = module_names_at_paths
+		self._paths_at_module_names = paths_at_module_names
+		self._package_names = package_names
+		self._local_names = local_names
+
+	def get_absolute_parts(self, importer, qualified_name):
+		## None ==> a relative import that climbs above the top-level package
+		parts = qualified_name.lstrip(
+			".").split(
+				".")
+		if parts == [""]:
+			parts = list()
+		level = len(qualified_name) - len(qualified_name.lstrip("."))
+		if level == 0:
+			return parts
+		package_parts = importer.split(
+			".")
+		if importer not in self.package_names:
+			package_parts.pop()
+		if level - 1 > len(package_parts):
+			return None
+		absolute_parts = package_parts[:len(package_parts) - (level - 1)] + parts
+		return absolute_parts
+
+	def get_category(self, top_level_name):
+		if top_level_name in self.local_names:
+			category = "local"
+		elif top_level_name in get_standard_library_names():
+			category = "stdlib"
+		elif top_level_name in get_distribution_index():
+			category = "installed"
+		else:
+			category = "unknown"
+		return category
+
+	def resolve(self, importer, qualified_name):
+		## returns (category, module name); for local imports the longest prefix that is a file,
+		## e.g. "from a.b import c" names a.b.c if that is a module and a.b otherwise
+		parts = self.get_absolute_parts(
+			importer=importer,
+			qualified_name=qualified_name)
+		if (parts is None) or (len(parts) == 0):
+			return "unknown", qualified_name
+		for index in range(len(parts), 0, -1):
+			module_name = ".".join(
+				parts[:index])
+			if module_name in self.paths_at_module_names:
+				return "local", module_name
+		category = self.get_category(
+			top_level_name=parts[0])
+		if category == "local":
+			## a namespace package or a name missing from the scan
+			module_name = ".".join(
+				parts)
+		else:
+			module_name = parts[0]
+		return category, module_name
+
+	def initialize_edges(self):
+		edges = dict()
+		imported_names_at_paths = dict()
+		external_names = dict()
+		unresolved_names = dict()
+		for path_to_file, qualified_names in self.tree.qualified_names_at_paths.items():
+			importer = self.module_names_at_paths.get(
+				path_to_file)
+			if importer is None:
+				continue
+			successors = set()
+			imported_names = set()
+			names_at_categories = {
+				"stdlib" : set(),
+				"installed" : set(),
+				"unknown" : set()}
+			for qualified_name in qualified_names:
+				category, module_name = self.resolve(
+					importer=importer,
+					qualified_name=qualified_name)
+				imported_names.add(
+					module_name)
+				if category == "local":
+					imported_names.add(
+						".".join(
+							self.get_absolute_parts(
+								importer=importer,
+								qualified_name=qualified_name)))
+					if (module_name != importer) and (module_name in self.paths_at_module_names):
+						successors.add(
+							module_name)
+				else:
+					names_at_categories[category].add(
+						module_name)
+					if category == "unknown":
+						unresolved_names.setdefault(
+							importer,
+							list()).append(
+								qualified_name)
+			edges[importer] = sorted(
+				successors)
+			imported_names_at_paths[path_to_file] = sorted(
+				imported_names)
+			external_names[importer] = {
+				category : sorted(names)
+					for category, names in names_at_categories.items()}
+		self._edges = edges
+		self._imported_names_at_paths = imported_names_at_paths
+		self._external_names = external_names
+		self._unresolved_names = unresolved_names
+
+	def get_graph(self):
+		## module-level edges between local files; unlike network.graph, same-named files in
+		## different packages are different nodes
+		import networkx as nx
+		graph = nx.DiGraph()
+		graph.add_nodes_from(
+			self.edges.keys())
+		for importer, successors in self.edges.items():
+			for successor in successors:
+				graph.add_edge(
+					importer,
+					successor)
+		return graph
+
+class ResolutionConfiguration(BaseResolutionConfiguration):
+
+	def __init__(self, tree, source_roots=None):
+		super().__init__()
+		self.initialize_tree(
+			tree=tree)
+		self.initialize_source_roots(
+			source_roots=source_roots)
+		self.initialize_module_index()
+		self.initialize_edges()
+
+	def __repr__(self):
+		resolution = f"ResolutionConfiguration({self.path_to_directory!r})"
+		return resolution
+
+	def __str__(self):
+		number_edges = sum(
+			len(successors)
+				for successors in self.edges.values())
+		s = "resolution index: {} modules ({} packages), {} module edges, {} modules with unresolved imports".format(
+			len(self.paths_at_module_names),
+			len(self.package_names),
+			number_edges,
+			len(self.unresolved_names))
+		return s
+
+##
@@ -0,0 +1,60 @@
+import argparse
+from tree_configuration import ModuleTreeConfiguration
+from network_configuration import NetworkConfiguration
+
+
+## each "scan" may run on its own host (sharing the filesystem); "merge" runs once all shards exist, e.g.
+## python src/shard_scan.py scan src/ --shard-index 0 --number-shards 4 --output shards/shard_0.json
+## python src/shard_scan.py merge shards/shard_*.json --output output/
+## the merge gives the same tree and report as one scan; --partition directories keeps every top-level
+## directory in one shard, --cache lets a re-run shard re-parse only its changed files
+if __name__ == "__main__":
+
+	parser = argparse.ArgumentParser(
+		description="scan one shard of a code-base, or merge shards into one tree and network")
+	sub_parsers = parser.add_subparsers(
+		dest="command",
+		required=True)
+	scan_parser = sub_parsers.add_parser("scan")
+	scan_parser.add_argument("path_to_directory")
+	scan_parser.add_argument("--shard-index", type=int, required=True)
+	scan_parser.add_argument("--number-shards", type=int, required=True)
+	scan_parser.add_argument("--partition", default="files", choices=("files", "directories"))
+	scan_parser.add_argument("--scan-mode", default="serial", choices=("serial", "process", "thread"))
+	scan_parser.add_argument("--extractor", default="ast", choices=("ast", "tokenize", "mmap"))
+	scan_parser.add_argument("--header-only", action="store_true", help="stop at the first top-level def or class (tokenize and mmap only)")
+	scan_parser.add_argument("--maximum-file-size", type=int, default=None, help="larger files are skipped (bytes)")
+	scan_parser.add_argument("--cache", default=None)
+	scan_parser.add_argument("--output", required=True)
+	merge_parser = sub_parsers.add_parser("merge")
+	merge_parser.add_argument("paths_to_shards", nargs="+")
+	merge_parser.add_argument("--output", required=True, help="directory for module_hierarchy.txt")
+	merge_parser.add_argument("--cycle-mode", default="condense", choices=("raise", "condense"))
+	arguments = parser.parse_args()
+	module_tree = ModuleTreeConfiguration()
+	if arguments.command == "scan":
+		module_tree.initialize_shard(
+			path_to_directory=arguments.path_to_directory,
+			path_to_shard=arguments.output,
+			shard_index=arguments.shard_index,
+			number_shards=arguments.number_shards,
+			partition=arguments.partition,
+			scan_mode=arguments.scan_mode,
+			path_to_cache=arguments.cache,
+			extractor=arguments.extractor,
+			is_header_only=arguments.header_only,
+			maximum_file_size=arguments.maximum_file_size)
+	else:
+		module_tree.initialize_from_shards(
+			paths_to_shards=arguments.paths_to_shards)
+		network = NetworkConfiguration(
+			tree=module_tree,
+			is_include_common=True,
+			is_include_uncommon=True,
+			is_include_custom=True,
+			cycle_mode=arguments.cycle_mode)
+		network.update_save_directory(
+			path_to_save_directory=arguments.output)
+		network.write_module_hierarchy_to_file()
+
+##
@@ -0,0 +1,204 @@
+import os
+import json
+import mmap
+## numpy is imported on first use ==> the module itself stays light
+
+
+class BaseSnapshotConfiguration():
+
+	def __init__(self):
+		super().__init__()
+		self._path_to_snapshot = None
+		self._metadata = None
+		self._sections = None
+		self._buffer = None
+		self._offset_at_data = None
+		self._names = None
+
+	@property
+	def path_to_snapshot(self):
+		return self._path_to_snapshot
+
+	@property
+	def metadata(self):
+		return self._metadata
+
+	@property
+	def sections(self):
+		return self._sections
+
+	@property
+	def names(self):
+		## the interned name table; every array refers to names by their index
+		if self._names is None:
+			blob = bytes(
+				self.get_array(
+					name="names"))
+			self._names = blob.decode(
+				"utf-8").split(
+					"\0") if len(blob) > 0 else list()
+		return self._names
+
+	@property
+	def network_settings(self):
+		## keyword arguments of NetworkConfiguration that reproduce the saved graph
+		if "network" not in self.metadata:
+			raise ValueError("snapshot has no network: {}".format(self.path_to_snapshot))
+		network_settings = dict(
+			self.metadata["network"])
+		return network_settings
+
+	@staticmethod
+	def get_magic():
+		magic = b"MNTSNAP\0"
+		return magic
+
+	@staticmethod
+	def get_snapshot_version():
+		## bump whenever the layout of a section changes
+		snapshot_version = 1
+		return snapshot_version
+
+	@staticmethod
+	def get_interned_index(names, indices_at_names, name):
+		if name not in indices_at_names:
+			indices_at_names[name] = len(names)
+			names.append(
+				name)
+		return indices_at_names[name]
+
+	@staticmethod
+	def get_aligned_size(size, alignment=8):
+		aligned_size = -(-size // alignment) * alignment
+		return aligned_size
+
+	@staticmethod
+	def write(path_to_snapshot, metadata, names, arrays):
+		## layout: magic | header size (u64) | json header | 8-byte aligned sections; little-endian
+		## throughout ==> a snapshot written on one machine is readable on any other
+		import numpy as np
+		sections = {
+			"names" : np.frombuffer(
+				"\0".join(names).encode("utf-8"),
+				dtype="u1")}
+		for name, (dtype, values) in arrays.items():
+			sections[name] = np.ascontiguousarray(
+				values,
+				dtype=dtype)
+		layout = dict()
+		offset = 0
+		for name, values in sections.items():
+			layout[name] = {
+				"offset" : offset,
+				"dtype" : values.dtype.str,
+				"length" : int(values.size)}
+			offset = BaseSnapshotConfiguration.get_aligned_size(
+				offset + values.nbytes)
+		header = json.dumps({
+			"version" : BaseSnapshotConfiguration.get_snapshot_version(),
+			"metadata" : metadata,
+			"sections" : layout}).encode("utf-8")
+		magic = BaseSnapshotConfiguration.get_magic()
+		offset_at_data = BaseSnapshotConfiguration.get_aligned_size(
+			len(magic) + 8 + len(header))
+		path_to_temporary_file = "{}.tmp".format(
+			path_to_snapshot)
+		with open(path_to_temporary_file, "wb") as data_file:
+			data_file.write(
+				magic)
+			data_file.write(
+				len(header).to_bytes(8, "little"))
+			data_file.write(
+				header)
+			for name, values in sections.items():
+				data_file.write(
+					b"\0" * (offset_at_data + layout[name]["offset"] - data_file.tell()))
+				data_file.write(
+					values.tobytes())
+		## atomic replace ==> a reader never maps a half-written snapshot
+		os.replace(
+			path_to_temporary_file,
+			path_to_snapshot)
+
+	def initialize_buffer(self, path_to_snapshot):
+		if not isinstance(path_to_snapshot, str):
+			raise ValueError("invalid type(path_to_snapshot): {}".format(type(path_to_snapshot)))
+		with open(path_to_snapshot, "rb") as data_file:
+			try:
+				## arrays are views into the page cache ==> loading does not copy the sections
+				buffer = mmap.mmap(
+					data_file.fileno(),
+					0,
+					access=mmap.ACCESS_READ)
+			except (ValueError, OSError):
+				## e.g. an empty file or a filesystem without mmap support
+				buffer = data_file.read()
+		magic = self.get_magic()
+		if buffer[:len(magic)] != magic:
+			raise ValueError("invalid snapshot: {}".format(path_to_snapshot))
+		header_size = int.from_bytes(
+			buffer[len(magic) : len(magic) + 8],
+			"little")
+		header = json.loads(
+			bytes(
+				buffer[len(magic) + 8 : len(magic) + 8 + header_size]).decode("utf-8"))
+		if header["version"] != self.get_snapshot_version():
+			raise ValueError("invalid snapshot version: {}".format(header["version"]))
+		self._path_to_snapshot = path_to_snapshot
+		self._metadata = header["metadata"]
+		self._sections = header["sections"]
+		self._buffer = buffer
+		self._offset_at_data = self.get_aligned_size(
+			len(magic) + 8 + header_size)
+
+	def get_array(self, name):
+		import numpy as np
+		if name not in self.sections:
+			raise ValueError("invalid section: {}".format(name))
+		section = self.sections[name]
+		array = np.frombuffer(
+			self._buffer,
+			dtype=np.dtype(section["dtype"]),
+			count=section["length"],
+			offset=self._offset_at_data + section["offset"])
+		return array
+
+	def get_names_at(self, name):
+		## names of an index array, e.g. get_names_at("file_names")
+		names = self.names
+		names_at = [
+			names[index]
+				for index in self.get_array(name=name).tolist()]
+		return names_at
+
+	def get_lists_at(self, name):
+		## a list per row of a CSR pair "<name>_index_pointers" / "<name>_indices"
+		names = self.names
+		index_pointers = self.get_array(
+			name="{}_index_pointers".format(name)).tolist()
+		indices = self.get_array(
+			name="{}_indices".format(name)).tolist()
+		lists = [
+			[names[index] for index in indices[index_pointers[row] : index_pointers[row + 1]]]
+				for row in range(len(index_pointers) - 1)]
+		return lists
+
+class SnapshotConfiguration(BaseSnapshotConfiguration):
+
+	def __init__(self, path_to_snapshot):
+		super().__init__()
+		self.initialize_buffer(
+			path_to_snapshot=path_to_snapshot)
+
+	def __repr__(self):
+		snapshot = f"SnapshotConfiguration({self.path_to_snapshot!r})"
+		return snapshot
+
+	def __str__(self):
+		s = "snapshot: {} names, {} sections, saved from {}".format(
+			len(self.names),
+			len(self.sections),
+			self.metadata.get("path_to_directory"))
+		return s
+
+##
@@ -1,5 +1,76 @@
 import os
+import json
+import time
+import zlib
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from node_visitor_configuration import NodeVisitorConfiguration
+from cache_configuration import ParseCacheConfiguration
+from instrumentation_configuration import InstrumentationConfiguration, get_stage
+
+
+def get_imported_module_names_at_chunk(paths_to_files, extractor="ast", is_time_files=False, reader_settings=None):
+	## module-level so that process-pool workers can unpickle it
+	node_visitor = NodeVisitorConfiguration(
+		extractor=extractor,
+		is_time_files=is_time_files,
+		**(reader_settings or dict()))
+	chunk_of_module_names = list()
+	for path_to_file in paths_to_files:
+		module_names = node_visitor.get_imported_module_names(
+			path_to_file=path_to_file)
+		chunk_of_module_names.append(
+			module_names)
+	return chunk_of_module_names, node_visitor.skipped_files, node_visitor.number_bytes, node_visitor.elapsed_times
+
+
+## one visitor per thread (or process) ==> its per-file state is never shared between parses
+thread_state = threading.local()
+
+
+def read_source(path_to_file):
+	## None ==> unreadable; the parse stage re-reads it so that the error is recorded as usual
+	try:
+		with open(path_to_file, "rb") as f:
+			source = f.read()
+	except OSError:
+		source = None
+	return source
+
+
+def get_imported_module_names_from_source(path_to_file, source, extractor="ast", is_time_files=False, reader_settings=None):
+	## module-level so that process-pool workers can unpickle it
+	node_visitors = getattr(
+		thread_state,
+		"node_visitors",
+		None)
+	if node_visitors is None:
+		node_visitors = dict()
+		thread_state.node_visitors = node_visitors
+	reader_settings = reader_settings or dict()
+	key = (extractor, is_time_files, tuple(sorted(reader_settings.items())))
+	if key not in node_visitors:
+		node_visitors[key] = NodeVisitorConfiguration(
+			extractor=extractor,
+			is_time_files=is_time_files,
+			**reader_settings)
+	node_visitor = node_visitors[key]
+	number_bytes = node_visitor.number_bytes
+	module_names = node_visitor.get_imported_module_names(
+		path_to_file=path_to_file,
+		source=source)
+	skipped_files = dict()
+	if module_names is None:
+		skipped_files[path_to_file] = node_visitor.skipped_files.pop(
+			path_to_file)
+	if is_time_files:
+		elapsed_times = {
+			path_to_file : node_visitor.elapsed_times.pop(
+				path_to_file)}
+	else:
+		elapsed_times = None
+	return module_names, skipped_files, node_visitor.number_bytes - number_bytes, elapsed_times
 
 
 class BaseModuleTreeConfiguration():
@@ -11,6 +82,17 @@ class BaseModuleTreeConfiguration():
 		self._import_names = None
 		self._branches = None
 		self._canopy = None
+		self._importers = None
+		self._parse_cache = None
+		self._import_name_counts = None
+		self._extractor = None
+		self._skipped_files = None
+		self._instrumentation = None
+		self._paths_at_file_names = None
+		self._reader_settings = None
+		self._qualified_names_at_paths = None
+		self._identities_at_paths = None
+		self._snapshot = None
 
 	@property
 	def path_to_directory(self):
@@ -26,16 +108,87 @@ class BaseModuleTreeConfiguration():
 
 	@property
 	def branches(self):
+		if self._branches is None:
+			self.initialize_branches_from_snapshot()
 		return self._branches
 
 	@property
 	def canopy(self):
+		if self._branches is None:
+			self.initialize_branches_from_snapshot()
 		return self._canopy
 
-	def pre_initialize(self, path_to_directory):
+	@property
+	def importers(self):
+		if self._branches is None:
+			self.initialize_branches_from_snapshot()
+		return self._importers
+
+	@property
+	def parse_cache(self):
+		return self._parse_cache
+
+	@property
+	def extractor(self):
+		return self._extractor
+
+	@property
+	def reader_settings(self):
+		## keyword arguments of every NodeVisitorConfiguration of this scan
+		return self._reader_settings
+
+	@property
+	def qualified_names_at_paths(self):
+		## filled only if reader_settings["is_qualified"]; see ResolutionConfiguration
+		if self._branches is None:
+			self.initialize_branches_from_snapshot()
+		return self._qualified_names_at_paths
+
+	@property
+	def snapshot(self):
+		## the SnapshotConfiguration this tree was loaded from; None once the tree changes
+		return self._snapshot
+
+	@property
+	def skipped_files(self):
+		return self._skipped_files
+
+	@property
+	def instrumentation(self):
+		return self._instrumentation
+
+	@property
+	def paths_at_file_names(self):
+		return self._paths_at_file_names
+
+	@property
+	def identities_at_paths(self):
+		## (st_mtime_ns, st_size) of every scanned file, taken before its read
+		return self._identities_at_paths
+
+	@property
+	def is_time_files(self):
+		return (self.instrumentation is not None) and (self.instrumentation.number_slowest_files > 0)
+
+	def pre_initialize(self, path_to_directory, extractor="ast", is_header_only=False, maximum_file_size=None, maximum_parse_time=None, is_qualified=False):
 		if path_to_directory is not None:
 			if not isinstance(path_to_directory, str):
 				raise ValueError("invalid type(path_to_directory): {}".format(type(path_to_directory)))
+		extractors = (
+			"ast",
+			"tokenize",
+			"mmap")
+		if extractor not in extractors:
+			raise ValueError("invalid extractor: {}".format(extractor))
+		reader_settings = {
+			"is_header_only" : is_header_only,
+			"maximum_file_size" : maximum_file_size,
+			"maximum_parse_time" : maximum_parse_time,
+			"is_qualified" : is_qualified}
+		## validated here ==> a bad setting fails before any worker starts
+		NodeVisitorConfiguration(
+			extractor=extractor,
+			**reader_settings)
 		pre_selected_import_names = {
 			"common" : tuple([
 				"os",
@@ -66,11 +219,289 @@ class BaseModuleTreeConfiguration():
 		self._pre_selected_import_names = pre_selected_import_names
 		self._import_names = import_names
 		self._branches = branches
+		self._import_name_counts = None
+		self._extractor = extractor
+		self._reader_settings = reader_settings
+		self._qualified_names_at_paths = dict()
+		self._identities_at_paths = dict()
+		self._snapshot = None
+		self._skipped_files = dict()
+		self._paths_at_file_names = dict()
+
+	def initialize_parse_cache(self, path_to_cache=None, is_hash_content=False, maximum_number_cache_entries=None):
+		if path_to_cache is None:
+			parse_cache = None
+		else:
+			parse_cache = ParseCacheConfiguration(
+				path_to_cache=path_to_cache,
+				parser_signature=NodeVisitorConfiguration.get_parser_signature(
+					extractor=self.extractor,
+					is_header_only=self.reader_settings["is_header_only"],
+					is_qualified=self.reader_settings["is_qualified"]),
+				pre_selected_import_names=self.pre_selected_import_names,
+				is_hash_content=is_hash_content,
+				maximum_number_entries=maximum_number_cache_entries)
+		self._parse_cache = parse_cache
+
+	def initialize_instrumentation(self, instrumentation=None):
+		if (instrumentation is not None) and (not isinstance(instrumentation, InstrumentationConfiguration)):
+			raise ValueError("invalid type(instrumentation): {}".format(type(instrumentation)))
+		self._instrumentation = instrumentation
+
+	def update_parse_statistics(self, skipped_files, number_bytes, elapsed_times):
+		self._skipped_files.update(
+			skipped_files)
+		if self.instrumentation is not None:
+			self._instrumentation.update_counter(
+				name="number_bytes",
+				value=number_bytes)
+			if elapsed_times is not None:
+				self._instrumentation.update_slowest_files(
+					elapsed_times=elapsed_times)
+
+	@staticmethod
+	def get_paths_to_files(path_to_directory, extension=".py"):
+		paths_to_files = list()
+		for path_to_selected_directory, sub_directory_names, file_names in os.walk(path_to_directory):
+			## sorted walk ==> same file order for every scan mode
+			sub_directory_names.sort()
+			for file_name in sorted(file_names):
+				if file_name.endswith(extension):
+					path_to_file = os.path.join(
+						path_to_selected_directory,
+						file_name)
+					paths_to_files.append(
+						(path_to_file, file_name))
+		return paths_to_files
+
+	@staticmethod
+	def get_chunks(data, chunk_size):
+		chunks = [
+			data[index : index + chunk_size]
+				for index in range(
+					0,
+					len(data),
+					chunk_size)]
+		return chunks
+
+	@staticmethod
+	def get_top_level_names(qualified_names):
+		## "a.b.c" ==> "a"; relative imports are dropped, like the top-level extractors do
+		top_level_names = sorted({
+			qualified_name.split(".")[0]
+				for qualified_name in qualified_names
+					if not qualified_name.startswith(".")})
+		return top_level_names
+
+	def update_qualified_names(self, path_to_file, module_names):
+		if self.reader_settings["is_qualified"]:
+			if module_names is None:
+				self._qualified_names_at_paths.pop(
+					path_to_file,
+					None)
+			else:
+				self._qualified_names_at_paths[path_to_file] = module_names
 
 	def grow_branches(self, path_to_file, file_name):
-		node_visitor = NodeVisitorConfiguration()
+		node_visitor = NodeVisitorConfiguration(
+			extractor=self.extractor,
+			**self.reader_settings)
 		module_names = node_visitor.get_imported_module_names(
 			path_to_file=path_to_file)
+		self.update_qualified_names(
+			path_to_file=path_to_file,
+			module_names=module_names)
+		if module_names is None:
+			self._skipped_files.update(
+				node_visitor.skipped_files)
+		else:
+			self.grow_branch_from_module_names(
+				file_name=file_name,
+				module_names=module_names)
+
+	def get_module_names_in_parallel(self, paths_to_files, scan_mode, number_workers=None, chunk_size=None):
+		executor_mapping = {
+			"process" : ProcessPoolExecutor,
+			"thread" : ThreadPoolExecutor}
+		if scan_mode not in executor_mapping.keys():
+			raise ValueError("invalid scan_mode: {}".format(scan_mode))
+		if number_workers is None:
+			modified_number_workers = os.cpu_count() or 1
+		else:
+			if not isinstance(number_workers, int):
+				raise ValueError("invalid type(number_workers): {}".format(type(number_workers)))
+			if number_workers <= 0:
+				raise ValueError("invalid number_workers: {}".format(number_workers))
+			modified_number_workers = int(
+				number_workers)
+		number_files = len(
+			paths_to_files)
+		if chunk_size is None:
+			## a few chunks per worker keeps the pool busy without paying per-file overhead
+			modified_chunk_size = max(
+				1,
+				-(-number_files // (modified_number_workers * 4)))
+		else:
+			if not isinstance(chunk_size, int):
+				raise ValueError("invalid type(chunk_size): {}".format(type(chunk_size)))
+			if chunk_size <= 0:
+				raise ValueError("invalid chunk_size: {}".format(chunk_size))
+			modified_chunk_size = int(
+				chunk_size)
+		chunks = self.get_chunks(
+			data=[path_to_file for path_to_file, file_name in paths_to_files],
+			chunk_size=modified_chunk_size)
+		selected_executor = executor_mapping[scan_mode]
+		with selected_executor(max_workers=modified_number_workers) as executor:
+			## executor.map yields chunks in submission order ==> deterministic merge
+			results = list(
+				executor.map(
+					get_imported_module_names_at_chunk,
+					chunks,
+					[self.extractor] * len(chunks),
+					[self.is_time_files] * len(chunks),
+					[self.reader_settings] * len(chunks)))
+		module_names_per_file = list()
+		for chunk_of_module_names, skipped_files, number_bytes, elapsed_times in results:
+			module_names_per_file.extend(
+				chunk_of_module_names)
+			self.update_parse_statistics(
+				skipped_files=skipped_files,
+				number_bytes=number_bytes,
+				elapsed_times=elapsed_times)
+		return module_names_per_file
+
+	def get_module_names_per_file(self, paths_to_files, scan_mode, number_workers=None, chunk_size=None):
+		if scan_mode == "serial":
+			module_names_per_file, skipped_files, number_bytes, elapsed_times = get_imported_module_names_at_chunk(
+				paths_to_files=[path_to_file for path_to_file, file_name in paths_to_files],
+				extractor=self.extractor,
+				is_time_files=self.is_time_files,
+				reader_settings=self.reader_settings)
+			self.update_parse_statistics(
+				skipped_files=skipped_files,
+				number_bytes=number_bytes,
+				elapsed_times=elapsed_times)
+		else:
+			module_names_per_file = self.get_module_names_in_parallel(
+				paths_to_files=paths_to_files,
+				scan_mode=scan_mode,
+				number_workers=number_workers,
+				chunk_size=chunk_size)
+		return module_names_per_file
+
+	def get_identity(self, path_to_file):
+		## see ParseCacheConfiguration.get_identity; None ==> the file vanished since the walk
+		try:
+			identity = ParseCacheConfiguration.get_identity(
+				path_to_file)
+		except OSError:
+			identity = None
+		return identity
+
+	def update_identity(self, path_to_file, identity):
+		if identity is None:
+			self._identities_at_paths.pop(
+				path_to_file,
+				None)
+		else:
+			self._identities_at_paths[path_to_file] = (identity["mtime_ns"], identity["size"])
+
+	def get_module_names_from_paths(self, paths_to_files, scan_mode, number_workers=None, chunk_size=None):
+		identities = [
+			self.get_identity(
+				path_to_file=path_to_file)
+					for path_to_file, file_name in paths_to_files]
+		for (path_to_file, file_name), identity in zip(paths_to_files, identities):
+			self.update_identity(
+				path_to_file=path_to_file,
+				identity=identity)
+		if self.parse_cache is None:
+			module_names_per_file = [
+				None
+					for _ in paths_to_files]
+		else:
+			module_names_per_file = [
+				self.parse_cache.get_module_names(
+					path_to_file=path_to_file,
+					identity=identity)
+						for (path_to_file, file_name), identity in zip(paths_to_files, identities)]
+		## only files missing from the cache are parsed
+		indices_at_misses = [
+			index_at_file
+				for index_at_file, module_names in enumerate(module_names_per_file)
+					if module_names is None]
+		paths_to_missed_files = [
+			paths_to_files[index_at_file]
+				for index_at_file in indices_at_misses]
+		if self.parse_cache is not None:
+			## the content hash of a miss is taken before the parse, like its stat
+			for index_at_file in indices_at_misses:
+				if identities[index_at_file] is not None:
+					self._parse_cache.update_content_hash(
+						path_to_file=paths_to_files[index_at_file][0],
+						identity=identities[index_at_file])
+		if self.instrumentation is not None:
+			self._instrumentation.update_counter(
+				name="number_files",
+				value=len(paths_to_files))
+			self._instrumentation.update_counter(
+				name="number_parsed_files",
+				value=len(paths_to_missed_files))
+		if len(paths_to_missed_files) > 0:
+			module_names_per_missed_file = self.get_module_names_per_file(
+				paths_to_files=paths_to_missed_files,
+				scan_mode=scan_mode,
+				number_workers=number_workers,
+				chunk_size=chunk_size)
+			for index_at_file, module_names in zip(indices_at_misses, module_names_per_missed_file):
+				module_names_per_file[index_at_file] = module_names
+				## skipped files (module_names is None) are retried on the next run
+				if (self.parse_cache is not None) and (module_names is not None) and (identities[index_at_file] is not None):
+					path_to_file, file_name = paths_to_files[index_at_file]
+					self._parse_cache.update_module_names(
+						path_to_file=path_to_file,
+						module_names=module_names,
+						identity=identities[index_at_file])
+		if self.parse_cache is not None:
+			self._parse_cache.save()
+		return module_names_per_file
+
+	def grow_branches_from_paths(self, paths_to_files, scan_mode, number_workers=None, chunk_size=None):
+		module_names_per_file = self.get_module_names_from_paths(
+			paths_to_files=paths_to_files,
+			scan_mode=scan_mode,
+			number_workers=number_workers,
+			chunk_size=chunk_size)
+		self.grow_branches_from_module_names_per_file(
+			paths_to_files=paths_to_files,
+			module_names_per_file=module_names_per_file)
+
+	def grow_branches_from_module_names_per_file(self, paths_to_files, module_names_per_file):
+		for (path_to_file, file_name), module_names in zip(paths_to_files, module_names_per_file):
+			self._paths_at_file_names[file_name] = path_to_file
+			self.update_qualified_names(
+				path_to_file=path_to_file,
+				module_names=module_names)
+			if module_names is not None:
+				self.grow_branch_from_module_names(
+					file_name=file_name,
+					module_names=module_names)
+		if self.instrumentation is not None:
+			self._instrumentation.update_counter(
+				name="number_imports",
+				value=sum(
+					len(module_names)
+						for module_names in module_names_per_file
+							if module_names is not None))
+			self._instrumentation.update_counter(
+				name="number_skipped_files",
+				value=module_names_per_file.count(None))
+
+	def grow_branch_from_module_names(self, file_name, module_names):
+		if self.reader_settings["is_qualified"]:
+			module_names = self.get_top_level_names(
+				qualified_names=module_names)
 		branch = {
 			"common" : list(),
 			"uncommon" : list(),
@@ -89,52 +520,611 @@ class BaseModuleTreeConfiguration():
 		self._branches[file_name] = branch
 
 	def initialize_canopy(self):
-		
-		def replace_sets_with_lists(data):
-			for key, value in data.items():
-				if isinstance(value, set):
-					modified_value = list(
-						value)
-					data[key] = modified_value
-				elif isinstance(value, data):
-					replace_sets_with_lists(
-						data=value)
-				elif not isinstance(value, list):
-					raise ValueError("invalid type(value): {}".format(type(value)))
-			return data
-
-		extension = ".py"
-		module_names = tuple(
-			list(
-				self.import_names["custom"]))
+		## one pass over every (file, import) pair; importers is the inverted index
+		## from an imported module name to the canopy keys of the files that import it
 		canopy = dict()
-		for module_name in module_names:
-			for file_name_with_extension, imported_module_names in self.branches.items():
-				file_name = file_name_with_extension.replace(
-					".py",
-					"")
-				if file_name not in canopy.keys():
-					canopy[file_name] = set()
-				common_names = imported_module_names["common"]
-				uncommon_names = imported_module_names["uncommon"]
-				custom_names = imported_module_names["custom"]
-				if custom_names is not None:
-					for custom_name in custom_names:
-						if module_name == custom_name:
-							canopy[file_name].add(
-								custom_name)
-				if common_names is not None:
-					canopy[file_name].update(
-						common_names)
-				if uncommon_names is not None:
-					canopy[file_name].update(
-						uncommon_names)
-
-		canopy = replace_sets_with_lists(
-			data=canopy)
-		canopy = self.replace_empty_list_with_none(
-			data=canopy)
+		importers = dict()
+		## no custom modules ==> empty canopy
+		if len(self.import_names["custom"]) > 0:
+			for file_name, branch in self.branches.items():
+				canopy_key = self.get_canopy_key(
+					file_name=file_name)
+				leaves = self.get_leaves(
+					branch=branch)
+				if leaves is not None:
+					for leaf in leaves:
+						if leaf in importers:
+							importers[leaf].add(
+								canopy_key)
+						else:
+							importers[leaf] = {canopy_key}
+				canopy[canopy_key] = leaves
 		self._canopy = canopy
+		self._importers = importers
+
+	@staticmethod
+	def get_canopy_key(file_name):
+		canopy_key = file_name.replace(
+			".py",
+			"")
+		return canopy_key
+
+	@staticmethod
+	def get_leaves(branch):
+		## one canopy entry ==> every module imported by a single trimmed branch
+		leaves = set()
+		for key in ("custom", "common", "uncommon"):
+			if branch[key] is not None:
+				leaves.update(
+					branch[key])
+		if len(leaves) == 0:
+			leaves = None
+		else:
+			leaves = list(
+				leaves)
+		return leaves
+
+	def initialize_import_name_counts(self):
+		import_name_counts = {
+			key : dict()
+				for key in self.import_names.keys()}
+		for branch in self.branches.values():
+			for key, module_names in branch.items():
+				if module_names is not None:
+					for module_name in module_names:
+						import_name_counts[key][module_name] = import_name_counts[key].get(module_name, 0) + 1
+		self._import_name_counts = import_name_counts
+
+	def update_branches(self, paths_to_changed_files, paths_to_removed_files):
+		## re-parses only the given files; returns the canopy keys of touched files
+		## and the module names whose membership in import_names changed
+		self.initialize_branches_from_snapshot()
+		self._snapshot = None
+		if self._import_name_counts is None:
+			self.initialize_import_name_counts()
+		previous_number_custom_names = len(
+			self.import_names["custom"])
+		touched_names = set()
+		canopy_keys = set()
+		for path_to_file, file_name in paths_to_removed_files:
+			if self._paths_at_file_names.get(file_name) == path_to_file:
+				del self._paths_at_file_names[file_name]
+			self._qualified_names_at_paths.pop(
+				path_to_file,
+				None)
+			self._identities_at_paths.pop(
+				path_to_file,
+				None)
+		for path_to_file, file_name in paths_to_changed_files:
+			self._paths_at_file_names[file_name] = path_to_file
+		for path_to_file, file_name in list(paths_to_changed_files) + list(paths_to_removed_files):
+			self._skipped_files.pop(
+				path_to_file,
+				None)
+			canopy_keys.add(
+				self.get_canopy_key(
+					file_name=file_name))
+			branch = self._branches.pop(
+				file_name,
+				None)
+			if branch is not None:
+				for key, module_names in branch.items():
+					if module_names is not None:
+						for module_name in module_names:
+							self._import_name_counts[key][module_name] -= 1
+							touched_names.add(
+								(key, module_name))
+		previous_membership = {
+			(key, module_name) : (module_name in self.import_names[key])
+				for key, module_name in touched_names}
+		module_names_per_file = self.get_module_names_from_paths(
+			paths_to_files=paths_to_changed_files,
+			scan_mode="serial")
+		for (path_to_file, file_name), module_names in zip(paths_to_changed_files, module_names_per_file):
+			self.update_qualified_names(
+				path_to_file=path_to_file,
+				module_names=module_names)
+			if module_names is None:
+				continue
+			self.grow_branch_from_module_names(
+				file_name=file_name,
+				module_names=module_names)
+			branch = self.replace_empty_list_with_none(
+				data=self._branches[file_name])
+			for key, module_names in branch.items():
+				if module_names is not None:
+					for module_name in module_names:
+						if (key, module_name) not in previous_membership:
+							## grow_branch_from_module_names already added it to import_names
+							previous_membership[(key, module_name)] = (self._import_name_counts[key].get(module_name, 0) > 0)
+						self._import_name_counts[key][module_name] = self._import_name_counts[key].get(module_name, 0) + 1
+		changed_import_names = set()
+		for (key, module_name), is_previous_member in previous_membership.items():
+			is_member = (self._import_name_counts[key].get(module_name, 0) > 0)
+			if not is_member:
+				self._import_name_counts[key].pop(
+					module_name,
+					None)
+				self._import_names[key].discard(
+					module_name)
+			if is_member != is_previous_member:
+				changed_import_names.add(
+					module_name)
+		number_custom_names = len(
+			self.import_names["custom"])
+		if (previous_number_custom_names == 0) != (number_custom_names == 0):
+			## the canopy is empty whenever there are no custom modules
+			self.initialize_canopy()
+		elif number_custom_names > 0:
+			for canopy_key in canopy_keys:
+				leaves = self._canopy.pop(
+					canopy_key,
+					None)
+				if leaves is not None:
+					for leaf in leaves:
+						self._importers[leaf].discard(
+							canopy_key)
+						if len(self.importers[leaf]) == 0:
+							del self._importers[leaf]
+			for path_to_file, file_name in paths_to_changed_files:
+				if file_name in self.branches:
+					canopy_key = self.get_canopy_key(
+						file_name=file_name)
+					leaves = self.get_leaves(
+						branch=self.branches[file_name])
+					if leaves is not None:
+						for leaf in leaves:
+							if leaf in self.importers:
+								self._importers[leaf].add(
+									canopy_key)
+							else:
+								self._importers[leaf] = {canopy_key}
+					self._canopy[canopy_key] = leaves
+		return canopy_keys, changed_import_names
+
+	async def get_module_names_from_source(self, path_to_file, source, executor):
+		## the parse stage of get_module_names_in_pipeline
+		loop = asyncio.get_running_loop()
+		module_names, skipped_files, number_bytes, elapsed_times = await loop.run_in_executor(
+			executor,
+			get_imported_module_names_from_source,
+			path_to_file,
+			source,
+			self.extractor,
+			self.is_time_files,
+			self.reader_settings)
+		self.update_parse_statistics(
+			skipped_files=skipped_files,
+			number_bytes=number_bytes,
+			elapsed_times=elapsed_times)
+		return module_names
+
+	async def get_module_names_in_pipeline(self, path_to_directory, scan_mode="thread", number_readers=16, number_parsers=None, queue_size=64):
+		## walk ==> read ==> parse ==> aggregate, connected by bounded queues; a full queue blocks the
+		## stage before it ==> at most about queue_size + number_readers + number_parsers sources in memory
+		scan_modes = (
+			"thread",
+			"process")
+		if scan_mode not in scan_modes:
+			raise ValueError("invalid scan_mode: {}".format(scan_mode))
+		for name, value in (("number_readers", number_readers), ("queue_size", queue_size)):
+			if not isinstance(value, int):
+				raise ValueError("invalid type({}): {}".format(name, type(value)))
+			if value <= 0:
+				raise ValueError("invalid {}: {}".format(name, value))
+		if number_parsers is None:
+			modified_number_parsers = os.cpu_count() or 1
+		else:
+			if not isinstance(number_parsers, int):
+				raise ValueError("invalid type(number_parsers): {}".format(type(number_parsers)))
+			if number_parsers <= 0:
+				raise ValueError("invalid number_parsers: {}".format(number_parsers))
+			modified_number_parsers = int(
+				number_parsers)
+		loop = asyncio.get_running_loop()
+		path_queue = asyncio.Queue(
+			maxsize=queue_size)
+		source_queue = asyncio.Queue(
+			maxsize=queue_size)
+		paths_to_files = list()
+		module_names_per_file = dict()
+		paths_to_missed_files = dict()
+		cache_lock = threading.Lock()
+		stop_event = threading.Event()
+
+		def walk():
+			## runs in a thread ==> the walk overlaps with reading and parsing
+			for path_to_file, file_name in self.get_paths_to_files(
+				path_to_directory=path_to_directory):
+				if stop_event.is_set():
+					return
+				asyncio.run_coroutine_threadsafe(
+					path_queue.put((len(paths_to_files), path_to_file, file_name)),
+					loop).result()
+				paths_to_files.append(
+					(path_to_file, file_name))
+
+		def look_up(path_to_file):
+			## runs in a thread ==> the stat and the content hash never block the event loop
+			identity = self.get_identity(
+				path_to_file=path_to_file)
+			module_names = None
+			if self.parse_cache is not None:
+				with cache_lock:
+					module_names = self._parse_cache.get_module_names(
+						path_to_file=path_to_file,
+						identity=identity)
+				if (module_names is None) and (identity is not None):
+					self._parse_cache.update_content_hash(
+						path_to_file=path_to_file,
+						identity=identity)
+			return identity, module_names
+
+		async def read(io_executor):
+			while True:
+				item = await path_queue.get()
+				if item is None:
+					path_queue.task_done()
+					return
+				index_at_file, path_to_file, file_name = item
+				identity, module_names = await loop.run_in_executor(
+					io_executor,
+					look_up,
+					path_to_file)
+				self.update_identity(
+					path_to_file=path_to_file,
+					identity=identity)
+				if module_names is None:
+					source = await loop.run_in_executor(
+						io_executor,
+						read_source,
+						path_to_file)
+					paths_to_missed_files[index_at_file] = (path_to_file, file_name)
+					await source_queue.put(
+						(index_at_file, path_to_file, source, identity))
+				else:
+					module_names_per_file[index_at_file] = module_names
+				path_queue.task_done()
+
+		async def parse(parse_executor):
+			while True:
+				item = await source_queue.get()
+				if item is None:
+					source_queue.task_done()
+					return
+				index_at_file, path_to_file, source, identity = item
+				module_names = await self.get_module_names_from_source(
+					path_to_file=path_to_file,
+					source=source,
+					executor=parse_executor)
+				module_names_per_file[index_at_file] = module_names
+				## skipped files (module_names is None) are retried on the next run
+				if (self.parse_cache is not None) and (module_names is not None) and (identity is not None):
+					self._parse_cache.update_module_names(
+						path_to_file=path_to_file,
+						module_names=module_names,
+						identity=identity)
+				source_queue.task_done()
+
+		executor_mapping = {
+			"process" : ProcessPoolExecutor,
+			"thread" : ThreadPoolExecutor}
+		with ThreadPoolExecutor(max_workers=number_readers + 1) as io_executor, executor_mapping[scan_mode](max_workers=modified_number_parsers) as parse_executor:
+			readers = [
+				asyncio.ensure_future(
+					read(
+						io_executor=io_executor))
+					for _ in range(number_readers)]
+			parsers = [
+				asyncio.ensure_future(
+					parse(
+						parse_executor=parse_executor))
+					for _ in range(modified_number_parsers)]
+
+			async def close_stages():
+				await loop.run_in_executor(
+					io_executor,
+					walk)
+				for _ in readers:
+					await path_queue.put(
+						None)
+				await asyncio.gather(
+					*readers)
+				for _ in parsers:
+					await source_queue.put(
+						None)
+				await asyncio.gather(
+					*parsers)
+
+			tasks = readers + parsers + [
+				asyncio.ensure_future(
+					close_stages())]
+			## the first failure in any stage (e.g. BrokenProcessPool in a parser) stops all of them; a
+			## reader blocked on a full source_queue or a walk blocked on a full path_queue would wait forever
+			done, pending = await asyncio.wait(
+				tasks,
+				return_when=asyncio.FIRST_EXCEPTION)
+			if len(pending) > 0:
+				stop_event.set()
+				for task in pending:
+					task.cancel()
+				while not path_queue.empty():
+					path_queue.get_nowait()
+				await asyncio.gather(
+					*pending,
+					return_exceptions=True)
+			for task in done:
+				if task.exception() is not None:
+					raise task.exception()
+		if self.instrumentation is not None:
+			self._instrumentation.update_counter(
+				name="number_files",
+				value=len(paths_to_files))
+			self._instrumentation.update_counter(
+				name="number_parsed_files",
+				value=len(paths_to_missed_files))
+		if self.parse_cache is not None:
+			self._parse_cache.save()
+		## aggregation in walk order ==> the same tree as a serial scan
+		module_names_per_file = [
+			module_names_per_file[index_at_file]
+				for index_at_file in range(len(paths_to_files))]
+		return paths_to_files, module_names_per_file
+
+	@staticmethod
+	def get_shard_version():
+		## bump whenever the layout of a shard file changes
+		shard_version = 3
+		return shard_version
+
+	@staticmethod
+	def get_indices_at_shard(paths_to_files, path_to_directory, shard_index, number_shards, partition="files"):
+		## "files" ==> contiguous slices of the walk; "directories" ==> every top-level directory
+		## goes to one shard, chosen by a hash that is the same on every host
+		if not isinstance(number_shards, int):
+			raise ValueError("invalid type(number_shards): {}".format(type(number_shards)))
+		if number_shards <= 0:
+			raise ValueError("invalid number_shards: {}".format(number_shards))
+		if not isinstance(shard_index, int):
+			raise ValueError("invalid type(shard_index): {}".format(type(shard_index)))
+		if not (0 <= shard_index < number_shards):
+			raise ValueError("invalid shard_index: {}".format(shard_index))
+		number_files = len(
+			paths_to_files)
+		if partition == "files":
+			start = (number_files * shard_index) // number_shards
+			stop = (number_files * (shard_index + 1)) // number_shards
+			indices = list(
+				range(start, stop))
+		elif partition == "directories":
+			indices = list()
+			for index_at_file, (path_to_file, file_name) in enumerate(paths_to_files):
+				top_level_name = os.path.relpath(
+					path_to_file,
+					path_to_directory).split(
+						os.sep)[0]
+				if zlib.crc32(top_level_name.encode("utf-8")) % number_shards == shard_index:
+					indices.append(
+						index_at_file)
+		else:
+			raise ValueError("invalid partition: {}".format(partition))
+		return indices
+
+	def get_shard(self, paths_to_files, indices, module_names_per_file, shard_index, number_shards, partition):
+		## files keep their index in the full walk ==> the merge replays them in single-scan order
+		shard = {
+			"version" : self.get_shard_version(),
+			"extractor" : self.extractor,
+			"reader_settings" : self.reader_settings,
+			"parser_signature" : NodeVisitorConfiguration.get_parser_signature(
+				extractor=self.extractor,
+				is_header_only=self.reader_settings["is_header_only"],
+				is_qualified=self.reader_settings["is_qualified"]),
+			"pre_selected_import_names" : {
+				key : list(value)
+					for key, value in self.pre_selected_import_names.items()},
+			"path_to_directory" : self.path_to_directory,
+			"shard_index" : shard_index,
+			"number_shards" : number_shards,
+			"partition" : partition,
+			"number_files" : len(paths_to_files),
+			"files" : [
+				[index_at_file, paths_to_files[index_at_file][0], paths_to_files[index_at_file][1], module_names]
+					for index_at_file, module_names in zip(indices, module_names_per_file)],
+			"identities_at_paths" : [
+				[path_to_file, mtime_ns, size]
+					for path_to_file, (mtime_ns, size) in self.identities_at_paths.items()],
+			"skipped_files" : self.skipped_files}
+		return shard
+
+	@staticmethod
+	def write_shard(shard, path_to_shard):
+		path_to_temporary_file = "{}.tmp".format(
+			path_to_shard)
+		with open(path_to_temporary_file, "w") as data_file:
+			json.dump(
+				shard,
+				data_file)
+		## atomic replace ==> the merge never reads a half-written shard from a shared filesystem
+		os.replace(
+			path_to_temporary_file,
+			path_to_shard)
+
+	@staticmethod
+	def read_shards(paths_to_shards):
+		shards = list()
+		for path_to_shard in paths_to_shards:
+			with open(path_to_shard, "r") as data_file:
+				shards.append(
+					json.load(
+						data_file))
+		if len(shards) == 0:
+			raise ValueError("invalid paths_to_shards: no shards given")
+		return shards
+
+	def verify_shards(self, shards):
+		## every shard must come from the same walk, parser and rules, and together cover each file once
+		reference = shards[0]
+		for shard in shards:
+			if shard["version"] != self.get_shard_version():
+				raise ValueError("invalid shard version: {}".format(shard["version"]))
+		for key in ("extractor", "reader_settings", "parser_signature", "pre_selected_import_names", "path_to_directory", "number_shards", "partition", "number_files"):
+			for shard in shards[1:]:
+				if shard[key] != reference[key]:
+					raise ValueError("shards disagree on {}: {} != {}".format(key, shard[key], reference[key]))
+		shard_indices = sorted(
+			shard["shard_index"]
+				for shard in shards)
+		if shard_indices != list(range(reference["number_shards"])):
+			raise ValueError("invalid shard indices: {} (expected 0 ... {})".format(shard_indices, reference["number_shards"] - 1))
+		indices = sorted(
+			index_at_file
+				for shard in shards
+					for index_at_file, path_to_file, file_name, module_names in shard["files"])
+		if indices != list(range(reference["number_files"])):
+			raise ValueError("shards do not cover each of the {} files exactly once".format(reference["number_files"]))
+
+	def get_snapshot_data(self):
+		## returns (metadata, names, indices_at_names, arrays) for SnapshotConfiguration.write;
+		## every string is interned once and the per-file lists are CSR index arrays
+		from snapshot_configuration import SnapshotConfiguration
+		names = list()
+		indices_at_names = dict()
+
+		def get_index(name):
+			return SnapshotConfiguration.get_interned_index(
+				names=names,
+				indices_at_names=indices_at_names,
+				name=name)
+
+		keys = (
+			"common",
+			"uncommon",
+			"custom")
+		file_names = list()
+		imports_index_pointers = [0]
+		imports_indices = list()
+		for file_name, branch in self.branches.items():
+			file_names.append(
+				get_index(file_name))
+			for key in keys:
+				if branch[key] is not None:
+					imports_indices.extend(
+						get_index(module_name)
+							for module_name in branch[key])
+			imports_index_pointers.append(
+				len(imports_indices))
+		## 0 ==> not an import name; 1, 2, 3 ==> common, uncommon, custom
+		categories_at_indices = dict()
+		for category, key in enumerate(keys, start=1):
+			for module_name in self.import_names[key]:
+				categories_at_indices[get_index(module_name)] = category
+		categories = [0] * len(names)
+		for index, category in categories_at_indices.items():
+			categories[index] = category
+		path_file_names = list()
+		paths = list()
+		for file_name, path_to_file in self.paths_at_file_names.items():
+			path_file_names.append(
+				get_index(file_name))
+			paths.append(
+				get_index(path_to_file))
+		qualified_paths = list()
+		qualified_names_index_pointers = [0]
+		qualified_names_indices = list()
+		for path_to_file, qualified_names in self.qualified_names_at_paths.items():
+			qualified_paths.append(
+				get_index(path_to_file))
+			qualified_names_indices.extend(
+				get_index(qualified_name)
+					for qualified_name in qualified_names)
+			qualified_names_index_pointers.append(
+				len(qualified_names_indices))
+		identity_paths = list()
+		identity_mtimes_ns = list()
+		identity_sizes = list()
+		for path_to_file, (mtime_ns, size) in self.identities_at_paths.items():
+			identity_paths.append(
+				get_index(path_to_file))
+			identity_mtimes_ns.append(
+				mtime_ns)
+			identity_sizes.append(
+				size)
+		metadata = {
+			"path_to_directory" : self.path_to_directory,
+			"time" : time.time(),
+			"extractor" : self.extractor,
+			"reader_settings" : self.reader_settings,
+			"pre_selected_import_names" : {
+				key : list(value)
+					for key, value in self.pre_selected_import_names.items()},
+			"skipped_files" : self.skipped_files}
+		arrays = {
+			"file_names" : ("<i4", file_names),
+			"imports_index_pointers" : ("<i8", imports_index_pointers),
+			"imports_indices" : ("<i4", imports_indices),
+			"categories" : ("u1", categories),
+			"path_file_names" : ("<i4", path_file_names),
+			"paths" : ("<i4", paths),
+			"qualified_paths" : ("<i4", qualified_paths),
+			"qualified_names_index_pointers" : ("<i8", qualified_names_index_pointers),
+			"qualified_names_indices" : ("<i4", qualified_names_indices),
+			"identity_paths" : ("<i4", identity_paths),
+			"identity_mtimes_ns" : ("<i8", identity_mtimes_ns),
+			"identity_sizes" : ("<i8", identity_sizes)}
+		return metadata, names, indices_at_names, arrays
+
+	def write_snapshot_to_file(self, path_to_snapshot=None, update_snapshot_data=None):
+		## the tree without a network section; reload with initialize_from_snapshot(...).
+		## update_snapshot_data(metadata, names, indices_at_names, arrays) adds sections before
+		## writing, e.g. NetworkConfiguration.write_snapshot_to_file adds the graph
+		from snapshot_configuration import SnapshotConfiguration
+		if path_to_snapshot is None:
+			path_to_snapshot = "{}module_tree.snapshot".format(
+				self.path_to_directory)
+		metadata, names, indices_at_names, arrays = self.get_snapshot_data()
+		if update_snapshot_data is not None:
+			update_snapshot_data(
+				metadata,
+				names,
+				indices_at_names,
+				arrays)
+		SnapshotConfiguration.write(
+			path_to_snapshot=path_to_snapshot,
+			metadata=metadata,
+			names=names,
+			arrays=arrays)
+
+	def is_snapshot_current(self, path_to_directory, extractor="ast", is_header_only=False, maximum_file_size=None, maximum_parse_time=None, is_qualified=False):
+		## True if the loaded snapshot was scanned from path_to_directory with the same settings and every
+		## file below it still has the (st_mtime_ns, st_size) it had when it was read; one stat per file, no parse.
+		## Each file is compared with its own entry ==> a file restored with an older mtime (git checkout,
+		## rsync -a, cp -p) is stale, and so is any added or removed path
+		if self.snapshot is None:
+			raise ValueError("self.snapshot is not initialized")
+		reader_settings = {
+			"is_header_only" : is_header_only,
+			"maximum_file_size" : maximum_file_size,
+			"maximum_parse_time" : maximum_parse_time,
+			"is_qualified" : is_qualified}
+		if os.path.abspath(path_to_directory) != os.path.abspath(self.path_to_directory):
+			return False
+		if (extractor != self.extractor) or (reader_settings != self.reader_settings):
+			return False
+		identities_at_paths = self.identities_at_paths
+		number_paths = 0
+		for path_to_file, _ in self.get_paths_to_files(path_to_directory=self.path_to_directory):
+			if path_to_file not in identities_at_paths:
+				return False
+			try:
+				stat_result = os.stat(
+					path_to_file)
+			except OSError:
+				return False
+			if (stat_result.st_mtime_ns, stat_result.st_size) != identities_at_paths[path_to_file]:
+				return False
+			number_paths += 1
+		return (number_paths == len(identities_at_paths))
 
 	def trim_branches(self):
 		branches = self.replace_empty_list_with_none(
@@ -161,19 +1151,212 @@ class ModuleTreeConfiguration(BaseModuleTreeConfiguration):
 	def __init__(self):
 		super().__init__()
 
-	def initialize(self, path_to_directory):
+	def initialize_shard(self, path_to_directory, path_to_shard, shard_index, number_shards, partition="files", scan_mode="serial", number_workers=None, chunk_size=None, path_to_cache=None, is_hash_content=False, maximum_number_cache_entries=None, extractor="ast", is_header_only=False, maximum_file_size=None, maximum_parse_time=None, is_qualified=False):
+		## scans one shard and writes its partial result; see initialize_from_shards
 		self.pre_initialize(
+			path_to_directory=path_to_directory,
+			extractor=extractor,
+			is_header_only=is_header_only,
+			maximum_file_size=maximum_file_size,
+			maximum_parse_time=maximum_parse_time,
+			is_qualified=is_qualified)
+		self.initialize_parse_cache(
+			path_to_cache=path_to_cache,
+			is_hash_content=is_hash_content,
+			maximum_number_cache_entries=maximum_number_cache_entries)
+		paths_to_files = self.get_paths_to_files(
 			path_to_directory=path_to_directory)
-		for path_to_selected_directory, sub_directory_names, file_names in os.walk(path_to_directory):
-			for file_name in file_names:
-				if file_name.endswith(".py"):
-					path_to_file = "{}{}".format(
-						path_to_selected_directory,
-						file_name)
-					self.grow_branches(
-						path_to_file=path_to_file,
-						file_name=file_name)
+		indices = self.get_indices_at_shard(
+			paths_to_files=paths_to_files,
+			path_to_directory=path_to_directory,
+			shard_index=shard_index,
+			number_shards=number_shards,
+			partition=partition)
+		module_names_per_file = self.get_module_names_from_paths(
+			paths_to_files=[paths_to_files[index_at_file] for index_at_file in indices],
+			scan_mode=scan_mode,
+			number_workers=number_workers,
+			chunk_size=chunk_size)
+		shard = self.get_shard(
+			paths_to_files=paths_to_files,
+			indices=indices,
+			module_names_per_file=module_names_per_file,
+			shard_index=shard_index,
+			number_shards=number_shards,
+			partition=partition)
+		self.write_shard(
+			shard=shard,
+			path_to_shard=path_to_shard)
+
+	def initialize_from_shards(self, paths_to_shards):
+		## merge ==> the same branches, import names and canopy as one initialize over the whole directory
+		shards = self.read_shards(
+			paths_to_shards=paths_to_shards)
+		self.verify_shards(
+			shards=shards)
+		files = sorted(
+			(file for shard in shards for file in shard["files"]),
+			key=lambda file : file[0])
+		skipped_files = dict()
+		identities_at_paths = dict()
+		for shard in shards:
+			skipped_files.update(
+				shard["skipped_files"])
+			identities_at_paths.update(
+				(path_to_file, (mtime_ns, size))
+					for path_to_file, mtime_ns, size in shard["identities_at_paths"])
+		self.initialize_from_module_names(
+			path_to_directory=shards[0]["path_to_directory"],
+			paths_to_files=[(path_to_file, file_name) for index_at_file, path_to_file, file_name, module_names in files],
+			module_names_per_file=[module_names for index_at_file, path_to_file, file_name, module_names in files],
+			skipped_files=skipped_files,
+			identities_at_paths=identities_at_paths,
+			extractor=shards[0]["extractor"],
+			**shards[0]["reader_settings"])
+
+	def initialize_from_module_names(self, path_to_directory, paths_to_files, module_names_per_file, skipped_files=None, identities_at_paths=None, extractor="ast", is_header_only=False, maximum_file_size=None, maximum_parse_time=None, is_qualified=False):
+		## module names parsed elsewhere (shards, git blobs) ==> the same tree as initialize, without reading files
+		self.pre_initialize(
+			path_to_directory=path_to_directory,
+			extractor=extractor,
+			is_header_only=is_header_only,
+			maximum_file_size=maximum_file_size,
+			maximum_parse_time=maximum_parse_time,
+			is_qualified=is_qualified)
+		self.initialize_parse_cache()
+		if skipped_files is not None:
+			self._skipped_files.update(
+				skipped_files)
+		if identities_at_paths is not None:
+			self._identities_at_paths.update(
+				identities_at_paths)
+		self.grow_branches_from_module_names_per_file(
+			paths_to_files=paths_to_files,
+			module_names_per_file=module_names_per_file)
 		self.trim_branches()
 		self.initialize_canopy()
 
+	def initialize_from_snapshot(self, path_to_snapshot):
+		## no walk and no parse ==> the same branches, import names and canopy as the scan that was saved;
+		## branches and canopy are rebuilt on first use, so a network that is restored from the saved
+		## graph (see NetworkConfiguration) never pays for them
+		from snapshot_configuration import SnapshotConfiguration
+		snapshot = SnapshotConfiguration(
+			path_to_snapshot=path_to_snapshot)
+		metadata = snapshot.metadata
+		self.pre_initialize(
+			path_to_directory=metadata["path_to_directory"],
+			extractor=metadata["extractor"],
+			**metadata["reader_settings"])
+		self.initialize_parse_cache()
+		self._pre_selected_import_names = {
+			key : tuple(value)
+				for key, value in metadata["pre_selected_import_names"].items()}
+		keys = (
+			"common",
+			"uncommon",
+			"custom")
+		for name, category in zip(snapshot.names, snapshot.get_array(name="categories").tolist()):
+			if category > 0:
+				self._import_names[keys[category - 1]].add(
+					name)
+		self._paths_at_file_names = dict(
+			zip(
+				snapshot.get_names_at(name="path_file_names"),
+				snapshot.get_names_at(name="paths")))
+		self._skipped_files = dict(
+			metadata["skipped_files"])
+		## a snapshot written before identities were stored has none ==> it never counts as current
+		if "identity_paths" in snapshot.sections:
+			self._identities_at_paths = dict(
+				zip(
+					snapshot.get_names_at(name="identity_paths"),
+					zip(
+						snapshot.get_array(name="identity_mtimes_ns").tolist(),
+						snapshot.get_array(name="identity_sizes").tolist())))
+		self._branches = None
+		self._qualified_names_at_paths = None
+		self._snapshot = snapshot
+
+	def initialize_branches_from_snapshot(self):
+		if (self._branches is not None) or (self._snapshot is None):
+			return
+		keys_at_names = {
+			module_name : key
+				for key, module_names in self.import_names.items()
+					for module_name in module_names}
+		branches = dict()
+		for file_name, module_names in zip(self._snapshot.get_names_at(name="file_names"), self._snapshot.get_lists_at(name="imports")):
+			branch = {
+				"common" : list(),
+				"uncommon" : list(),
+				"custom" : list()}
+			for module_name in module_names:
+				branch[keys_at_names[module_name]].append(
+					module_name)
+			branches[file_name] = branch
+		self._branches = branches
+		self._qualified_names_at_paths = dict(
+			zip(
+				self._snapshot.get_names_at(name="qualified_paths"),
+				self._snapshot.get_lists_at(name="qualified_names")))
+		self.trim_branches()
+		self.initialize_canopy()
+
+	async def initialize_async(self, path_to_directory, scan_mode="thread", number_readers=16, number_parsers=None, queue_size=64, path_to_cache=None, is_hash_content=False, maximum_number_cache_entries=None, extractor="ast", is_header_only=False, maximum_file_size=None, maximum_parse_time=None, is_qualified=False, instrumentation=None):
+		## awaitable variant of initialize; reads overlap with the walk and with parsing
+		self.pre_initialize(
+			path_to_directory=path_to_directory,
+			extractor=extractor,
+			is_header_only=is_header_only,
+			maximum_file_size=maximum_file_size,
+			maximum_parse_time=maximum_parse_time,
+			is_qualified=is_qualified)
+		self.initialize_instrumentation(
+			instrumentation=instrumentation)
+		self.initialize_parse_cache(
+			path_to_cache=path_to_cache,
+			is_hash_content=is_hash_content,
+			maximum_number_cache_entries=maximum_number_cache_entries)
+		with get_stage(self.instrumentation, "pipeline"):
+			paths_to_files, module_names_per_file = await self.get_module_names_in_pipeline(
+				path_to_directory=path_to_directory,
+				scan_mode=scan_mode,
+				number_readers=number_readers,
+				number_parsers=number_parsers,
+				queue_size=queue_size)
+			self.grow_branches_from_module_names_per_file(
+				paths_to_files=paths_to_files,
+				module_names_per_file=module_names_per_file)
+			self.trim_branches()
+		with get_stage(self.instrumentation, "canopy"):
+			self.initialize_canopy()
+
+	def initialize(self, path_to_directory, scan_mode="serial", number_workers=None, chunk_size=None, path_to_cache=None, is_hash_content=False, maximum_number_cache_entries=None, extractor="ast", is_header_only=False, maximum_file_size=None, maximum_parse_time=None, is_qualified=False, instrumentation=None):
+		self.pre_initialize(
+			path_to_directory=path_to_directory,
+			extractor=extractor,
+			is_header_only=is_header_only,
+			maximum_file_size=maximum_file_size,
+			maximum_parse_time=maximum_parse_time,
+			is_qualified=is_qualified)
+		self.initialize_instrumentation(
+			instrumentation=instrumentation)
+		self.initialize_parse_cache(
+			path_to_cache=path_to_cache,
+			is_hash_content=is_hash_content,
+			maximum_number_cache_entries=maximum_number_cache_entries)
+		with get_stage(self.instrumentation, "walk"):
+			paths_to_files = self.get_paths_to_files(
+				path_to_directory=path_to_directory)
+		with get_stage(self.instrumentation, "parse"):
+			self.grow_branches_from_paths(
+				paths_to_files=paths_to_files,
+				scan_mode=scan_mode,
+				number_workers=number_workers,
+				chunk_size=chunk_size)
+			self.trim_branches()
+		with get_stage(self.instrumentation, "canopy"):
+			self.initialize_canopy()
+
 ##
\ No newline at end of file
@@ -1,7 +1,3 @@
-import numpy as np
-import matplotlib.pyplot as plt
-
-
 class BaseVisualSettingsConfiguration():
 
 	def __init__(self):
@@ -59,6 +55,7 @@ class VisualLegendConfiguration(BaseVisualSettingsConfiguration):
 
 	@staticmethod
 	def get_empty_scatter_handle(ax):
+		import numpy as np
 		handle = ax.scatter(
 			[np.nan], 
 			[np.nan], 
@@ -120,6 +117,7 @@ class VisualLegendConfiguration(BaseVisualSettingsConfiguration):
 		return leg, modified_handles, modified_labels, is_add_empty_columns
 
 	def autoformat_legend(self, leg, labels, title=None, title_color="black", text_colors="black", facecolor="lightgray", edgecolor="gray", is_add_empty_columns=False):
+		import numpy as np
 		if not isinstance(is_add_empty_columns, bool):
 			raise ValueError("invalid type(is_add_empty_columns): {}".format(type(is_add_empty_columns)))
 		number_total_labels = len(
@@ -223,6 +221,8 @@ class VisualSettingsConfiguration(VisualLegendConfiguration):
 		self._path_to_save_directory = path_to_save_directory
 
 	def display_image(self, fig, save_name=None, dpi=800, bbox_inches="tight", pad_inches=0.1, extension=None, space_replacement=None, **kwargs):
+		## imported here so that text-only runs never load matplotlib
+		import matplotlib.pyplot as plt
 		if save_name is None:
 			plt.show()
 		elif isinstance(save_name, str):
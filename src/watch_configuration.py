@@ -0,0 +1,312 @@
+import os
+import sys
+import time
+import select
+import ctypes
+import ctypes.util
+from instrumentation_configuration import get_stage
+from network_configuration import CycleError
+
+
+class BaseInotifyConfiguration():
+
+	def __init__(self):
+		super().__init__()
+		self._libc = None
+		self._file_descriptor = None
+		self._watched_directories = None
+
+	@property
+	def libc(self):
+		return self._libc
+
+	@property
+	def file_descriptor(self):
+		return self._file_descriptor
+
+	@property
+	def watched_directories(self):
+		return self._watched_directories
+
+	@staticmethod
+	def get_libc():
+		if not sys.platform.startswith("linux"):
+			return None
+		path_to_libc = ctypes.util.find_library("c")
+		if path_to_libc is None:
+			return None
+		try:
+			libc = ctypes.CDLL(
+				path_to_libc,
+				use_errno=True)
+		except OSError:
+			return None
+		if not hasattr(libc, "inotify_init1"):
+			return None
+		return libc
+
+	@staticmethod
+	def get_event_mask():
+		## IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+		event_mask = 0x002 | 0x008 | 0x040 | 0x080 | 0x100 | 0x200
+		return event_mask
+
+	def pre_initialize(self, libc):
+		## IN_NONBLOCK | IN_CLOEXEC
+		file_descriptor = libc.inotify_init1(
+			0o4000 | 0o2000000)
+		if file_descriptor < 0:
+			raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+		self._libc = libc
+		self._file_descriptor = file_descriptor
+		self._watched_directories = set()
+
+	def add_directories(self, paths_to_directories):
+		for path_to_directory in paths_to_directories:
+			if path_to_directory not in self.watched_directories:
+				watch_descriptor = self.libc.inotify_add_watch(
+					self.file_descriptor,
+					os.fsencode(path_to_directory),
+					self.get_event_mask())
+				if watch_descriptor >= 0:
+					self._watched_directories.add(
+						path_to_directory)
+
+	def wait_for_events(self, timeout):
+		readable, _, _ = select.select(
+			[self.file_descriptor],
+			list(),
+			list(),
+			timeout)
+		is_event = (len(readable) > 0)
+		if is_event:
+			## the events only trigger a stat pass; their payload is not needed
+			while True:
+				try:
+					os.read(
+						self.file_descriptor,
+						65536)
+				except BlockingIOError:
+					break
+		return is_event
+
+	def close(self):
+		if self.file_descriptor is not None:
+			os.close(
+				self.file_descriptor)
+			self._file_descriptor = None
+
+class InotifyConfiguration(BaseInotifyConfiguration):
+
+	def __init__(self, libc):
+		super().__init__()
+		self.pre_initialize(
+			libc=libc)
+
+class BaseNetworkWatcher():
+
+	def __init__(self):
+		super().__init__()
+		self._network = None
+		self._backend = None
+		self._interval = None
+		self._inotify = None
+		self._snapshot = None
+		self._is_write_report = None
+		self._view_graph_kwargs = None
+		self._callback = None
+		self._number_updates = None
+
+	@property
+	def network(self):
+		return self._network
+
+	@property
+	def backend(self):
+		return self._backend
+
+	@property
+	def interval(self):
+		return self._interval
+
+	@property
+	def snapshot(self):
+		return self._snapshot
+
+	@property
+	def number_updates(self):
+		return self._number_updates
+
+	def initialize_settings(self, network, backend, interval, is_write_report, view_graph_kwargs, callback):
+		if network.tree.path_to_directory is None:
+			raise ValueError("network.tree.path_to_directory is not initialized")
+		if not isinstance(interval, (int, float)):
+			raise ValueError("invalid type(interval): {}".format(type(interval)))
+		if interval <= 0:
+			raise ValueError("invalid interval: {}".format(interval))
+		if not isinstance(is_write_report, bool):
+			raise ValueError("invalid type(is_write_report): {}".format(type(is_write_report)))
+		if view_graph_kwargs is not None:
+			if not isinstance(view_graph_kwargs, dict):
+				raise ValueError("invalid type(view_graph_kwargs): {}".format(type(view_graph_kwargs)))
+		if (callback is not None) and (not callable(callback)):
+			raise ValueError("invalid type(callback): {}".format(type(callback)))
+		backends = (
+			"auto",
+			"inotify",
+			"polling")
+		if backend not in backends:
+			raise ValueError("invalid backend: {}".format(backend))
+		if backend == "polling":
+			libc = None
+		else:
+			libc = InotifyConfiguration.get_libc()
+			if libc is None:
+				if backend == "inotify":
+					raise ValueError("inotify is not available on this platform")
+		if libc is None:
+			modified_backend = "polling"
+			inotify = None
+		else:
+			modified_backend = "inotify"
+			inotify = InotifyConfiguration(
+				libc=libc)
+		self._network = network
+		self._backend = modified_backend
+		self._interval = interval
+		self._inotify = inotify
+		self._is_write_report = is_write_report
+		self._view_graph_kwargs = view_graph_kwargs
+		self._callback = callback
+		self._number_updates = 0
+
+	def get_snapshot(self):
+		snapshot = dict()
+		paths_to_directories = list()
+		for path_to_selected_directory, sub_directory_names, file_names in os.walk(self.network.tree.path_to_directory):
+			sub_directory_names.sort()
+			paths_to_directories.append(
+				path_to_selected_directory)
+			for file_name in sorted(file_names):
+				if file_name.endswith(".py"):
+					path_to_file = os.path.join(
+						path_to_selected_directory,
+						file_name)
+					try:
+						status = os.stat(
+							path_to_file)
+					except FileNotFoundError:
+						## deleted between the walk and the stat
+						continue
+					snapshot[path_to_file] = (status.st_mtime_ns, status.st_size)
+		if self._inotify is not None:
+			## newly created sub-directories are picked up on the next pass
+			self._inotify.add_directories(
+				paths_to_directories=paths_to_directories)
+		return snapshot
+
+	def initialize_snapshot(self):
+		self._snapshot = self.get_snapshot()
+
+	def get_changes(self, snapshot):
+		paths_to_changed_files = list()
+		paths_to_removed_files = list()
+		for path_to_file, identity in snapshot.items():
+			if self.snapshot.get(path_to_file) != identity:
+				paths_to_changed_files.append(
+					(path_to_file, os.path.basename(path_to_file)))
+		for path_to_file in self.snapshot.keys():
+			if path_to_file not in snapshot:
+				paths_to_removed_files.append(
+					(path_to_file, os.path.basename(path_to_file)))
+		return paths_to_changed_files, paths_to_removed_files
+
+	def update(self):
+		snapshot = self.get_snapshot()
+		paths_to_changed_files, paths_to_removed_files = self.get_changes(
+			snapshot=snapshot)
+		self._snapshot = snapshot
+		if (len(paths_to_changed_files) == 0) and (len(paths_to_removed_files) == 0):
+			return False
+		with get_stage(self.network.instrumentation, "update_tree"):
+			canopy_keys, changed_import_names = self.network.tree.update_branches(
+				paths_to_changed_files=paths_to_changed_files,
+				paths_to_removed_files=paths_to_removed_files)
+		cycle_error = None
+		try:
+			with get_stage(self.network.instrumentation, "update_graph"):
+				is_changed = self.network.update_graph(
+					canopy_keys=canopy_keys,
+					changed_import_names=changed_import_names)
+		except CycleError as error:
+			## the graph is fully updated before the cycle check raises; any other error propagates
+			is_changed = True
+			cycle_error = error
+		self.network.update_graph_counters()
+		if is_changed:
+			self._number_updates += 1
+			if self._is_write_report:
+				self.network.write_module_hierarchy_to_file()
+			if (self._view_graph_kwargs is not None) and (cycle_error is None):
+				self.network.view_graph(
+					**self._view_graph_kwargs)
+		if self._callback is not None:
+			self._callback(
+				self,
+				paths_to_changed_files,
+				paths_to_removed_files,
+				is_changed,
+				cycle_error)
+		return is_changed
+
+	def wait(self):
+		if self._inotify is None:
+			time.sleep(
+				self.interval)
+		else:
+			while not self._inotify.wait_for_events(timeout=None):
+				pass
+			## a save usually fires several events; let them settle into one pass
+			time.sleep(
+				self.interval)
+			self._inotify.wait_for_events(
+				timeout=0)
+
+	def close(self):
+		if self._inotify is not None:
+			self._inotify.close()
+
+class NetworkWatcher(BaseNetworkWatcher):
+
+	def __init__(self, network, backend="auto", interval=0.5, is_write_report=True, view_graph_kwargs=None, callback=None):
+		## re-parses changed files and rewrites the report after every save, e.g. NetworkWatcher(network=network).watch()
+		super().__init__()
+		self.initialize_settings(
+			network=network,
+			backend=backend,
+			interval=interval,
+			is_write_report=is_write_report,
+			view_graph_kwargs=view_graph_kwargs,
+			callback=callback)
+		self.initialize_snapshot()
+
+	def __repr__(self):
+		watcher = f"NetworkWatcher(backend={self.backend!r})"
+		return watcher
+
+	def watch(self, number_iterations=None):
+		if number_iterations is not None:
+			if not isinstance(number_iterations, int):
+				raise ValueError("invalid type(number_iterations): {}".format(type(number_iterations)))
+		index_at_iteration = 0
+		try:
+			while (number_iterations is None) or (index_at_iteration < number_iterations):
+				self.wait()
+				self.update()
+				index_at_iteration += 1
+		except KeyboardInterrupt:
+			pass
+		finally:
+			self.close()
+
+##
\ No newline at end of file